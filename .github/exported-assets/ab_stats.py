@@ -0,0 +1,319 @@
+# A/B test statistics for the experiments in the executive summary
+#
+# script_5.py lists six tests to run ("Blue vs Green color scheme", form
+# length, CTA copy, ...) and script_3.py's "Testing" row has no way to score
+# them. Given exposure/conversion counts per variant (or raw analytics events
+# from docs/ANALYTICS_EVENTS.md), every treatment-vs-control comparison is
+# evaluated in one vectorized NumPy pass:
+#
+#   frequentist  two-proportion z-test, lift and its confidence interval
+#   Bayesian     Beta(1, 1) posteriors, P(treatment > control), expected loss
+#   bootstrap    parametric (binomial) resamples of relative lift
+#   sequential   Lan-DeMets alpha spending for peeking at running tests
+
+import argparse
+import csv
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import numpy as np
+from scipy.special import ndtr, ndtri
+
+SUMMARY_TXT = 'glowheal_executive_summary.txt'
+ALPHA = 0.05
+POWER = 0.8
+DRAWS = 100_000
+BASELINE_RATE = 0.05          # "Conversion Rate (target: 5-10%)"
+MIN_DETECTABLE_LIFT = 0.20    # relative
+TEST_LINE = re.compile(r'^\s*\d+\.\s+(.+?)\s*$')
+
+
+@dataclass
+class Variant:
+    name: str
+    exposures: int = 0
+    conversions: int = 0
+
+    @property
+    def rate(self):
+        return self.conversions / self.exposures if self.exposures else 0.0
+
+
+@dataclass
+class Experiment:
+    name: str
+    variants: list = field(default_factory=list)   # first one is the control
+
+
+def experiments_from_summary(path=SUMMARY_TXT):
+    """Experiments listed under 'A/B Tests to Run:' in the executive summary.
+
+    '4. Form length (3 fields vs 5 fields)' -> Experiment('Form length', ['3 fields', '5 fields']),
+    'Blue vs Green color scheme' -> Experiment('Color scheme', ['Blue', 'Green']) and
+    '"Book Free Consultation" vs "Schedule Appointment"' -> Experiment('CTA copy', [...]).
+    The last-named option is the current site, so it becomes the control.
+    """
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().splitlines()
+    start = next(i for i, line in enumerate(lines) if line.strip() == 'A/B Tests to Run:') + 1
+    experiments = []
+    for line in lines[start:]:
+        match = TEST_LINE.match(line)
+        if not match:
+            break
+        text = match.group(1)
+        inner = re.match(r'(.+?)\s*\((.+)\)$', text)
+        name, options = (inner.group(1), inner.group(2)) if inner else (None, text)
+        raw = [o.strip() for o in re.split(r'\s+vs\.?\s+', options)]
+        names = [o.strip('"') for o in raw]
+        if name is None:
+            first, last = names[0].split(), names[-1].split()
+            if all(o.startswith('"') and o.endswith('"') for o in raw):
+                # Quoted options are button copy (script_2's button_specs 'Example Text')
+                name = 'CTA copy'
+            elif len(first) == 1 and len(last) > 1:
+                # 'Blue vs Green color scheme': the trailing words name the test
+                names = [n.split()[0] for n in names]
+                name = ' '.join(last[1:]).capitalize()
+            else:
+                name = ' vs '.join(names)
+        experiments.append(Experiment(name, [Variant(n) for n in reversed(names)]))
+    return experiments
+
+
+def counts_from_events(events, variant_key, exposure_event='free_consult_view',
+                       conversion_event='free_consult_booked', experiment=None):
+    """Experiment from raw dataLayer events (dicts with event, session_id, variant_key).
+
+    A session is assigned the first variant value it was seen with; it counts
+    as exposed if it fired exposure_event and converted if it fired conversion_event.
+    """
+    assigned, exposed, converted = {}, set(), set()
+    for e in events:
+        session = e.get('session_id')
+        if not session:
+            continue
+        if e.get(variant_key) is not None:
+            assigned.setdefault(session, str(e[variant_key]))
+        if e.get('event') == exposure_event:
+            exposed.add(session)
+        elif e.get('event') == conversion_event:
+            converted.add(session)
+    variants = defaultdict(lambda: [0, 0])
+    for session, variant in assigned.items():
+        if session in exposed or session in converted:
+            variants[variant][0] += 1
+            variants[variant][1] += session in converted
+    return Experiment(experiment or variant_key,
+                      [Variant(name, n, c) for name, (n, c) in sorted(variants.items())])
+
+
+def experiments_from_csv(path):
+    """Rows of Experiment, Variant, Exposures, Conversions (control listed first)."""
+    experiments = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            experiment = experiments.setdefault(row['Experiment'], Experiment(row['Experiment']))
+            experiment.variants.append(Variant(row['Variant'], int(row['Exposures']), int(row['Conversions'])))
+    return list(experiments.values())
+
+
+def comparisons(experiments):
+    """(experiment, control, treatment) for every non-control variant with data."""
+    return [(e, e.variants[0], v) for e in experiments for v in e.variants[1:]
+            if e.variants[0].exposures and v.exposures]
+
+
+@dataclass
+class Result:
+    experiment: str
+    control: str
+    treatment: str
+    control_rate: float
+    treatment_rate: float
+    lift: float               # relative, (treatment - control) / control
+    diff_low: float           # CI of the absolute difference
+    diff_high: float
+    z: float
+    p_value: float
+    prob_better: float        # P(treatment > control) under Beta(1, 1) priors
+    expected_loss: float      # E[max(control - treatment, 0)] if we ship treatment
+    lift_low: float           # bootstrap CI of relative lift
+    lift_high: float
+
+    @property
+    def significant(self):
+        return self.p_value < ALPHA
+
+    @property
+    def lift_defined(self):
+        return not np.isnan(self.lift)
+
+
+def analyze(experiments, alpha=ALPHA, draws=DRAWS, seed=0):
+    """Result per comparison, all comparisons computed together as arrays."""
+    pairs = comparisons(experiments)
+    if not pairs:
+        return []
+    rng = np.random.default_rng(seed)
+    n_a = np.array([a.exposures for _, a, _ in pairs], dtype=np.float64)
+    c_a = np.array([a.conversions for _, a, _ in pairs], dtype=np.float64)
+    n_b = np.array([b.exposures for _, _, b in pairs], dtype=np.float64)
+    c_b = np.array([b.conversions for _, _, b in pairs], dtype=np.float64)
+    p_a, p_b = c_a / n_a, c_b / n_b
+
+    # Two-proportion z-test (pooled SE) and Wald interval for the difference
+    pooled = (c_a + c_b) / (n_a + n_b)
+    se_pooled = np.sqrt(pooled * (1 - pooled) * (1 / n_a + 1 / n_b))
+    z = np.divide(p_b - p_a, se_pooled, out=np.zeros_like(p_a), where=se_pooled > 0)
+    p_value = 2 * ndtr(-np.abs(z))
+    se = np.sqrt(p_a * (1 - p_a) / n_a + p_b * (1 - p_b) / n_b)
+    z_crit = ndtri(1 - alpha / 2)
+    lift = np.divide(p_b - p_a, p_a, out=np.full_like(p_a, np.nan), where=p_a > 0)
+
+    # Bayesian: (comparisons x draws) posterior samples
+    post_a = rng.beta(1 + c_a[:, None], 1 + n_a[:, None] - c_a[:, None], size=(len(pairs), draws))
+    post_b = rng.beta(1 + c_b[:, None], 1 + n_b[:, None] - c_b[:, None], size=(len(pairs), draws))
+    prob_better = (post_b > post_a).mean(axis=1)
+    expected_loss = np.maximum(post_a - post_b, 0).mean(axis=1)
+
+    # Parametric bootstrap: resample conversions ~ Binomial(n, p_hat)
+    boot_a = rng.binomial(n_a[:, None].astype(np.int64), p_a[:, None], size=(len(pairs), draws)) / n_a[:, None]
+    boot_b = rng.binomial(n_b[:, None].astype(np.int64), p_b[:, None], size=(len(pairs), draws)) / n_b[:, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        boot_lift = (boot_b - boot_a) / boot_a
+    boot_lift[~np.isfinite(boot_lift)] = np.nan
+    # A control with no conversions (e.g. a test that just started) has no
+    # relative lift; leave its interval NaN instead of percentiles of nothing
+    defined = ~np.isnan(boot_lift).all(axis=1)
+    lift_low, lift_high = np.full(len(pairs), np.nan), np.full(len(pairs), np.nan)
+    if defined.any():
+        lift_low[defined], lift_high[defined] = np.nanpercentile(
+            boot_lift[defined], [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=1)
+
+    return [Result(e.name, a.name, b.name, p_a[i], p_b[i], lift[i],
+                   p_b[i] - p_a[i] - z_crit * se[i], p_b[i] - p_a[i] + z_crit * se[i],
+                   z[i], p_value[i], prob_better[i], expected_loss[i], lift_low[i], lift_high[i])
+            for i, (e, a, b) in enumerate(pairs)]
+
+
+def sample_size(baseline=BASELINE_RATE, lift=MIN_DETECTABLE_LIFT, alpha=ALPHA, power=POWER):
+    """Exposures per variant to detect a relative lift with a two-sided z-test."""
+    p1, p2 = baseline, baseline * (1 + lift)
+    z_a, z_b = ndtri(1 - alpha / 2), ndtri(power)
+    p_bar = (p1 + p2) / 2
+    n = (z_a * np.sqrt(2 * p_bar * (1 - p_bar)) + z_b * np.sqrt(p1 * (1 - p1) + p2 * (1 - p2))) ** 2 \
+        / (p2 - p1) ** 2
+    return int(np.ceil(n))
+
+
+# -- sequential monitoring ---------------------------------------------------
+
+def obrien_fleming(t, alpha=ALPHA):
+    """Lan-DeMets O'Brien-Fleming-type cumulative alpha spent at information fraction t."""
+    t = np.clip(np.asarray(t, dtype=np.float64), 1e-12, 1)
+    return 2 - 2 * ndtr(ndtri(1 - alpha / 2) / np.sqrt(t))
+
+
+def pocock(t, alpha=ALPHA):
+    t = np.clip(np.asarray(t, dtype=np.float64), 0, 1)
+    return alpha * np.log(1 + (np.e - 1) * t)
+
+
+SPENDING = {'obrien-fleming': obrien_fleming, 'pocock': pocock}
+
+
+class SequentialMonitor:
+    """Alpha-spending boundaries for repeated looks at one comparison.
+
+    Each look spends alpha(t_k) - alpha(t_k-1) of the error budget, where t is
+    the share of the planned sample seen so far. Boundaries use that increment
+    as the look's nominal level, which ignores the correlation between looks
+    and so errs on the conservative side.
+    """
+
+    def __init__(self, planned_exposures, alpha=ALPHA, spending='obrien-fleming'):
+        self.planned = planned_exposures
+        self.alpha = alpha
+        self.spend = SPENDING[spending]
+        self.fractions = []
+
+    def boundary(self, fraction):
+        previous = self.fractions[-1] if self.fractions else 0.0
+        increment = float(self.spend(fraction, self.alpha) - self.spend(previous, self.alpha))
+        return float(ndtri(1 - max(increment, 1e-15) / 2)), increment
+
+    def look(self, experiment):
+        """(decision, z, boundary, alpha spent at this look) for the first comparison."""
+        control, treatment = experiment.variants[0], experiment.variants[1]
+        fraction = min(1.0, (control.exposures + treatment.exposures) / (2 * self.planned))
+        if self.fractions and fraction <= self.fractions[-1]:
+            raise ValueError('looks must be taken at increasing sample sizes')
+        result = analyze([Experiment(experiment.name, [control, treatment])], draws=1)[0]
+        bound, increment = self.boundary(fraction)
+        self.fractions.append(fraction)
+        if abs(result.z) >= bound:
+            decision = f'stop: {treatment.name if result.z > 0 else control.name} wins'
+        elif fraction >= 1.0:
+            decision = 'stop: no significant difference'
+        else:
+            decision = 'continue'
+        return decision, float(result.z), bound, increment
+
+
+def _fmt(value, spec):
+    return '' if np.isnan(value) else format(value, spec)
+
+
+def to_csv(results, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Experiment', 'Control', 'Treatment', 'Control Rate', 'Treatment Rate',
+                         'Lift', 'Diff CI Low', 'Diff CI High', 'z', 'p-value',
+                         'P(Treatment Better)', 'Expected Loss', 'Lift CI Low (bootstrap)',
+                         'Lift CI High (bootstrap)'])
+        for r in results:
+            writer.writerow([r.experiment, r.control, r.treatment, f'{r.control_rate:.4f}',
+                             f'{r.treatment_rate:.4f}', _fmt(r.lift, '.4f'), f'{r.diff_low:.4f}',
+                             f'{r.diff_high:.4f}', f'{r.z:.3f}', f'{r.p_value:.4g}',
+                             f'{r.prob_better:.4f}', f'{r.expected_loss:.6f}',
+                             _fmt(r.lift_low, '.4f'), _fmt(r.lift_high, '.4f')])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Score A/B tests from exposure/conversion counts.')
+    parser.add_argument('counts', nargs='?',
+                        help='CSV with Experiment, Variant, Exposures, Conversions (control first)')
+    parser.add_argument('--alpha', type=float, default=ALPHA)
+    parser.add_argument('--draws', type=int, default=DRAWS)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - A/B TEST RESULTS")
+    print("=" * 80)
+    if not args.counts:
+        n = sample_size(alpha=args.alpha)
+        print(f"No counts given. Planned tests from {SUMMARY_TXT}, with the exposures per variant")
+        print(f"needed to detect a {MIN_DETECTABLE_LIFT:.0%} relative lift on a "
+              f"{BASELINE_RATE:.0%} baseline (alpha {args.alpha}, power {POWER:.0%}):\n")
+        for e in experiments_from_summary():
+            names = ', '.join(v.name for v in e.variants)
+            print(f"  {e.name:<28} [{names}]  {n * len(e.variants):,} exposures total")
+    else:
+        results = analyze(experiments_from_csv(args.counts), args.alpha, args.draws)
+        to_csv(results, 'glowheal_ab_results.csv')
+        for r in results:
+            verdict = 'significant' if r.p_value < args.alpha else 'not significant'
+            print(f"\n{r.experiment}: {r.treatment} vs {r.control}")
+            if not r.lift_defined:
+                why = 'no conversions in either variant yet' if not r.treatment_rate else 'control has no conversions'
+                print(f"   {r.control_rate:.2%} -> {r.treatment_rate:.2%}  lift undefined ({why})")
+            elif np.isnan(r.lift_low):
+                print(f"   {r.control_rate:.2%} -> {r.treatment_rate:.2%}  lift {r.lift:+.1%}")
+            else:
+                print(f"   {r.control_rate:.2%} -> {r.treatment_rate:.2%}  lift {r.lift:+.1%} "
+                      f"(bootstrap {r.lift_low:+.1%} .. {r.lift_high:+.1%})")
+            print(f"   z = {r.z:.2f}, p = {r.p_value:.4f} ({verdict}); "
+                  f"P(better) = {r.prob_better:.1%}, expected loss {r.expected_loss:.4%}")
+        print("\n✓ Results exported to: glowheal_ab_results.csv")
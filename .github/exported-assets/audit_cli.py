@@ -0,0 +1,130 @@
+# Single entry point for the Glowheal.in reports and audits
+#
+# Pre-deploy hooks call these many times a day, so startup matters: this file
+# imports only the standard library, and each subcommand imports its module
+# (and with it pandas, numpy, aiohttp, bs4, ...) only when it is the one run.
+# The report CSVs are small, so `export` writes them straight from the
+# scripts' data dicts with the csv module instead of building DataFrames.
+#
+#   python audit_cli.py export                 # every report CSV + summary, no pandas
+#   python audit_cli.py export checklist bugs
+#   python audit_cli.py report checklist       # full printed report (pandas)
+#   python audit_cli.py links --help           # any audit, with its own options
+
+import argparse
+import csv
+import importlib
+import os
+import runpy
+import sys
+
+# name: (module, attribute, output file)
+EXPORTS = {
+    'pricing': ('script_2', 'pricing_data', 'glowheal_pricing_strategy.csv'),
+    'colors': ('script_2', 'color_palette_data', 'glowheal_color_palette.csv'),
+    'buttons': ('script_2', 'button_specs', 'glowheal_button_specifications.csv'),
+    'checklist': ('script_3', 'implementation_checklist', 'glowheal_implementation_checklist.csv'),
+    'bugs': ('script_4', 'bugs_issues', 'glowheal_bugs_and_issues.csv'),
+    'summary': ('script_5', 'summary', 'glowheal_executive_summary.txt'),
+}
+
+REPORTS = {
+    'analysis': 'script_1',
+    'pricing-design': 'script_2',
+    'checklist': 'script_3',
+    'bugs': 'script_4',
+    'summary': 'script_5',
+}
+
+# Subcommands that hand the rest of the command line to a module's own CLI
+AUDITS = {
+    'crawl': ('script', 'crawl every page from the sitemap'),
+    'links': ('link_checker', 'broken-link checker'),
+    'images': ('image_audit', 'image format, size and alt-text audit'),
+    'weight': ('page_weight', 'page weight and resource waterfall'),
+    'bundles': ('bundle_analyzer', 'Next.js bundle composition'),
+    'critical-css': ('critical_css', 'critical CSS and unused rules per route'),
+    'link-graph': ('link_graph', 'internal link graph and PageRank'),
+    'contrast': ('contrast', 'WCAG contrast of palette and site colors'),
+    'lighthouse': ('lighthouse_store', 'Lighthouse history store'),
+    'leads': ('leads_tail', 'incremental lead log aggregates'),
+    'dedupe': ('lead_dedupe', 'phone-based lead deduplication'),
+    'archive': ('lead_archive', 'monthly lead/booking archives'),
+    'bookings': ('booking_query', 'partition-pruned booking queries'),
+    'recommendations': ('recommendations', 'query recommendations by category, priority, metric'),
+    'rollout': ('rollout_planner', 'effort-budgeted rollout plan for the checklist'),
+    'pricing-sim': ('pricing_sim', 'Monte Carlo revenue over candidate price points'),
+    'render': ('report_renderer', 'executive summary per city and page as txt/md/html'),
+    'prices': ('price_scanner', 'pages showing prices that disagree with the pricing sources'),
+    'ab': ('ab_stats', 'A/B test statistics'),
+    'funnel': ('funnel', 'sessionized conversion funnels'),
+    'build': ('build_graph', 'incremental build of the report outputs'),
+    'orchestrate': ('audit_orchestrator', 'resumable city x condition x template page audits'),
+}
+
+
+def write_columns(path, columns):
+    """{header: values} -> CSV, byte-for-byte what DataFrame(columns).to_csv(index=False) writes."""
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(columns)
+        writer.writerows(zip(*columns.values()))
+
+
+def export(names, out_dir='.'):
+    """Write the named report outputs; returns the paths written."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name in names:
+        module, attribute, filename = EXPORTS[name]
+        data = getattr(importlib.import_module(module), attribute)
+        path = os.path.join(out_dir, filename)
+        if isinstance(data, str):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(data)
+        else:
+            write_columns(path, data)
+        written.append(path)
+    return written
+
+
+def run_module(module, argv):
+    """Run a module's __main__ block as if it were invoked as `python <module>.py argv...`."""
+    sys.argv = [module + '.py', *argv]
+    runpy.run_module(module, run_name='__main__', alter_sys=True)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='audit_cli.py',
+                                     description='Glowheal.in reports and audits.')
+    sub = parser.add_subparsers(dest='command', required=True, metavar='command')
+    export_cmd = sub.add_parser('export', help='write report CSVs and the summary (stdlib only)')
+    export_cmd.add_argument('names', nargs='*', metavar='name',
+                            help=f"one or more of {', '.join(EXPORTS)} (default: all)")
+    export_cmd.add_argument('--out-dir', default='.')
+    report_cmd = sub.add_parser('report', help='run a report script with its printed output')
+    report_cmd.add_argument('name', choices=list(REPORTS))
+    for name, (_, description) in AUDITS.items():
+        sub.add_parser(name, help=description, add_help=False)
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in AUDITS:
+        # Everything after the subcommand, --help included, belongs to the module
+        return run_module(AUDITS[argv[0]][0], argv[1:])
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == 'report':
+        return run_module(REPORTS[args.name], [])
+    unknown = [n for n in args.names if n not in EXPORTS]
+    if unknown:
+        parser.error(f"unknown export {unknown[0]!r}; choose from {', '.join(EXPORTS)}")
+    names = args.names or list(EXPORTS)
+    for path in export(names, args.out_dir):
+        print(f"✓ {path}")
+
+
+if __name__ == '__main__':
+    main()
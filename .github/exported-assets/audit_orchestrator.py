@@ -0,0 +1,464 @@
+# Resumable city x condition x template page audits over a persistent queue
+#
+# script.py audits one site from its homepage; the app also serves
+# /cities, /pricing?city=..., and a /conditions/[slug] page per specialty,
+# for each city in scripts/validate-catalog.js. This expands that matrix
+# into a SQLite work queue and pushes every page through three stages in a
+# process pool:
+#
+#   fetch    GET the page, body to .audit-cache/orchestrator-bodies/
+#   extract  html_extract's streaming summary (title, headings, links, forms, ...)
+#   audit    per-page checks from glowheal_bugs_and_issues.csv
+#
+# Each stage result is committed as it lands, so a killed run picks up where
+# it stopped: finished pages are skipped and half-done ones resume at their
+# next stage. At most --in-flight tasks are queued on the pool, and pages
+# already in progress go ahead of new ones, so fetched bodies never pile up
+# on disk. Per-stage throughput is printed while running and kept in the queue.
+#
+#   python audit_orchestrator.py --base-url http://localhost:3000 --workers 8
+#   python audit_orchestrator.py --status
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+VALIDATE_CATALOG = os.path.join(REPO_ROOT, 'scripts', 'validate-catalog.js')
+SERVICES_JSON = os.path.join(REPO_ROOT, 'apps', 'web', 'src', 'data', 'services.json')
+QUEUE_PATH = '.audit-cache/orchestrator.sqlite3'
+BODY_DIR = '.audit-cache/orchestrator-bodies'
+STAGES = ('fetch', 'extract', 'audit')
+MAX_ATTEMPTS = 3
+MAX_PAGE_BYTES = 500 * 1024    # HTML document budget before a page is flagged
+PROGRESS_SECONDS = 5.0
+
+# Page templates; {city} and {condition} are expanded over the matrix
+TEMPLATES = {
+    'home': '/',
+    'cities': '/cities',
+    'pricing': '/pricing?city={city}',
+    'condition': '/conditions/{condition}?city={city}',
+    'book': '/book?specialty={condition}&city={city}',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    template TEXT NOT NULL,
+    city TEXT,
+    condition TEXT,
+    stage TEXT NOT NULL DEFAULT 'fetch',      -- next stage to run, or 'done' / 'failed'
+    attempts INTEGER NOT NULL DEFAULT 0,
+    status INTEGER,
+    bytes INTEGER,
+    body TEXT,
+    summary TEXT,
+    findings TEXT,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS pages_stage ON pages (stage);
+CREATE TABLE IF NOT EXISTS throughput (
+    stage TEXT PRIMARY KEY,
+    completed INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    busy REAL NOT NULL,
+    wall REAL NOT NULL
+);
+"""
+
+
+def _js_array(source, name):
+    match = re.search(r'const\s+' + name + r'\s*=\s*\[(.*?)\]', source, re.S)
+    return re.findall(r"'([^']+)'", match.group(1)) if match else []
+
+
+def site_matrix(validate_catalog=VALIDATE_CATALOG, services_json=SERVICES_JSON):
+    """(cities, condition slugs): validate-catalog.js's VALID_CITIES and, unless
+    apps/web/src/data/services.json lists the condition pages, its KNOWN_SPECIALTIES."""
+    with open(validate_catalog, encoding='utf-8') as f:
+        source = f.read()
+    cities = _js_array(source, 'VALID_CITIES')
+    if os.path.exists(services_json):
+        with open(services_json, encoding='utf-8') as f:
+            conditions = [service['slug'] for service in json.load(f) if service.get('slug')]
+    else:
+        conditions = _js_array(source, 'KNOWN_SPECIALTIES')
+    return cities, conditions
+
+
+def expand(base_url, cities, conditions, templates=TEMPLATES):
+    """[(url, template, city, condition)], one row per distinct URL."""
+    rows = {}
+    base_url = base_url.rstrip('/')
+    for name, pattern in templates.items():
+        city_values = cities if '{city}' in pattern else [None]
+        condition_values = conditions if '{condition}' in pattern else [None]
+        for city in city_values:
+            for condition in condition_values:
+                url = base_url + pattern.format(city=city, condition=condition)
+                rows.setdefault(url, (url, name, city, condition))
+    return list(rows.values())
+
+
+# -- stages (run in the worker processes) ------------------------------------
+
+def fetch(url, body_dir=BODY_DIR):
+    from crawler import HEADERS, TIMEOUT
+    request = urllib.request.Request(url, headers=HEADERS)
+    try:
+        with urllib.request.urlopen(request, timeout=TIMEOUT) as resp:
+            status, content_type, body = resp.status, resp.headers.get('content-type', ''), resp.read()
+    except urllib.error.HTTPError as e:
+        status, content_type, body = e.code, e.headers.get('content-type', ''), b''
+    path = os.path.join(body_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+    os.makedirs(body_dir, exist_ok=True)
+    with open(path + '.tmp', 'wb') as f:
+        f.write(body)
+    os.replace(path + '.tmp', path)
+    return {'status': status, 'html': 'text/html' in content_type, 'body': path, 'bytes': len(body)}
+
+
+def extract(url, fetched):
+    from html_extract import extract as extract_html
+    with open(fetched['body'], 'rb') as f:
+        page = extract_html(f, url=url)
+    https = url.startswith('https:')
+    return {
+        'bytes': fetched['bytes'],
+        'title': page.title,
+        'description': page.meta_description,
+        'canonical': page.canonical,
+        'h1': sum(level == 1 for level, _ in page.headings),
+        'images': len(page.images),
+        'images_without_alt': sum(image.alt is None for image in page.images),
+        'links': len(page.links),
+        'book_links': sum('/book' in (link.href or '') for link in page.links),
+        'tel_links': len(page.tel_links),
+        'unlabelled_fields': sum(not f.labelled for form in page.forms for f in form.fields),
+        'json_ld': len(page.json_ld),
+        'insecure_resources': sum(https and src.startswith('http:') for _, src in page.resources),
+    }
+
+
+def audit(url, summary):
+    """Findings for one page, in the wording of glowheal_bugs_and_issues.csv."""
+    checks = [
+        (not summary['title'], 'Missing <title>'),
+        (not summary['description'], 'Missing meta description'),
+        (summary['h1'] != 1, f"{summary['h1']} <h1> headings (want exactly 1)"),
+        (summary['images_without_alt'], f"{summary['images_without_alt']} images without alt text"),
+        (not summary['tel_links'], 'Phone number not clickable (no tel: link)'),
+        (not summary['book_links'], 'No booking CTA linking to /book'),
+        (summary['unlabelled_fields'], f"{summary['unlabelled_fields']} form fields without a label"),
+        (not summary['json_ld'], 'No JSON-LD structured data'),
+        (summary['insecure_resources'], f"{summary['insecure_resources']} mixed-content resources"),
+        (summary['bytes'] > MAX_PAGE_BYTES, f"HTML document {summary['bytes'] / 1024:.0f} KB"),
+    ]
+    return [message for failed, message in checks if failed]
+
+
+def _run_stage(stage, url, payload, body_dir):
+    start = time.perf_counter()
+    if stage == 'fetch':
+        result = fetch(url, body_dir)
+    elif stage == 'extract':
+        result = extract(url, payload)
+    else:
+        result = audit(url, payload)
+    return result, time.perf_counter() - start
+
+
+# -- orchestrator ------------------------------------------------------------
+
+@dataclass
+class StageStats:
+    completed: int = 0
+    failed: int = 0
+    busy: float = 0.0          # worker seconds spent in the stage
+    wall: float = 0.0          # seconds of run time while the stage had work
+
+    @property
+    def rate(self):
+        """Pages per second through the stage."""
+        return self.completed / self.wall if self.wall else 0.0
+
+    @property
+    def per_worker(self):
+        return self.completed / self.busy if self.busy else 0.0
+
+
+class AuditOrchestrator:
+    """SQLite-backed page queue drained through the stages by a process pool.
+
+    One orchestrator per queue file at a time; workers never touch SQLite.
+    """
+
+    def __init__(self, path=QUEUE_PATH, body_dir=BODY_DIR, workers=None, in_flight=None):
+        self.path = path
+        self.body_dir = body_dir
+        self.workers = workers or os.cpu_count()
+        self.in_flight = in_flight or self.workers * 4
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute('PRAGMA journal_mode = WAL')
+        self.db.execute('PRAGMA synchronous = NORMAL')
+        self.db.executescript(SCHEMA)
+        self.stats = {stage: StageStats() for stage in STAGES}
+        self.totals = {row[0]: StageStats(*row[1:]) for row in self.db.execute('SELECT * FROM throughput')}
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def add(self, rows):
+        """Queue (url, template, city, condition) rows; returns how many were new."""
+        before = self.db.total_changes
+        self.db.executemany('INSERT OR IGNORE INTO pages (url, template, city, condition) VALUES (?, ?, ?, ?)',
+                            rows)
+        self.db.commit()
+        return self.db.total_changes - before
+
+    def status(self):
+        """{stage: pages}, where stage is the next stage to run, 'done' or 'failed'."""
+        return dict(self.db.execute('SELECT stage, COUNT(*) FROM pages GROUP BY stage'))
+
+    def retry_failed(self):
+        cursor = self.db.execute("UPDATE pages SET stage = 'fetch', attempts = 0, error = NULL "
+                                 "WHERE stage = 'failed'")
+        self.db.commit()
+        return cursor.rowcount
+
+    def throughput(self):
+        """{stage: StageStats} for this run, and the totals over every run."""
+        totals = {}
+        for stage in STAGES:
+            run, past = self.stats[stage], self.totals.get(stage, StageStats())
+            totals[stage] = StageStats(run.completed + past.completed, run.failed + past.failed,
+                                       run.busy + past.busy, run.wall + past.wall)
+        return self.stats, totals
+
+    # -- queue rows <-> tasks ---------------------------------------------------
+
+    def _pending(self, after, limit):
+        """Unfinished pages past rowid `after`, as (rowid, url, stage, payload)."""
+        rows = self.db.execute(
+            "SELECT rowid, url, stage, status, bytes, body, summary FROM pages "
+            "WHERE rowid > ? AND stage NOT IN ('done', 'failed') ORDER BY rowid LIMIT ?", (after, limit))
+        tasks = []
+        for rowid, url, stage, status, size, body, summary in rows:
+            if stage == 'extract' and not (body and os.path.exists(body)):
+                stage, payload = 'fetch', None          # body lost with the killed run
+            elif stage == 'extract':
+                payload = {'status': status, 'body': body, 'bytes': size}
+            elif stage == 'audit':
+                payload = json.loads(summary)
+            else:
+                payload = None
+            tasks.append((rowid, url, stage, payload))
+        return tasks
+
+    def _record(self, url, stage, result):
+        """Commit a stage result; returns the next (stage, payload) or None when finished."""
+        now = time.time()
+        if stage == 'fetch':
+            if result['status'] == 200 and result['html']:
+                self.db.execute("UPDATE pages SET stage = 'extract', attempts = 0, status = ?, bytes = ?, "
+                                "body = ?, error = NULL, updated = ? WHERE url = ?",
+                                (result['status'], result['bytes'], result['body'], now, url))
+                self.db.commit()
+                return 'extract', result
+            finding = f"HTTP {result['status']}" if result['status'] != 200 else 'Not an HTML page'
+            self.db.execute("UPDATE pages SET stage = 'done', status = ?, bytes = ?, findings = ?, "
+                            "updated = ? WHERE url = ?",
+                            (result['status'], result['bytes'], json.dumps([finding]), now, url))
+            self.db.commit()
+            _remove(result['body'])
+            return None
+        if stage == 'extract':
+            body = self.db.execute('SELECT body FROM pages WHERE url = ?', (url,)).fetchone()[0]
+            self.db.execute("UPDATE pages SET stage = 'audit', attempts = 0, body = NULL, summary = ?, "
+                            "updated = ? WHERE url = ?", (json.dumps(result), now, url))
+            self.db.commit()
+            _remove(body)
+            return 'audit', result
+        self.db.execute("UPDATE pages SET stage = 'done', findings = ?, updated = ? WHERE url = ?",
+                        (json.dumps(result), now, url))
+        self.db.commit()
+        return None
+
+    def _failed(self, url, stage, error):
+        """Count a failed attempt; returns True when the page should be retried."""
+        attempts = self.db.execute('SELECT attempts FROM pages WHERE url = ?', (url,)).fetchone()[0] + 1
+        final = attempts >= MAX_ATTEMPTS
+        self.db.execute('UPDATE pages SET stage = ?, attempts = ?, error = ?, updated = ? WHERE url = ?',
+                        ('failed' if final else stage, attempts, f'{stage}: {error}', time.time(), url))
+        self.db.commit()
+        return not final
+
+    def _save_stats(self):
+        _, totals = self.throughput()
+        self.db.executemany('INSERT OR REPLACE INTO throughput VALUES (?, ?, ?, ?, ?)',
+                            [(stage, s.completed, s.failed, s.busy, s.wall) for stage, s in totals.items()])
+        self.db.commit()
+
+    # -- dispatch -----------------------------------------------------------------
+
+    def _submit(self, pool, stage, url, payload):
+        if pool is not None:
+            return pool.submit(_run_stage, stage, url, payload, self.body_dir)
+        future = Future()
+        try:
+            future.set_result(_run_stage(stage, url, payload, self.body_dir))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def run(self, on_progress=None, progress_seconds=PROGRESS_SECONDS):
+        """Drain the queue. Pages further along go first; new pages are read from
+        SQLite only while fewer than in_flight tasks are queued on the pool."""
+        ready = {stage: deque() for stage in STAGES}
+        running = {}                  # future -> (url, stage, payload)
+        last_rowid, exhausted = 0, False
+        active = {stage: 0 for stage in STAGES}
+        clock = time.perf_counter()
+        last_progress = clock
+        pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+        try:
+            while True:
+                while len(running) < self.in_flight:
+                    stage = next((s for s in reversed(STAGES) if ready[s]), None)
+                    if stage is None and not exhausted:
+                        tasks = self._pending(last_rowid, self.in_flight * 2)
+                        exhausted = not tasks
+                        for rowid, url, task_stage, payload in tasks:
+                            ready[task_stage].append((url, payload))
+                            last_rowid = rowid
+                        continue
+                    if stage is None:
+                        break
+                    url, payload = ready[stage].popleft()
+                    running[self._submit(pool, stage, url, payload)] = (url, stage, payload)
+                    active[stage] += 1
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                now = time.perf_counter()
+                for stage in STAGES:
+                    if active[stage]:
+                        self.stats[stage].wall += now - clock
+                clock = now
+                for future in done:
+                    url, stage, payload = running.pop(future)
+                    active[stage] -= 1
+                    try:
+                        result, elapsed = future.result()
+                    except Exception as e:
+                        self.stats[stage].failed += 1
+                        if self._failed(url, stage, f'{type(e).__name__}: {e}'):
+                            ready[stage].append((url, payload))
+                        continue
+                    self.stats[stage].completed += 1
+                    self.stats[stage].busy += elapsed
+                    follow = self._record(url, stage, result)
+                    if follow:
+                        ready[follow[0]].append((url, follow[1]))
+                if now - last_progress >= progress_seconds:
+                    self._save_stats()
+                    if on_progress:
+                        on_progress(self)
+                    last_progress = now
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+            self._save_stats()
+        return self.status()
+
+    def results(self):
+        """(url, template, city, condition, status, findings list, error) for every queued page."""
+        for url, template, city, condition, status, findings, error in self.db.execute(
+                'SELECT url, template, city, condition, status, findings, error FROM pages ORDER BY rowid'):
+            yield url, template, city, condition, status, json.loads(findings) if findings else [], error
+
+
+def _remove(path):
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def to_csv(orchestrator, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['URL', 'Template', 'City', 'Condition', 'HTTP Status', 'Findings', 'Issues', 'Error'])
+        for url, template, city, condition, status, findings, error in orchestrator.results():
+            writer.writerow([url, template, city or '', condition or '', status or '', len(findings),
+                             '; '.join(findings), error or ''])
+
+
+def print_progress(orchestrator):
+    counts = orchestrator.status()
+    line = ' | '.join(f"{stage} {s.completed:,} ({s.rate:.1f}/s)" for stage, s in orchestrator.stats.items())
+    print(f"  {line} | queued {sum(counts.get(s, 0) for s in STAGES):,} "
+          f"done {counts.get('done', 0):,} failed {counts.get('failed', 0):,}", flush=True)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Audit every city x condition x template page, resumably.')
+    parser.add_argument('--base-url', help='site to audit (default: crawler.BASE_URL)')
+    parser.add_argument('--city', action='append', help='default: VALID_CITIES in validate-catalog.js')
+    parser.add_argument('--condition', action='append', help='default: services.json or KNOWN_SPECIALTIES')
+    parser.add_argument('--template', action='append', choices=list(TEMPLATES))
+    parser.add_argument('--queue', default=QUEUE_PATH)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--in-flight', type=int, help='tasks queued on the pool at once (default: 4 per worker)')
+    parser.add_argument('--retry-failed', action='store_true', help='requeue pages that ran out of attempts')
+    parser.add_argument('--status', action='store_true', help='show queue state and throughput, run nothing')
+    args = parser.parse_args()
+
+    with AuditOrchestrator(args.queue, workers=args.workers, in_flight=args.in_flight) as orchestrator:
+        print("=" * 80)
+        print("GLOWHEAL.IN - PAGE AUDIT ORCHESTRATOR")
+        print("=" * 80)
+        if not args.status:
+            from crawler import BASE_URL
+            cities, conditions = site_matrix()
+            templates = {name: TEMPLATES[name] for name in args.template or TEMPLATES}
+            rows = expand(args.base_url or BASE_URL, args.city or cities, args.condition or conditions,
+                          templates)
+            added = orchestrator.add(rows)
+            requeued = orchestrator.retry_failed() if args.retry_failed else 0
+            print(f"Matrix: {len(args.city or cities)} cities x {len(args.condition or conditions)} conditions "
+                  f"x {len(templates)} templates -> {len(rows):,} pages ({added:,} new, {requeued:,} requeued)")
+            print(f"Workers: {orchestrator.workers} | in flight: {orchestrator.in_flight}\n")
+            orchestrator.run(on_progress=print_progress)
+            to_csv(orchestrator, 'glowheal_page_audits.csv')
+
+        counts = orchestrator.status()
+        print("\nQueue: " + ' | '.join(f"{stage}: {counts.get(stage, 0):,}"
+                                      for stage in STAGES + ('done', 'failed')))
+        run, totals = orchestrator.throughput()
+        print(f"\n{'Stage':<9}{'this run':>10}{'pages/s':>10}{'failed':>8}{'all runs':>10}{'per worker/s':>14}")
+        for stage in STAGES:
+            print(f"{stage:<9}{run[stage].completed:>10,}{run[stage].rate:>10.1f}{run[stage].failed:>8,}"
+                  f"{totals[stage].completed:>10,}{totals[stage].per_worker:>14.1f}")
+        if not args.status:
+            print("\n✓ Results exported to: glowheal_page_audits.csv")
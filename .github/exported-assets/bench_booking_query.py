@@ -0,0 +1,80 @@
+# Benchmark: partition-pruned booking_query vs. walking the whole tree
+#
+# Usage: python bench_booking_query.py [bookings per month]
+# Builds synthetic data/leads/YYYY/MM trees with a growing number of months
+# and times the same "last 3 months in Pune" question both ways. The pruned
+# query should stay flat while the full walk grows with history.
+
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from booking_query import query_bookings
+from leads_data import iter_bookings, parse_timestamp
+
+CITIES = ['Pune', 'Mumbai', 'Bengaluru', 'Bhadravati']
+HISTORY_MONTHS = (6, 12, 24, 48)
+
+
+def build_tree(root, months, per_month, end=datetime(2025, 11, 1, tzinfo=timezone.utc)):
+    rng = random.Random(months)
+    year, month = end.year, end.month
+    for _ in range(months):
+        month -= 1
+        if month == 0:
+            year, month = year - 1, 12
+        directory = os.path.join(root, f'{year:04d}', f'{month:02d}')
+        os.makedirs(directory, exist_ok=True)
+        start = datetime(year, month, 1, tzinfo=timezone.utc)
+        for i in range(per_month):
+            ts = start + timedelta(minutes=rng.randrange(28 * 24 * 60))
+            booking = {
+                'id': f'booking-{int(ts.timestamp() * 1000)}-{i}',
+                'timestamp': ts.isoformat().replace('+00:00', 'Z'),
+                'source': 'free_consult',
+                'status': 'pending',
+                'contact': {'name': 'Test', 'phone': '919876543210', 'email': None},
+                'concern': {'specialty': rng.choice(['dermatology', 'ayurveda']), 'description': ''},
+                'preferences': {'visitType': 'online', 'preferredDate': '', 'preferredTime': ''},
+                'items': [{'code': 'GH-CONSULT', 'price': 0, 'city': rng.choice(CITIES)}],
+            }
+            with open(os.path.join(directory, booking['id'] + '.json'), 'w', encoding='utf-8') as f:
+                json.dump(booking, f, indent=2)
+
+
+def full_walk(root, since, until, city):
+    rows = []
+    for record in iter_bookings(root):
+        ts = parse_timestamp(record['timestamp'])
+        if ts and since <= ts < until and (record['city'] or '').lower() == city.lower():
+            rows.append(record)
+    return rows
+
+
+if __name__ == '__main__':
+    per_month = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    since = datetime(2025, 8, 1, tzinfo=timezone.utc)
+    until = datetime(2025, 11, 1, tzinfo=timezone.utc)
+    print(f"'city = Pune, {since:%Y-%m-%d} .. {until:%Y-%m-%d}', {per_month} bookings/month")
+    root = tempfile.mkdtemp(prefix='glowheal-bookings-')
+    try:
+        for months in HISTORY_MONTHS:
+            shutil.rmtree(root)
+            build_tree(root, months, per_month)
+            start = time.perf_counter()
+            frame = query_bookings(root, since, until, archive_dir=os.path.join(root, 'archive'), city='Pune')
+            t_query = time.perf_counter() - start
+            start = time.perf_counter()
+            walked = full_walk(root, since, until, 'Pune')
+            t_walk = time.perf_counter() - start
+            assert len(frame) == len(walked), (len(frame), len(walked))
+            print(f"{months:>3} months ({months * per_month:>7,} files) | "
+                  f"pruned query {t_query * 1000:>8.1f} ms | full walk {t_walk * 1000:>8.1f} ms | "
+                  f"{len(frame):,} rows")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
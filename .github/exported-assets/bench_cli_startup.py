@@ -0,0 +1,66 @@
+# Benchmark: audit_cli.py startup time, with a fixed budget
+#
+# Usage: python bench_cli_startup.py [runs]
+# Times `audit_cli.py --help` and CSV-only exports in fresh interpreters and
+# exits non-zero if the median of any exceeds its budget, or if an export
+# pulled in pandas or numpy. Meant for the pre-deploy hook, so a heavy top-level
+# import creeping back in fails loudly instead of slowing every deploy.
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CLI = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'audit_cli.py')
+
+# (label, arguments, budget in seconds)
+CASES = (
+    ('--help', ['--help'], 0.25),
+    ('export checklist bugs', ['export', 'checklist', 'bugs'], 0.30),
+    ('export (all)', ['export'], 0.45),
+)
+
+# Modules a CSV-only export must never import
+FORBIDDEN = ('pandas', 'numpy')
+
+IMPORTED = ("import os, sys, runpy; sys.argv = [{cli!r}, *{args!r}]; "
+            "sys.path.insert(0, os.path.dirname({cli!r})); "
+            "runpy.run_path({cli!r}, run_name='__main__'); "
+            "print(' '.join(m for m in {forbidden!r} if m in sys.modules), file=sys.stderr)")
+
+
+def median_seconds(args, runs, cwd):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, CLI, *args], cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 7
+    failures = []
+    with tempfile.TemporaryDirectory(prefix='glowheal-cli-') as out_dir:
+        for label, args, budget in CASES:
+            args = args + ['--out-dir', out_dir] if args[0] == 'export' else args
+            seconds = median_seconds(args, runs, out_dir)
+            ok = seconds <= budget
+            print(f"{label:<24} median {seconds * 1000:>7.1f} ms  budget {budget * 1000:>5.0f} ms  "
+                  f"{'ok' if ok else 'OVER BUDGET'}")
+            if not ok:
+                failures.append(label)
+            if args[0] == 'export':
+                check = IMPORTED.format(cli=CLI, args=args, forbidden=FORBIDDEN)
+                imported = subprocess.run([sys.executable, '-c', check], cwd=out_dir, check=True,
+                                          stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                          text=True).stderr.splitlines()[-1:]
+                imported = imported[0].split() if imported else []
+                if imported:
+                    print(f"{'':<24} {' and '.join(imported)} imported")
+                    failures.append(f"{label} ({', '.join(imported)} imported)")
+    if failures:
+        sys.exit(f"\nStartup budget exceeded: {', '.join(failures)}")
+    print("\n✓ CLI startup within budget")
@@ -0,0 +1,95 @@
+# Benchmark: streaming html_extract vs. a full BeautifulSoup tree
+#
+# Usage: python bench_html_extract.py [page.html ...]
+# Without arguments a synthetic Glowheal-like page is generated at several
+# sizes, so the memory curve of both approaches is visible.
+
+import io
+import json
+import sys
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from html_extract import extract
+
+SECTION = """
+<section class="py-16 bg-white">
+  <h2 class="text-3xl font-bold">Acne &amp; Pimples treatment in Pune</h2>
+  <img src="/images/hero/dermatology-hero.jpg" alt="Dermatologist consultation" width="800" height="600">
+  <p>Holistic acne treatment combining modern dermatology with Ayurvedic healing.
+     <a href="/conditions/acne-treatment">Learn more</a> or call
+     <a href="tel:+919876543210">+91 98765 43210</a>.</p>
+  <form action="/api/leads/submit" method="post">
+    <label for="name">Name</label><input id="name" name="name" required>
+    <input name="phone" type="tel" placeholder="Phone">
+    <select name="city"><option>Pune</option><option>Mumbai</option></select>
+  </form>
+  <script>self.__next_f.push([1,"%s"])</script>
+</section>
+"""
+
+JSON_LD = '<script type="application/ld+json">%s</script>' % json.dumps({
+    '@context': 'https://schema.org', '@type': 'MedicalClinic', 'name': 'Glowheal'})
+
+
+def synthetic_page(sections):
+    payload = 'x' * 2000  # stands in for the RSC payload Next.js inlines
+    body = ''.join(SECTION % payload for _ in range(sections))
+    return ('<!DOCTYPE html><html><head><title>Glowheal</title>'
+            '<meta name="description" content="Dermatology and Ayurveda">'
+            f'{JSON_LD}</head><body><h1>Glowheal</h1>{body}</body></html>').encode('utf-8')
+
+
+def with_streaming(html):
+    s = extract(io.BytesIO(html))
+    return (len(s.headings), len(s.images), len(s.links), len(s.tel_links),
+            sum(len(f.fields) for f in s.forms), len(s.json_ld))
+
+
+def with_soup(html):
+    soup = BeautifulSoup(html.decode('utf-8'), 'html.parser')
+    links = soup.find_all('a', href=True)
+    json_ld = [json.loads(t.string) for t in soup.find_all('script', type='application/ld+json')]
+    return (len(soup.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])),
+            len(soup.find_all('img')),
+            len(links),
+            len([a for a in links if a['href'].startswith('tel:')]),
+            len(soup.find_all(['input', 'select', 'textarea'])),
+            len(json_ld))
+
+
+def measure(fn, html):
+    # Timed and traced separately: tracemalloc slows allocation-heavy code
+    start = time.perf_counter()
+    result = fn(html)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(name, html):
+    streamed, t_stream, m_stream = measure(with_streaming, html)
+    souped, t_soup, m_soup = measure(with_soup, html)
+    assert streamed == souped, (streamed, souped)
+    print(f"{name:<28} {len(html) / 1e6:>7.2f} MB | "
+          f"stream {t_stream * 1000:>8.1f} ms {m_stream / 1e6:>7.2f} MB peak | "
+          f"soup {t_soup * 1000:>8.1f} ms {m_soup / 1e6:>7.2f} MB peak | "
+          f"{t_soup / t_stream:>4.1f}x faster")
+
+
+if __name__ == '__main__':
+    print("=" * 110)
+    print("HTML EXTRACTION BENCHMARK - streaming extractor vs BeautifulSoup(html.parser)")
+    print("=" * 110)
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, 'rb') as f:
+                run(path, f.read())
+    else:
+        for sections in (10, 100, 1000):
+            run(f"synthetic x{sections}", synthetic_page(sections))
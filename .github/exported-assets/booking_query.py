@@ -0,0 +1,182 @@
+# Partition-pruned queries over the data/leads/YYYY/MM booking tree
+#
+# api/bookings writes one JSON file per booking into data/leads/<year>/<month>/.
+# Each month directory (or its compacted archive from lead_archive.py) is a
+# partition: date predicates drop whole partitions before anything is opened,
+# equality filters are checked against the raw bytes before a file is parsed,
+# and the surviving partitions are scanned in a process pool. Results come
+# back as a pandas DataFrame.
+#
+#   python booking_query.py --since 2025-07-01 --until 2025-10-01 --city Pune
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from lead_archive import ARCHIVE_DIR, read_archive
+from leads_data import LEADS_DIR, booking_partitions, flatten, parse_timestamp
+
+COLUMNS = ('id', 'timestamp', 'city', 'source', 'concern', 'status')
+FILTERABLE = ('city', 'source', 'concern', 'status')
+
+
+def month_bounds(year, month):
+    start = datetime(year, month, 1, tzinfo=timezone.utc)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+    return start, end
+
+
+def _as_utc(value):
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return parse_timestamp(value)
+
+
+def plan(leads_dir=LEADS_DIR, archive_dir=ARCHIVE_DIR, since=None, until=None):
+    """Partitions overlapping [since, until): [(year, month, directory or None, archive or None)]."""
+    since, until = _as_utc(since), _as_utc(until)
+    partitions = {(y, m): [d, None] for y, m, d in booking_partitions(leads_dir)}
+    if os.path.isdir(archive_dir):
+        for name in os.listdir(archive_dir):
+            if name.endswith('.npz') and len(name) == 11:
+                key = (int(name[:4]), int(name[5:7]))
+                partitions.setdefault(key, [None, None])[1] = os.path.join(archive_dir, name)
+    kept = []
+    for (year, month), (directory, archive) in sorted(partitions.items()):
+        start, end = month_bounds(year, month)
+        if (since and end <= since) or (until and start >= until):
+            continue
+        kept.append((year, month, directory, archive))
+    return kept
+
+
+def _matches(record, filters, since, until):
+    for name, wanted in filters.items():
+        if str(record.get(name) or '').lower() not in wanted:
+            return False
+    if since or until:
+        ts = parse_timestamp(record.get('timestamp'))
+        if ts is None or (since and ts < since) or (until and ts >= until):
+            return False
+    return True
+
+
+def scan_partition(task):
+    """Matching rows of one partition as {column: list}; runs in a worker process."""
+    directory, archive, filters, since, until, columns = task
+    out = {c: [] for c in columns}
+    # Pushdown: a file can only match if every filter value appears in its bytes
+    needles = [[w.encode('utf-8') for w in wanted] for wanted in filters.values()]
+    seen = set()
+    if directory:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not (entry.is_file() and entry.name.endswith('.json')):
+                    continue
+                with open(entry.path, 'rb') as f:
+                    raw = f.read()
+                lowered = raw.lower()
+                if not all(any(n in lowered for n in options) for options in needles):
+                    continue
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    continue
+                if not isinstance(record, dict):
+                    continue
+                record = flatten(record, 'booking')
+                seen.add(record['id'])
+                if _matches(record, filters, since, until):
+                    for c in columns:
+                        out[c].append(record.get(c))
+    if archive:
+        wanted_columns = sorted(set(columns) | set(filters) | {'id', 'timestamp', 'kind'})
+        data = read_archive(archive, wanted_columns)
+        mask = (data['kind'] == 'booking') & ~np.isin(data['id'], list(seen))
+        for name, wanted in filters.items():
+            mask &= np.isin(np.char.lower(data[name].astype(str)), list(wanted))
+        ts = data['timestamp']
+        if since:
+            mask &= ts >= since.timestamp() * 1000
+        if until:
+            mask &= ts < until.timestamp() * 1000
+        for c in columns:
+            values = data[c][mask]
+            if c == 'timestamp':
+                out[c] += [datetime.fromtimestamp(v / 1000, timezone.utc).isoformat() if v >= 0 else None
+                           for v in values.tolist()]
+            else:
+                out[c] += values.tolist()
+    return out
+
+
+def query_bookings(leads_dir=LEADS_DIR, since=None, until=None, columns=COLUMNS, workers=None,
+                   archive_dir=ARCHIVE_DIR, **filters):
+    """Bookings in [since, until) whose fields equal the given values (case-insensitive).
+
+    Filter values may be a string or a list of alternatives, e.g.
+    query_bookings(since='2025-07-01', until='2025-10-01', city='Pune').
+    """
+    unknown = set(filters) - set(FILTERABLE)
+    if unknown:
+        raise ValueError(f'cannot filter on {sorted(unknown)}; choose from {FILTERABLE}')
+    since, until = _as_utc(since), _as_utc(until)
+    filters = {name: {v.lower() for v in ([value] if isinstance(value, str) else value)}
+               for name, value in filters.items() if value}
+    columns = list(columns)
+    tasks = [(directory, archive, filters, since, until, columns)
+             for _, _, directory, archive in plan(leads_dir, archive_dir, since, until)]
+    if (workers or os.cpu_count()) == 1 or len(tasks) <= 1:
+        parts = list(map(scan_partition, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(scan_partition, tasks))
+    frame = pd.DataFrame({c: [v for part in parts for v in part[c]] for c in columns})
+    if 'timestamp' in frame:
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'], utc=True, errors='coerce', format='ISO8601')
+        frame = frame.sort_values('timestamp', kind='stable').reset_index(drop=True)
+    return frame
+
+
+def last_quarter(now=None):
+    """[start, end) of the calendar quarter before the one containing now."""
+    now = now or datetime.now(timezone.utc)
+    quarter_start = datetime(now.year, 3 * ((now.month - 1) // 3) + 1, 1, tzinfo=timezone.utc)
+    month = quarter_start.month - 3
+    year = quarter_start.year - (month < 1)
+    return datetime(year, (month - 1) % 12 + 1, 1, tzinfo=timezone.utc), quarter_start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Query bookings under data/leads/YYYY/MM.')
+    parser.add_argument('--leads-dir', default=LEADS_DIR)
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    parser.add_argument('--since', help='ISO date, inclusive (default: last calendar quarter)')
+    parser.add_argument('--until', help='ISO date, exclusive')
+    for name in FILTERABLE:
+        parser.add_argument(f'--{name}', action='append', help=f'{name} equals (repeatable)')
+    parser.add_argument('--count-by', choices=FILTERABLE)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    since, until = (args.since, args.until) if args.since or args.until else last_quarter()
+    filters = {name: getattr(args, name) for name in FILTERABLE}
+    partitions = plan(args.leads_dir, args.archive_dir, _as_utc(since), _as_utc(until))
+    frame = query_bookings(args.leads_dir, since, until, workers=args.workers,
+                           archive_dir=args.archive_dir, **filters)
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - BOOKINGS QUERY")
+    print("=" * 80)
+    window = ' .. '.join(f'{_as_utc(t):%Y-%m-%d}' if t else 'open' for t in (since, until))
+    print(f"Window: {window} | "
+          f"partitions scanned: {len(partitions)} | bookings: {len(frame):,}")
+    if args.count_by and len(frame):
+        print(frame.groupby(args.count_by).size().sort_values(ascending=False).to_string())
+    elif len(frame):
+        print(frame.tail(20).to_string(index=False))
@@ -0,0 +1,276 @@
+# Incremental build of the report outputs
+#
+# script_1.py .. script_5.py each rebuild their DataFrames and rewrite their
+# glowheal_* files from scratch on every run. Here each script is a named
+# stage with declared inputs (the script, the local modules it imports, any
+# data files or globs) and outputs. A stage's key is a hash of its command
+# and the content of its inputs; if the key matches the last successful run
+# and the outputs are still what that run wrote, the stage is skipped.
+# A stage that reads another stage's output runs after it; everything else
+# runs in parallel.
+#
+#   python build_graph.py                 # bring every stage up to date
+#   python build_graph.py summary --force # re-run one stage regardless
+#   python build_graph.py --dry-run
+
+import argparse
+import ast
+import glob
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
+STATE_PATH = '.audit-cache/build-graph.json'
+LOG_DIR = '.audit-cache/build-logs'
+
+
+@dataclass
+class Stage:
+    name: str
+    script: str
+    outputs: tuple = ()
+    inputs: tuple = ()       # extra files or globs besides the script and its imports
+    args: tuple = ()
+    deps: set = field(default_factory=set)
+
+    @property
+    def command(self):
+        return [sys.executable, self.script, *self.args]
+
+
+STAGES = (
+    Stage('analysis', 'script_1.py'),
+    Stage('pricing-design', 'script_2.py', outputs=('glowheal_pricing_strategy.csv',
+                                                    'glowheal_color_palette.csv',
+                                                    'glowheal_button_specifications.csv')),
+    Stage('checklist', 'script_3.py', outputs=('glowheal_implementation_checklist.csv',)),
+    Stage('bugs', 'script_4.py', outputs=('glowheal_bugs_and_issues.csv',)),
+    Stage('summary', 'script_5.py', outputs=('glowheal_executive_summary.txt',)),
+)
+
+
+def local_imports(script, root=ASSETS_DIR, seen=None):
+    """The script plus every module beside it that it imports, transitively."""
+    seen = set() if seen is None else seen
+    if script in seen:
+        return seen
+    seen.add(script)
+    with open(os.path.join(root, script), encoding='utf-8') as f:
+        tree = ast.parse(f.read(), script)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names = [node.module]
+        else:
+            continue
+        for name in names:
+            candidate = name.split('.')[0] + '.py'
+            if os.path.exists(os.path.join(root, candidate)):
+                local_imports(candidate, root, seen)
+    return seen
+
+
+def resolve(patterns, root=ASSETS_DIR):
+    """Sorted relative paths matching the given files/globs."""
+    paths = set()
+    for pattern in patterns:
+        matches = glob.glob(os.path.join(root, pattern), recursive=True)
+        paths.update(os.path.relpath(p, root) for p in matches if os.path.isfile(p))
+    return sorted(paths)
+
+
+class FileHasher:
+    """sha256 of file contents, skipping the read when (size, mtime) is unchanged."""
+
+    def __init__(self, known=None):
+        self.known = known or {}
+
+    def __call__(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        stamp = [st.st_size, st.st_mtime_ns]
+        cached = self.known.get(path)
+        if cached and cached[:2] == stamp:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.known[path] = stamp + [digest.hexdigest()]
+        return digest.hexdigest()
+
+
+class BuildGraph:
+    def __init__(self, stages=STAGES, root=ASSETS_DIR, workers=None):
+        self.root = root
+        self.workers = workers
+        self.stages = {s.name: Stage(s.name, s.script, s.outputs, s.inputs, s.args, set(s.deps))
+                       for s in stages}
+        producers = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(f'{output} is produced by both {producers[output]} and {stage.name}')
+                producers[output] = stage.name
+        for stage in self.stages.values():
+            for path in self.inputs(stage):
+                if path in producers and producers[path] != stage.name:
+                    stage.deps.add(producers[path])
+        self.order = self._toposort()
+        self.state_path = os.path.join(root, STATE_PATH)
+        self.state = {'stages': {}, 'files': {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                self.state = json.load(f)
+        self.hash = FileHasher(self.state.setdefault('files', {}))
+
+    def inputs(self, stage):
+        """Relative paths the stage reads; declared files count even before they exist."""
+        declared = {p for p in stage.inputs if not glob.has_magic(p)}
+        return sorted(local_imports(stage.script, self.root) | set(resolve(stage.inputs, self.root)) | declared)
+
+    def _toposort(self):
+        order, marks = [], {}
+
+        def visit(name, path):
+            if marks.get(name) == 'done':
+                return
+            if marks.get(name) == 'active':
+                raise ValueError('dependency cycle: ' + ' -> '.join(path + [name]))
+            marks[name] = 'active'
+            for dep in sorted(self.stages[name].deps):
+                visit(dep, path + [name])
+            marks[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name, [])
+        return order
+
+    def key(self, stage):
+        digest = hashlib.sha256(json.dumps([stage.name, stage.script, list(stage.args)]).encode())
+        for path in self.inputs(stage):
+            digest.update(f'\0{path}\0{self.hash(os.path.join(self.root, path))}'.encode())
+        return digest.hexdigest()
+
+    def outputs_intact(self, stage, recorded):
+        return all(self.hash(os.path.join(self.root, p)) == recorded.get(p) for p in stage.outputs)
+
+    def up_to_date(self, stage):
+        previous = self.state['stages'].get(stage.name)
+        return bool(previous) and previous['key'] == self.key(stage) \
+            and self.outputs_intact(stage, previous['outputs'])
+
+    def closure(self, targets):
+        """Targets plus everything upstream of them, in dependency order."""
+        wanted, pending = set(), list(targets or self.stages)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise KeyError(f'unknown stage {name!r}; choose from {", ".join(self.stages)}')
+            if name not in wanted:
+                wanted.add(name)
+                pending.extend(self.stages[name].deps)
+        return [name for name in self.order if name in wanted]
+
+    def _run(self, stage):
+        os.makedirs(os.path.join(self.root, LOG_DIR), exist_ok=True)
+        log_path = os.path.join(self.root, LOG_DIR, f'{stage.name}.log')
+        start = time.perf_counter()
+        with open(log_path, 'w', encoding='utf-8') as log:
+            proc = subprocess.run(stage.command, cwd=self.root, stdout=log, stderr=subprocess.STDOUT,
+                                  env={**os.environ, 'PYTHONIOENCODING': 'utf-8'})
+        return proc.returncode, time.perf_counter() - start, log_path
+
+    def build(self, targets=None, force=False, dry_run=False):
+        """{stage: (status, seconds)} where status is ran, cached, failed or skipped."""
+        names = self.closure(targets)
+        results, running = {}, {}
+        # Keys are taken before anything runs, since upstream stages rewrite inputs
+        stale = {name: force or not self.up_to_date(self.stages[name]) for name in names}
+        remaining = list(names)
+        with ThreadPoolExecutor(max_workers=self.workers or os.cpu_count()) as pool:
+            while remaining or running:
+                for name in list(remaining):
+                    deps = self.stages[name].deps
+                    if any(results.get(d, ('',))[0] in ('failed', 'skipped') for d in deps):
+                        results[name] = ('skipped', 0.0)
+                        remaining.remove(name)
+                    elif all(d in results for d in deps if d in names):
+                        remaining.remove(name)
+                        upstream_ran = any(results[d][0] == 'ran' for d in deps if d in results)
+                        if not (stale[name] or upstream_ran):
+                            results[name] = ('cached', 0.0)
+                        elif dry_run:
+                            results[name] = ('would run', 0.0)
+                        else:
+                            running[pool.submit(self._run, self.stages[name])] = name
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    stage = self.stages[name]
+                    code, seconds, log_path = future.result()
+                    if code:
+                        results[name] = ('failed', seconds)
+                        self.state['stages'].pop(name, None)
+                        continue
+                    results[name] = ('ran', seconds)
+                    self.state['stages'][name] = {
+                        'key': self.key(stage),
+                        'outputs': {p: self.hash(os.path.join(self.root, p)) for p in stage.outputs},
+                        'seconds': round(seconds, 3),
+                    }
+        if not dry_run:
+            self.save()
+        return {name: results[name] for name in names}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp = self.state_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=1)
+        os.replace(tmp, self.state_path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Re-run only the report stages whose inputs changed.')
+    parser.add_argument('stages', nargs='*', help='stages to build (default: all)')
+    parser.add_argument('--force', action='store_true', help='ignore cached results')
+    parser.add_argument('--dry-run', action='store_true', help='show what would run')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--list', action='store_true', help='print the graph and exit')
+    args = parser.parse_args()
+
+    graph = BuildGraph(workers=args.workers)
+    if args.list:
+        for name in graph.order:
+            stage = graph.stages[name]
+            after = f"  (after {', '.join(sorted(stage.deps))})" if stage.deps else ''
+            print(f"{name:<16} {stage.script:<14} -> {', '.join(stage.outputs) or '(stdout only)'}{after}")
+        sys.exit(0)
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - REPORT BUILD")
+    print("=" * 80)
+    start = time.perf_counter()
+    results = graph.build(args.stages, args.force, args.dry_run)
+    for name, (status, seconds) in results.items():
+        timing = f"{seconds:6.2f}s" if status in ('ran', 'failed') else ''
+        print(f"  {name:<16} {status:<10} {timing}")
+    failed = [name for name, (status, _) in results.items() if status == 'failed']
+    for name in failed:
+        print(f"\n! {name} failed, see {os.path.join(LOG_DIR, name + '.log')}")
+    ran = sum(status == 'ran' for status, _ in results.values())
+    print(f"\n✓ {ran} of {len(results)} stage(s) ran in {time.perf_counter() - start:.2f}s")
+    sys.exit(1 if failed else 0)
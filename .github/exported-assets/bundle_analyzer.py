@@ -0,0 +1,485 @@
+# Next.js bundle composition analyzer for apps/web
+#
+# Answers "what is actually inside our client chunks?" for the "Minify
+# CSS/JS", "Defer non-critical JavaScript" and "Implement code splitting"
+# recommendations. Reads the .next build output, attributes every byte of
+# every chunk to the source module (and npm package) it came from via the
+# chunk's source map, and rolls that up per route.
+#
+# Source maps are only emitted when the build runs with
+# ANALYZE_BUNDLE=1 (productionBrowserSourceMaps in next.config.js):
+#
+#   ANALYZE_BUNDLE=1 npm run build
+#   python bundle_analyzer.py ../../apps/web/.next --save build.json
+#   python bundle_analyzer.py ../../apps/web/.next --diff old-build.json
+#
+# Maps are parsed as a stream: 'mappings' is VLQ-decoded chunk by chunk and
+# 'sourcesContent' (most of a map's size) is skipped without being held.
+
+import argparse
+import gzip
+import json
+import os
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+
+try:
+    import brotli
+except ImportError:  # brotli sizes are reported as 0 without it
+    brotli = None
+
+DEFAULT_BUILD_DIR = os.path.join('..', '..', 'apps', 'web', '.next')
+READ_SIZE = 1024 * 1024
+UNMAPPED = '<unmapped>'
+NO_SOURCE_MAP = '<no source map>'
+FIRST_PARTY = '(app)'
+
+B64 = {c: i for i, c in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+
+
+# -- streaming source-map reader ----------------------------------------------
+
+class _JsonStream:
+    """Just enough of a pull JSON reader to walk a source map's top level."""
+
+    def __init__(self, f, read_size=READ_SIZE):
+        self.f = f
+        self.read_size = read_size
+        self.buf = ''
+        self.pos = 0
+
+    def _fill(self):
+        data = self.f.read(self.read_size)
+        if not data:
+            return False
+        self.buf = self.buf[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        while self.pos >= len(self.buf):
+            if not self._fill():
+                return ''
+        return self.buf[self.pos]
+
+    def expect(self, char):
+        if self.skip_ws() != char:
+            raise ValueError(f'expected {char!r} at source map offset {self.pos}')
+        self.pos += 1
+
+    def skip_ws(self):
+        while True:
+            c = self.peek()
+            if c and c in ' \t\r\n':
+                self.pos += 1
+            else:
+                return c
+
+    def string_parts(self):
+        """Yield the raw (still escaped) pieces of the string at the cursor."""
+        self.expect('"')
+        while True:
+            if self.pos >= len(self.buf) and not self._fill():
+                raise ValueError('unterminated string in source map')
+            buf, i = self.buf, self.pos
+            quote = buf.find('"', i)
+            slash = buf.find('\\', i, quote if quote >= 0 else len(buf))
+            if slash >= 0:
+                if slash + 1 >= len(buf):
+                    yield buf[i:slash]
+                    self.pos = slash
+                    if not self._fill():
+                        raise ValueError('unterminated escape in source map')
+                    continue
+                yield buf[i:slash + 2]
+                self.pos = slash + 2
+            elif quote >= 0:
+                yield buf[i:quote]
+                self.pos = quote + 1
+                return
+            else:
+                yield buf[i:]
+                self.pos = len(buf)
+
+    def read_string(self):
+        return json.loads('"' + ''.join(self.string_parts()) + '"')
+
+    def skip_value(self):
+        c = self.skip_ws()
+        if c == '"':
+            for _ in self.string_parts():
+                pass
+        elif c in '[{':
+            self.pos += 1
+            closing = ']' if c == '[' else '}'
+            while self.skip_ws() != closing:
+                if not self.peek():
+                    raise ValueError('unexpected end of source map')
+                if closing == '}':
+                    self.skip_value()       # key
+                    self.expect(':')
+                self.skip_value()
+                if self.skip_ws() == ',':
+                    self.pos += 1
+            self.pos += 1
+        else:
+            while self.peek() and self.peek() not in ',]} \t\r\n':
+                self.pos += 1
+
+    def read_string_array(self):
+        self.expect('[')
+        items = []
+        while self.skip_ws() != ']':
+            if self.peek() == 'n':
+                self.skip_value()           # null entry
+                items.append(None)
+            else:
+                items.append(self.read_string())
+            if self.skip_ws() == ',':
+                self.pos += 1
+        self.pos += 1
+        return items
+
+    def members(self):
+        """Yield top-level keys; the caller must consume each value."""
+        self.expect('{')
+        while self.skip_ws() != '}':
+            key = self.read_string()
+            self.expect(':')
+            yield key
+            if self.skip_ws() == ',':
+                self.pos += 1
+        self.pos += 1
+
+
+class _MappingsDecoder:
+    """Incremental VLQ decoder emitting (generated line, [(column, source)])."""
+
+    def __init__(self, on_line):
+        self.on_line = on_line
+        self.line = 0
+        self.segments = []
+        self.fields = []
+        self.value = 0
+        self.shift = 0
+        self.column = 0
+        self.source = 0
+
+    def feed(self, text):
+        for c in text:
+            if c == ',':
+                self._segment()
+            elif c == ';':
+                self._segment()
+                self._end_line()
+            else:
+                digit = B64[c]
+                self.value += (digit & 31) << self.shift
+                if digit & 32:
+                    self.shift += 5
+                else:
+                    value = self.value >> 1
+                    self.fields.append(-value if self.value & 1 else value)
+                    self.value = self.shift = 0
+
+    def _segment(self):
+        f = self.fields
+        if not f:
+            return
+        self.column += f[0]
+        if len(f) >= 4:
+            self.source += f[1]
+            self.segments.append((self.column, self.source))
+        else:
+            self.segments.append((self.column, -1))
+        self.fields = []
+
+    def _end_line(self):
+        self.on_line(self.line, self.segments)
+        self.line += 1
+        self.segments = []
+        self.column = 0
+
+    def close(self):
+        self._segment()
+        self._end_line()
+
+
+def read_source_map(map_path, on_line):
+    """Stream a source map: mappings go to on_line, returns (sources, source_root)."""
+    sources, source_root = [], ''
+    with open(map_path, encoding='utf-8') as f:
+        stream = _JsonStream(f)
+        for key in stream.members():
+            if key == 'mappings':
+                decoder = _MappingsDecoder(on_line)
+                for part in stream.string_parts():
+                    decoder.feed(part)
+                decoder.close()
+            elif key == 'sources':
+                sources = stream.read_string_array()
+            elif key == 'sourceRoot' and stream.skip_ws() == '"':
+                source_root = stream.read_string()
+            else:
+                stream.skip_value()         # sourcesContent, names, file, version...
+    return sources, source_root
+
+
+# -- attribution ----------------------------------------------------------------
+
+def module_name(source, source_root=''):
+    """'webpack://_N_E/./node_modules/react/index.js' -> 'node_modules/react/index.js'."""
+    name = (source_root or '') + (source or '')
+    if name.startswith('webpack://'):
+        name = name[len('webpack://'):]
+        name = name.split('/', 1)[1] if '/' in name else name
+    while name.startswith('./') or name.startswith('../'):
+        name = name.split('/', 1)[1]
+    return name.split('?')[0] or UNMAPPED
+
+
+def package_name(module):
+    """npm package a module belongs to, or FIRST_PARTY / a placeholder."""
+    if module in (UNMAPPED, NO_SOURCE_MAP):
+        return module
+    if 'node_modules/' not in module:
+        return FIRST_PARTY
+    rest = module.rsplit('node_modules/', 1)[1].split('/')
+    return '/'.join(rest[:2]) if rest[0].startswith('@') else rest[0]
+
+
+@dataclass
+class ModuleSize:
+    raw: int = 0
+    gzip: int = 0
+    brotli: int = 0
+
+    def __iadd__(self, other):
+        self.raw += other.raw
+        self.gzip += other.gzip
+        self.brotli += other.brotli
+        return self
+
+
+def measure(data):
+    return ModuleSize(
+        raw=len(data),
+        gzip=len(gzip.compress(data, 9)) if data else 0,
+        brotli=len(brotli.compress(data)) if brotli is not None and data else 0,
+    )
+
+
+@dataclass
+class ChunkAnalysis:
+    name: str
+    size: int
+    modules: dict = field(default_factory=dict)   # module -> ModuleSize
+
+
+def analyze_chunk(path, name=None):
+    """Attribute every byte of one emitted JS/CSS file to its source modules."""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        lines = f.read().split('\n')
+    size = os.path.getsize(path)
+    name = name or os.path.basename(path)
+    map_path = path + '.map'
+    if not os.path.exists(map_path):
+        text = '\n'.join(lines).encode('utf-8')
+        return ChunkAnalysis(name, size, {NO_SOURCE_MAP: measure(text)})
+
+    spans = defaultdict(list)    # source index (-1 = unmapped) -> text pieces
+    seen_lines = 0
+
+    def on_line(line_no, segments):
+        nonlocal seen_lines
+        if line_no >= len(lines):
+            return
+        seen_lines = line_no + 1
+        text = lines[line_no]
+        newline = '\n' if line_no + 1 < len(lines) else ''
+        if not segments:
+            spans[-1].append(text + newline)
+            return
+        if segments[0][0] > 0:
+            spans[-1].append(text[:segments[0][0]])
+        for i, (column, source) in enumerate(segments):
+            end = segments[i + 1][0] if i + 1 < len(segments) else len(text)
+            spans[source].append(text[column:end])
+        spans[-1].append(newline)
+
+    sources, source_root = read_source_map(map_path, on_line)
+    spans[-1].append('\n'.join(lines[seen_lines:]))
+
+    modules = {}
+    for index, pieces in spans.items():
+        if not any(pieces):
+            continue
+        module = UNMAPPED if index < 0 or index >= len(sources) else module_name(sources[index], source_root)
+        size_ = measure(''.join(pieces).encode('utf-8'))
+        if module in modules:
+            modules[module] += size_
+        else:
+            modules[module] = size_
+    return ChunkAnalysis(name, size, modules)
+
+
+# -- whole build ------------------------------------------------------------------
+
+def route_manifest(build_dir):
+    """{route: [chunk paths relative to build_dir]} from the build manifests."""
+    routes = {}
+    app_manifest = os.path.join(build_dir, 'app-build-manifest.json')
+    if os.path.exists(app_manifest):
+        with open(app_manifest, encoding='utf-8') as f:
+            for route, files in json.load(f).get('pages', {}).items():
+                routes[route] = list(files)
+    pages_manifest = os.path.join(build_dir, 'build-manifest.json')
+    if os.path.exists(pages_manifest):
+        with open(pages_manifest, encoding='utf-8') as f:
+            data = json.load(f)
+        shared = data.get('polyfillFiles', []) + data.get('rootMainFiles', [])
+        for route, files in data.get('pages', {}).items():
+            routes.setdefault(route, shared + list(files))
+    return routes
+
+
+@dataclass
+class BuildAnalysis:
+    chunks: dict          # chunk path -> ChunkAnalysis
+    routes: dict          # route -> [chunk path]
+
+    def route_modules(self, route):
+        totals = defaultdict(ModuleSize)
+        for chunk in self.routes.get(route, ()):
+            if chunk in self.chunks:
+                for module, size in self.chunks[chunk].modules.items():
+                    totals[module] += size
+        return dict(totals)
+
+    def route_packages(self, route):
+        totals = defaultdict(ModuleSize)
+        for module, size in self.route_modules(route).items():
+            totals[package_name(module)] += size
+        return dict(totals)
+
+    def route_totals(self):
+        totals = {}
+        for route in self.routes:
+            total = ModuleSize()
+            for size in self.route_modules(route).values():
+                total += size
+            totals[route] = total
+        return totals
+
+    def package_totals(self):
+        """Bytes per package across all emitted chunks (each chunk counted once)."""
+        totals = defaultdict(ModuleSize)
+        for chunk in self.chunks.values():
+            for module, size in chunk.modules.items():
+                totals[package_name(module)] += size
+        return dict(totals)
+
+    def duplicates(self):
+        """[(module, [chunks], wasted raw bytes)] for modules bundled more than once."""
+        where = defaultdict(list)
+        for name, chunk in self.chunks.items():
+            for module, size in chunk.modules.items():
+                if module not in (UNMAPPED, NO_SOURCE_MAP):
+                    where[module].append((name, size.raw))
+        rows = []
+        for module, copies in where.items():
+            if len(copies) > 1:
+                raws = [raw for _, raw in copies]
+                rows.append((module, sorted(n for n, _ in copies), sum(raws) - max(raws)))
+        return sorted(rows, key=lambda row: row[2], reverse=True)
+
+    def to_json(self, path):
+        data = {
+            'routes': self.routes,
+            'chunks': {name: {'size': c.size, 'modules': {m: asdict(s) for m, s in c.modules.items()}}
+                       for name, c in self.chunks.items()},
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        chunks = {name: ChunkAnalysis(name, c['size'], {m: ModuleSize(**s) for m, s in c['modules'].items()})
+                  for name, c in data['chunks'].items()}
+        return cls(chunks, data['routes'])
+
+
+def analyze_build(build_dir=DEFAULT_BUILD_DIR):
+    routes = route_manifest(build_dir)
+    chunk_paths = sorted({c for files in routes.values() for c in files})
+    static = os.path.join(build_dir, 'static')
+    for root, _, files in os.walk(static):
+        for name in files:
+            if name.endswith(('.js', '.css')):
+                chunk_paths.append(os.path.relpath(os.path.join(root, name), build_dir).replace(os.sep, '/'))
+    chunks = {}
+    for chunk in dict.fromkeys(chunk_paths):
+        path = os.path.join(build_dir, chunk)
+        if os.path.exists(path):
+            chunks[chunk] = analyze_chunk(path, chunk)
+    return BuildAnalysis(chunks, routes)
+
+
+def load_build(path):
+    """A BuildAnalysis from a .next directory or a saved --save snapshot."""
+    return analyze_build(path) if os.path.isdir(path) else BuildAnalysis.from_json(path)
+
+
+def diff_builds(before, after):
+    """(kind, key, before raw, after raw, delta) per route and per package, largest change first."""
+    rows = []
+    for kind, old, new in (('route', before.route_totals(), after.route_totals()),
+                           ('package', before.package_totals(), after.package_totals())):
+        for key in set(old) | set(new):
+            a = old.get(key, ModuleSize()).raw
+            b = new.get(key, ModuleSize()).raw
+            if a != b:
+                rows.append((kind, key, a, b, b - a))
+    return sorted(rows, key=lambda row: abs(row[4]), reverse=True)
+
+
+def _kb(n):
+    return f"{n / 1024:>9.1f} KB"
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Attribute Next.js chunk bytes to modules and packages.')
+    parser.add_argument('build', nargs='?', default=DEFAULT_BUILD_DIR, help='.next directory or saved snapshot')
+    parser.add_argument('--save', help='write a JSON snapshot for later diffs')
+    parser.add_argument('--diff', help='.next directory or snapshot to compare against')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    build = load_build(args.build)
+    if args.save:
+        build.to_json(args.save)
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - CLIENT BUNDLE BY ROUTE (raw / gzip / brotli)")
+    print("=" * 80)
+    for route, total in sorted(build.route_totals().items(), key=lambda kv: -kv[1].raw):
+        print(f"\n{route}: {_kb(total.raw)} {_kb(total.gzip)} {_kb(total.brotli)}")
+        packages = sorted(build.route_packages(route).items(), key=lambda kv: -kv[1].raw)
+        for package, size in packages[:args.top]:
+            print(f"   {package:<40} {_kb(size.raw)} {_kb(size.gzip)}")
+
+    duplicates = build.duplicates()
+    print("\n" + "=" * 80)
+    print(f"MODULES DUPLICATED ACROSS CHUNKS: {len(duplicates)}")
+    print("=" * 80)
+    for module, chunks, wasted in duplicates[:args.top]:
+        print(f"{_kb(wasted)} wasted  {module}  ({len(chunks)} chunks)")
+
+    if args.diff:
+        print("\n" + "=" * 80)
+        print(f"CHANGES SINCE {args.diff}")
+        print("=" * 80)
+        for kind, key, a, b, delta in diff_builds(load_build(args.diff), build)[:args.top * 2]:
+            print(f"{kind:<8} {key:<45} {_kb(a)} -> {_kb(b)} ({delta:+,} B)")
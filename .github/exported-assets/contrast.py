@@ -0,0 +1,295 @@
+# WCAG 2.1 contrast engine for the Glowheal palette and site colors
+#
+# Colors come from glowheal_color_palette.csv plus whatever the site's CSS,
+# Tailwind config and inline styles use. Relative luminance and the contrast
+# ratio of every foreground/background pair are computed in one NumPy batch
+# (an N x N matrix), then checked against the AA/AAA thresholds for normal
+# and large text.
+#
+# numpy is imported inside the matrix functions: script_2.py only needs
+# describe_on_white, which is plain Python, and `audit_cli.py export` must not
+# pay for numpy (bench_cli_startup.py checks it).
+#
+#   python contrast.py                     # palette, globals.css, tailwind.config.ts
+#   python contrast.py --crawl             # plus <style> blocks and style="" on every page
+
+import argparse
+import csv
+import os
+import re
+from dataclasses import dataclass
+from html import unescape
+from urllib.parse import urlsplit
+
+PALETTE_CSV = 'glowheal_color_palette.csv'
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+SITE_SOURCES = [
+    os.path.join(REPO_ROOT, 'apps', 'web', 'src', 'styles', 'globals.css'),
+    os.path.join(REPO_ROOT, 'apps', 'web', 'tailwind.config.ts'),
+]
+
+# WCAG 2.1 SC 1.4.3 / 1.4.6 minimum ratios
+AA_NORMAL = 4.5
+AA_LARGE = 3.0
+AAA_NORMAL = 7.0
+AAA_LARGE = 4.5
+# Below this against white a color is a background tone, not a text color
+BACKGROUND_TONE = 1.5
+
+HEX_COLOR = re.compile(r'#([0-9a-fA-F]{8}|[0-9a-fA-F]{6}|[0-9a-fA-F]{3,4})\b')
+RGB_COLOR = re.compile(r'rgba?\(\s*(\d{1,3})[\s,]+(\d{1,3})[\s,]+(\d{1,3})')
+CSS_VARIABLE = re.compile(r'(--[\w-]+)\s*:\s*([^;}{]+)')
+TS_KEY = re.compile(r"""^\s*['"]?([\w-]+)['"]?\s*:\s*(\{|['"](#[0-9a-fA-F]{3,8})['"])""")
+STYLE_BLOCK = re.compile(r'<style\b[^>]*>(.*?)</style\s*>', re.S | re.I)
+STYLE_ATTR = re.compile(r"""\sstyle\s*=\s*(?:"([^"]*)"|'([^']*)')""", re.I)
+
+
+@dataclass
+class Swatch:
+    name: str
+    hex: str       # normalised '#RRGGBB'
+    source: str
+
+
+def normalize_hex(value):
+    """'#abc', '#AABBCC' or '#aabbccdd' -> '#AABBCC' (alpha dropped), else None."""
+    match = HEX_COLOR.fullmatch(value.strip())
+    if not match:
+        return None
+    digits = match.group(1)
+    if len(digits) in (3, 4):
+        digits = ''.join(c * 2 for c in digits[:3])
+    return '#' + digits[:6].upper()
+
+
+def palette_from_csv(path=PALETTE_CSV):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [Swatch(row['Color Name'], normalize_hex(row['Hex Code']), os.path.basename(path))
+                for row in csv.DictReader(f) if normalize_hex(row['Hex Code'])]
+
+
+def colors_from_css(text, source='css'):
+    """Swatches for every literal color in CSS or HTML (style attributes included).
+
+    Custom properties keep their variable name; other colors are named by value.
+    """
+    swatches = []
+    named = set()
+    for var, value in CSS_VARIABLE.findall(text):
+        hexes = HEX_COLOR.findall(value)
+        if hexes:
+            swatches.append(Swatch(var, normalize_hex('#' + hexes[0]), source))
+            named.add(swatches[-1].hex)
+    for digits in HEX_COLOR.findall(text):
+        color = normalize_hex('#' + digits)
+        if color not in named:
+            swatches.append(Swatch(color, color, source))
+    for r, g, b in RGB_COLOR.findall(text):
+        if max(int(r), int(g), int(b)) <= 255:
+            color = '#%02X%02X%02X' % (int(r), int(g), int(b))
+            swatches.append(Swatch(color, color, source))
+    return swatches
+
+
+def colors_from_tailwind(text, source='tailwind.config.ts'):
+    """Theme colors from a Tailwind config, named like the utility ('primary-500')."""
+    swatches = []
+    path = []
+    for line in text.splitlines():
+        match = TS_KEY.match(line)
+        opened = bool(match and match.group(2) == '{')
+        if opened:
+            path.append(match.group(1))
+        elif match and match.group(3):
+            key = match.group(1)
+            name = '-'.join(path[-1:] + ([] if key == 'DEFAULT' else [key]))
+            swatches.append(Swatch(name, normalize_hex(match.group(3)), source))
+        # Unnamed '{' (arrays of objects, functions) must balance their own '}'
+        depth_change = line.count('{') - opened - line.count('}')
+        while depth_change < 0 and path:
+            path.pop()
+            depth_change += 1
+    return swatches
+
+
+def site_colors(paths=SITE_SOURCES):
+    swatches = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        name = os.path.basename(path)
+        if path.endswith(('.ts', '.js')):
+            swatches += colors_from_tailwind(text, name)
+        else:
+            swatches += colors_from_css(text, name)
+    return swatches
+
+
+def inline_css(html):
+    """The CSS a page carries itself: <style> blocks and style="" attributes."""
+    blocks = STYLE_BLOCK.findall(html)
+    attrs = [unescape(double or single) for double, single in STYLE_ATTR.findall(html)]
+    return '\n'.join(blocks + attrs)
+
+
+def page_colors(pages):
+    """Swatches from the inline styles of crawled HTML pages, sourced by path."""
+    from crawler import is_html
+    swatches = []
+    for page in pages:
+        if page.status != 200 or not is_html(page):
+            continue
+        css = inline_css(page.body.decode('utf-8', errors='replace'))
+        if css:
+            swatches += colors_from_css(css, urlsplit(page.url).path or '/')
+    return swatches
+
+
+def unique(swatches):
+    """First swatch per hex value, order preserved."""
+    seen = {}
+    for s in swatches:
+        seen.setdefault(s.hex, s)
+    return list(seen.values())
+
+
+def hex_to_rgb(hexes):
+    """(N, 3) uint8 array from a sequence of '#RRGGBB' strings."""
+    import numpy as np
+    raw = np.array([int(h[1:], 16) for h in hexes], dtype=np.uint32)
+    return np.stack([(raw >> 16) & 0xFF, (raw >> 8) & 0xFF, raw & 0xFF], axis=1).astype(np.uint8)
+
+
+def relative_luminance(rgb):
+    """WCAG relative luminance for an (N, 3) sRGB array."""
+    import numpy as np
+    c = rgb.astype(np.float64) / 255.0
+    linear = np.where(c <= 0.03928, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+    return linear @ np.array([0.2126, 0.7152, 0.0722])
+
+
+def contrast_matrix(fg_luminance, bg_luminance):
+    """(F, B) contrast ratios, (lighter + 0.05) / (darker + 0.05)."""
+    import numpy as np
+    fg = fg_luminance[:, None]
+    bg = bg_luminance[None, :]
+    return (np.maximum(fg, bg) + 0.05) / (np.minimum(fg, bg) + 0.05)
+
+
+def contrast_ratio(fg_hex, bg_hex):
+    lum = relative_luminance(hex_to_rgb([normalize_hex(fg_hex), normalize_hex(bg_hex)]))
+    return float(contrast_matrix(lum[:1], lum[1:])[0, 0])
+
+
+def grade(ratio):
+    """Short verdict in the wording used by glowheal_color_palette.csv."""
+    if ratio >= AAA_NORMAL:
+        return 'AAA Pass'
+    if ratio >= AA_NORMAL:
+        return 'AA Pass'
+    if ratio >= AA_LARGE:
+        return 'Large text only'
+    return 'Need darker for text'
+
+
+def luminance(hex_code):
+    """WCAG relative luminance of one '#RRGGBB' color, without numpy."""
+    value = int(normalize_hex(hex_code)[1:], 16)
+    total = 0.0
+    for shift, weight in ((16, 0.2126), (8, 0.7152), (0, 0.0722)):
+        c = ((value >> shift) & 0xFF) / 255.0
+        total += weight * (c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4)
+    return total
+
+
+def describe_on_white(hex_codes):
+    """'4.6:1 (AA Pass)' style labels against #FFFFFF; 'N/A' for background tones."""
+    ratios = [1.05 / (luminance(h) + 0.05) for h in hex_codes]
+    return ['N/A' if r < BACKGROUND_TONE else f'{r:.1f}:1 ({grade(r)})' for r in ratios]
+
+
+class ContrastReport:
+    """All-pairs contrast for a set of swatches, with WCAG pass masks."""
+
+    def __init__(self, swatches):
+        self.swatches = unique(swatches)
+        lum = relative_luminance(hex_to_rgb([s.hex for s in self.swatches]))
+        self.luminance = lum
+        self.ratios = contrast_matrix(lum, lum)
+        self.aa_normal = self.ratios >= AA_NORMAL
+        self.aa_large = self.ratios >= AA_LARGE
+        self.aaa_normal = self.ratios >= AAA_NORMAL
+        self.aaa_large = self.ratios >= AAA_LARGE
+
+    def __len__(self):
+        return len(self.swatches)
+
+    def pairs(self, min_ratio=None, max_ratio=None):
+        """(fg index, bg index) arrays for off-diagonal pairs within a ratio window."""
+        import numpy as np
+        mask = ~np.eye(len(self), dtype=bool)
+        if min_ratio is not None:
+            mask &= self.ratios >= min_ratio
+        if max_ratio is not None:
+            mask &= self.ratios < max_ratio
+        return np.nonzero(mask)
+
+    def failing(self, threshold=AA_NORMAL):
+        return self.pairs(max_ratio=threshold)
+
+    def to_csv(self, path):
+        import numpy as np
+        fg, bg = self.pairs()
+        order = np.argsort(-self.ratios[fg, bg], kind='stable')
+        fg, bg = fg[order], bg[order]
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Foreground', 'Foreground Hex', 'Background', 'Background Hex',
+                             'Contrast Ratio', 'AA Normal', 'AA Large', 'AAA Normal', 'AAA Large'])
+            flags = np.stack([self.aa_normal[fg, bg], self.aa_large[fg, bg],
+                              self.aaa_normal[fg, bg], self.aaa_large[fg, bg]], axis=1)
+            for i, j, ratio, row in zip(fg, bg, self.ratios[fg, bg], flags):
+                a, b = self.swatches[i], self.swatches[j]
+                writer.writerow([a.name, a.hex, b.name, b.hex, f'{ratio:.2f}']
+                                + ['Pass' if ok else 'Fail' for ok in row])
+
+
+if __name__ == '__main__':
+    import numpy as np
+
+    parser = argparse.ArgumentParser(description='WCAG contrast matrix for the palette and site colors.')
+    parser.add_argument('--crawl', action='store_true', help="also collect inline-style colors from the site's pages")
+    parser.add_argument('--base-url')
+    args = parser.parse_args()
+
+    swatches = palette_from_csv() + site_colors()
+    if args.crawl:
+        from crawler import BASE_URL, iter_pages
+        swatches += page_colors(iter_pages(args.base_url or BASE_URL))
+    report = ContrastReport(swatches)
+    report.to_csv('glowheal_contrast_matrix.csv')
+
+    pairs = len(report) * (len(report) - 1)
+    print("=" * 80)
+    print("GLOWHEAL.IN - WCAG CONTRAST MATRIX")
+    print("=" * 80)
+    print(f"Colors: {len(report)} unique ({len(swatches)} found) | Pairs: {pairs:,}")
+    for label, mask in (('AA normal text (4.5:1)', report.aa_normal),
+                        ('AA large text (3:1)', report.aa_large),
+                        ('AAA normal text (7:1)', report.aaa_normal),
+                        ('AAA large text (4.5:1)', report.aaa_large)):
+        passing = int(mask.sum() - np.trace(mask))
+        print(f"  {label:<24} {passing:>7,} pass  {pairs - passing:>7,} fail")
+
+    white = [i for i, s in enumerate(report.swatches) if s.hex == '#FFFFFF']
+    if white:
+        print("\nText colors on white (#FFFFFF):")
+        ratios = report.ratios[:, white[0]]
+        for i in np.argsort(-ratios):
+            if ratios[i] >= BACKGROUND_TONE:
+                s = report.swatches[i]
+                print(f"  {s.hex}  {ratios[i]:>5.2f}:1  {grade(ratios[i]):<20} {s.name} ({s.source})")
+
+    print("\n✓ Full matrix exported to: glowheal_contrast_matrix.csv")
@@ -0,0 +1,260 @@
+# Asyncio site crawler for the Glowheal.in audit scripts
+#
+# Seeds from /sitemap.xml (app/sitemap.ts), fetches every page over pooled
+# keep-alive connections and streams Page(url, status, headers, body)
+# records to whatever audit stage is consuming them.
+
+import asyncio
+import queue
+import threading
+import xml.etree.ElementTree as ET
+from typing import NamedTuple
+from urllib.parse import urldefrag, urljoin, urlsplit, urlunsplit
+
+import aiohttp
+
+from html_extract import extract
+
+BASE_URL = "https://glowheal.in"
+
+# Same browser headers and timeout the original single-URL fetch used
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+HEADERS = {'User-Agent': USER_AGENT}
+TIMEOUT = 10
+
+SITEMAP_NS = '{http://www.sitemaps.org/schemas/sitemap/0.9}'
+
+
+class Page(NamedTuple):
+    url: str
+    status: int      # 0 when the request failed (DNS, timeout, reset) or the page errored
+    headers: dict    # lower-cased header names
+    body: bytes
+
+
+def normalize_url(url):
+    """Canonical form used for dedupe: no fragment, lower-case host, '/' path."""
+    url, _ = urldefrag(url.strip())
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    if (scheme, netloc.rsplit(':', 1)[-1]) in (('http', '80'), ('https', '443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    path = parts.path or '/'
+    return urlunsplit((scheme, netloc, path, parts.query, ''))
+
+
+def rebase_url(url, base_url):
+    """Point an absolute URL at another origin (e.g. sitemap locs -> localhost)."""
+    parts = urlsplit(url)
+    base = urlsplit(base_url)
+    return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, parts.fragment))
+
+
+def parse_sitemap(xml_bytes):
+    """Return (page_urls, child_sitemap_urls) from a sitemap or sitemap index."""
+    root = ET.fromstring(xml_bytes)
+    locs = [el.text.strip() for el in root.iter(SITEMAP_NS + 'loc') if el.text]
+    if root.tag == SITEMAP_NS + 'sitemapindex':
+        return [], locs
+    return locs, []
+
+
+def extract_links(page):
+    """Absolute hrefs of every <a> on an HTML page."""
+    return [urljoin(page.url, link.href) for link in extract(page.body).links if link.href]
+
+
+def is_html(page):
+    return 'text/html' in page.headers.get('content-type', '')
+
+
+class Crawler:
+    """Bounded-concurrency crawler over one aiohttp connection pool.
+
+    concurrency caps the number of in-flight requests overall, per_host caps
+    the keep-alive connections opened to any single host. Pages are yielded
+    as soon as they arrive; a bounded output queue applies backpressure to
+    the fetch workers when the consumer falls behind.
+    """
+
+    def __init__(self, base_url=BASE_URL, concurrency=8, per_host=4,
+                 timeout=TIMEOUT, headers=None, max_pages=None,
+                 follow_links=True, rebase_sitemap=True, cache=None):
+        self.base_url = base_url.rstrip('/')
+        self.host = urlsplit(self.base_url).netloc.lower()
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.headers = dict(headers or HEADERS)
+        self.max_pages = max_pages
+        self.follow_links = follow_links
+        self.rebase_sitemap = rebase_sitemap
+        self.cache = cache   # optional http_cache.HttpCache
+        self.seen = set()
+        self.errors = {}     # url -> 'ExcType: message' for pages a worker failed on
+
+    def open_session(self):
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.per_host,
+            keepalive_timeout=30,
+            ttl_dns_cache=300,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            headers=self.headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    async def fetch(self, session, url, revalidate=True):
+        conditional = self.cache.conditional_headers(url) if revalidate and self.cache is not None else {}
+        try:
+            async with session.get(url, headers=conditional, allow_redirects=True) as resp:
+                if resp.status == 304 and conditional:
+                    page = self.cache.revalidated(url, resp.headers)
+                    if page is not None:
+                        return page
+                    refetch = True   # cached body vanished; revalidated() evicted the entry
+                else:
+                    refetch = False
+                    body = await resp.read()
+                    headers = {k.lower(): v for k, v in resp.headers.items()}
+                    page = Page(str(resp.url), resp.status, headers, body)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return Page(url, 0, {}, b'')
+        if refetch:
+            return await self.fetch(session, url, revalidate=False)
+        if self.cache is not None:
+            self.cache.store(url, page)
+        return page
+
+    async def sitemap_urls(self, session, sitemap_url=None):
+        """Every page listed in the sitemap (following sitemap indexes)."""
+        pending = [sitemap_url or self.base_url + '/sitemap.xml']
+        urls = []
+        while pending:
+            page = await self.fetch(session, pending.pop())
+            if page.status != 200:
+                continue
+            try:
+                locs, children = parse_sitemap(page.body)
+            except ET.ParseError:
+                continue
+            if self.rebase_sitemap:
+                locs = [rebase_url(u, self.base_url) for u in locs]
+                children = [rebase_url(u, self.base_url) for u in children]
+            urls.extend(locs)
+            pending.extend(children)
+        return urls
+
+    def _enqueue(self, todo, url):
+        url = normalize_url(url)
+        if url in self.seen:
+            return
+        if self.max_pages is not None and len(self.seen) >= self.max_pages:
+            return
+        self.seen.add(url)
+        todo.put_nowait(url)
+
+    async def _worker(self, session, todo, out):
+        while True:
+            url = await todo.get()
+            emitted = False
+            try:
+                page = await self.fetch(session, url)
+                final = normalize_url(page.url)
+                if final != url and final in self.seen:
+                    continue  # redirected onto a page we already have
+                self.seen.add(final)
+                await out.put(page)
+                emitted = True
+                if self.follow_links and page.status == 200 and is_html(page):
+                    for link in extract_links(page):
+                        parts = urlsplit(link)
+                        if parts.scheme in ('http', 'https') and parts.netloc.lower() == self.host:
+                            self._enqueue(todo, link)
+            except Exception as e:
+                # One bad page must not take the worker down: todo.join() would never return
+                self.errors[url] = f'{type(e).__name__}: {e}'
+                if not emitted:
+                    await out.put(Page(url, 0, {}, b''))
+            finally:
+                todo.task_done()
+
+    async def _close_when_drained(self, todo, out):
+        await todo.join()
+        await out.put(None)
+
+    async def crawl(self, seeds=None):
+        """Async generator of Page records, seeded from the sitemap by default."""
+        async with self.open_session() as session:
+            if seeds is None:
+                seeds = [self.base_url + '/'] + await self.sitemap_urls(session)
+            todo = asyncio.Queue()
+            out = asyncio.Queue(maxsize=self.concurrency * 2)
+            for url in seeds:
+                self._enqueue(todo, url)
+
+            tasks = [asyncio.create_task(self._worker(session, todo, out))
+                     for _ in range(self.concurrency)]
+            tasks.append(asyncio.create_task(self._close_when_drained(todo, out)))
+            try:
+                while True:
+                    page = await out.get()
+                    if page is None:
+                        break
+                    yield page
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def iter_pages(base_url=BASE_URL, seeds=None, **kwargs):
+    """Blocking iterator over crawl results for the synchronous scripts.
+
+    The event loop runs on a background thread; pages are handed over through
+    a small queue so memory stays flat however large the site is.
+    """
+    handoff = queue.Queue(maxsize=16)
+    stop = threading.Event()
+    done = object()
+
+    async def pump():
+        async for page in Crawler(base_url, **kwargs).crawl(seeds):
+            while not stop.is_set():
+                try:
+                    handoff.put_nowait(page)
+                    break
+                except queue.Full:
+                    await asyncio.sleep(0.01)
+            if stop.is_set():
+                break
+
+    def run():
+        try:
+            asyncio.run(pump())
+        finally:
+            handoff.put(done)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = handoff.get()
+            if item is done:
+                break
+            yield item
+    finally:
+        stop.set()
+        while thread.is_alive():
+            try:
+                handoff.get_nowait()
+            except queue.Empty:
+                thread.join(0.1)
+
+
+def crawl_site(base_url=BASE_URL, **kwargs):
+    """Crawl everything and return the pages as a list."""
+    return list(iter_pages(base_url, **kwargs))
@@ -0,0 +1,569 @@
+# Critical-CSS extraction and unused-rule report per route
+#
+# The "Defer non-critical CSS" and "Minify CSS" items in script_1.py assume we
+# know which rules each page needs. The compiled stylesheet (Tailwind output of
+# apps/web/src/styles/globals.css) is parsed once and every selector is
+# indexed by the id / class / tag of its rightmost compound. Each page is then
+# reduced to the ids, classes, tags and attributes it actually uses, and only
+# the selectors indexed under those keys are checked - no rule-by-rule scan of
+# the whole stylesheet per page. Pages are matched in a process pool.
+#
+# Matching is deliberately conservative: pseudo-classes (:hover, :focus,
+# :not(...)) are treated as "may match", and ancestor compounds only need to
+# exist somewhere on the page. The pages are static HTML, though: classes and
+# attributes that client JS or hydration adds later (Radix data-state, <details
+# open>, group-hover:/peer-*/data-[...]: variants) never show up in them. Rules
+# whose selector matches SAFELIST (or --safelist) always count as used, so the
+# unused report is "unused unless something outside the HTML needs it" - check
+# it before deleting rules.
+
+import argparse
+import csv
+import glob
+import os
+import re
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from html import unescape
+from urllib.parse import urljoin, urlsplit
+
+from crawler import BASE_URL, iter_pages, is_html, normalize_url
+from html_extract import extract_page
+
+BUILD_CSS = os.path.join('..', '..', 'apps', 'web', '.next', 'static', 'css', '**', '*.css')
+OUTPUT_DIR = 'critical-css'
+FOLD_ELEMENTS = 150          # body elements treated as "above the fold"
+# At-rules whose blocks contain ordinary style rules
+GROUPING_AT_RULES = ('media', 'supports', 'layer', 'container', 'document')
+COMMENT = re.compile(r'/\*.*?\*/', re.S)
+FONT_FAMILY = re.compile(r'font-family\s*:\s*([^;}]+)', re.I)
+COMBINATORS = ' \t\n\r\f>+~'
+START_TAG = re.compile(r'<([a-zA-Z][\w:-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>')
+ATTRIBUTE = re.compile(r'''([^\s"'>/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?''')
+COMMENT_HTML = re.compile(r'<!--.*?-->', re.S)
+SKIPPED_CONTENT = re.compile(r'(<(script|style|template)\b[^>]*>).*?</\2\s*>', re.S | re.I)
+# Selector patterns for state that only exists after JS runs; matched with re.search
+SAFELIST = (
+    r'\[data-(state|headlessui-state|open|active|selected|disabled|orientation|side)\b',
+    r'\[aria-(expanded|selected|checked|pressed|current|hidden|invalid)\b',
+    r'\[open\]',
+    r'\.(group|peer|open|closed|dark)\b',            # marker classes JS toggles
+    r'\.(group|peer|data|aria)-',                    # Tailwind group-hover:, data-[state=open]:, ...
+)
+
+
+@dataclass
+class Rule:
+    selector: str            # '' for global at-rules (@font-face, @keyframes, ...)
+    body: str
+    wrappers: tuple = ()     # enclosing '@media ...' / '@supports ...' preludes
+    at_rule: str = ''        # 'font-face', 'keyframes', ... for global rules
+    name: str = ''           # font family / animation / property name they define
+
+    @property
+    def text(self):
+        return f'{self.selector}{{{self.body}}}'
+
+    @property
+    def size(self):
+        return len(self.text.encode('utf-8'))
+
+
+@dataclass
+class Compound:
+    tag: str = ''
+    id: str = ''
+    classes: tuple = ()
+    attrs: tuple = ()
+
+
+# -- stylesheet parsing ------------------------------------------------------
+
+def _skip_string(css, i):
+    quote = css[i]
+    i += 1
+    while i < len(css) and css[i] != quote:
+        i += 2 if css[i] == '\\' else 1
+    return i + 1
+
+
+def _find(css, i, stops):
+    """Index of the first char in stops at or after i, outside strings/parens."""
+    depth = 0
+    while i < len(css):
+        c = css[i]
+        if c in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if c == '\\':
+            i += 2
+            continue
+        if depth == 0 and c in stops:
+            return i
+        if c in '([':
+            depth += 1
+        elif c in ')]':
+            depth -= 1
+        i += 1
+    return len(css)
+
+
+def _block_end(css, i):
+    """Index of the '}' closing the block whose '{' is at i."""
+    depth = 0
+    while i < len(css):
+        c = css[i]
+        if c in '"\'':
+            i = _skip_string(css, i)
+            continue
+        if c == '\\':
+            i += 2
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    return len(css)
+
+
+def _global_name(at_rule, prelude, body):
+    if at_rule == 'font-face':
+        match = FONT_FAMILY.search(body)
+        return match.group(1).strip().strip('"\'') if match else ''
+    parts = prelude.split(None, 1)
+    return parts[1].strip().strip('"\'') if len(parts) > 1 else ''
+
+
+def parse_stylesheet(css, wrappers=()):
+    """Flat list of Rule objects in source order."""
+    if not wrappers:
+        css = COMMENT.sub('', css)
+    rules = []
+    i = 0
+    while i < len(css):
+        while i < len(css) and css[i] in ' \t\n\r\f;':
+            i += 1
+        if i >= len(css):
+            break
+        stop = _find(css, i, '{;}')
+        prelude = css[i:stop].strip()
+        if stop >= len(css) or css[stop] != '{':
+            i = stop + 1          # @charset/@import statements, stray '}'
+            continue
+        end = _block_end(css, stop)
+        body = css[stop + 1:end]
+        if prelude.startswith('@'):
+            at_rule = prelude[1:].split(None, 1)[0].lower()
+            if at_rule in GROUPING_AT_RULES:
+                rules += parse_stylesheet(body, wrappers + (prelude,))
+            else:
+                rules.append(Rule(prelude, body.strip(), wrappers, at_rule,
+                                  _global_name(at_rule, prelude, body)))
+        elif prelude:
+            rules.append(Rule(prelude, body.strip(), wrappers))
+        i = end + 1
+    return rules
+
+
+def split_selectors(selector_list):
+    parts = []
+    i = 0
+    while i <= len(selector_list):
+        stop = _find(selector_list, i, ',')
+        part = selector_list[i:stop].strip()
+        if part:
+            parts.append(part)
+        i = stop + 1
+    return parts
+
+
+def _read_ident(sel, i):
+    """(unescaped identifier, next index); handles Tailwind's '\\:' and '\\32 ' escapes."""
+    out = []
+    while i < len(sel):
+        c = sel[i]
+        if c == '\\' and i + 1 < len(sel):
+            hex_digits = re.match(r'[0-9a-fA-F]{1,6}', sel[i + 1:])
+            if hex_digits:
+                out.append(chr(int(hex_digits.group(0), 16)))
+                i += 1 + len(hex_digits.group(0))
+                if i < len(sel) and sel[i] == ' ':
+                    i += 1
+            else:
+                out.append(sel[i + 1])
+                i += 2
+        elif c.isalnum() or c in '-_' or ord(c) > 127:
+            out.append(c)
+            i += 1
+        else:
+            break
+    return ''.join(out), i
+
+
+def parse_selector(sel):
+    """Compounds of a complex selector, subject (rightmost) last."""
+    compounds = []
+    tag, id_, classes, attrs = '', '', [], []
+    i = 0
+
+    def flush():
+        if tag or id_ or classes or attrs:
+            compounds.append(Compound(tag, id_, tuple(classes), tuple(attrs)))
+        else:
+            compounds.append(Compound())
+
+    while i < len(sel):
+        c = sel[i]
+        if c in COMBINATORS:
+            j = i
+            while j < len(sel) and sel[j] in COMBINATORS:
+                j += 1
+            if j < len(sel):
+                flush()
+                tag, id_, classes, attrs = '', '', [], []
+            i = j
+        elif c == '.':
+            name, i = _read_ident(sel, i + 1)
+            classes.append(name)
+        elif c == '#':
+            id_, i = _read_ident(sel, i + 1)
+        elif c == '[':
+            end = _find(sel, i + 1, ']')
+            name = re.split(r'[~|^$*]?=', sel[i + 1:end], maxsplit=1)[0].strip().lower()
+            if name:
+                attrs.append(name)
+            i = end + 1
+        elif c == ':':
+            i += 2 if sel[i + 1:i + 2] == ':' else 1
+            _, i = _read_ident(sel, i)
+            if i < len(sel) and sel[i] == '(':
+                i = _find(sel, i + 1, ')') + 1
+        elif c in '*&|':
+            i += 1
+        else:
+            name, j = _read_ident(sel, i)
+            tag = name.lower()
+            i = max(j, i + 1)
+    flush()
+    return compounds
+
+
+def index_key(compound):
+    if compound.id:
+        return '#' + compound.id
+    if compound.classes:
+        return '.' + compound.classes[0]
+    if compound.tag:
+        return compound.tag
+    if compound.attrs:
+        return '[' + compound.attrs[0]
+    return '*'
+
+
+class StyleIndex:
+    """Selectors of one stylesheet bucketed by their subject's most specific key."""
+
+    def __init__(self, url, rules, safelist=SAFELIST):
+        self.url = url
+        self.rules = rules
+        allowed = re.compile('|'.join(f'(?:{p})' for p in safelist)) if safelist else None
+        self.safelisted = {n for n, rule in enumerate(rules)
+                           if allowed and not rule.at_rule and allowed.search(rule.selector)}
+        self.buckets = defaultdict(list)     # key -> [(rule index, compounds)]
+        self.style_rules = [n for n, rule in enumerate(rules) if not rule.at_rule]
+        self.style_bytes = sum(rules[n].size for n in self.style_rules)
+        self.named_globals = [(n, rule.name.lower()) for n, rule in enumerate(rules)
+                              if rule.at_rule and rule.name]
+        for n, rule in enumerate(rules):
+            if rule.at_rule:
+                continue
+            for sel in split_selectors(rule.selector):
+                compounds = parse_selector(sel)
+                # subject first: it is the compound most likely to reject
+                self.buckets[index_key(compounds[-1])].append((n, compounds[::-1]))
+
+
+    def matching(self, signature, among=None):
+        """Indexes of style rules with at least one selector matching the page.
+
+        among limits the check to rules already known to match a superset
+        (the fold signature is a subset of the page's).
+        """
+        used = set()
+        for key in signature.keys():
+            for n, compounds in self.buckets.get(key, ()):
+                if n in used or (among is not None and n not in among):
+                    continue
+                if all(signature.matches(c) for c in compounds):
+                    used.add(n)
+        return used
+
+
+# -- page signatures ---------------------------------------------------------
+
+@dataclass
+class Signature:
+    tags: set = field(default_factory=set)
+    ids: set = field(default_factory=set)
+    classes: set = field(default_factory=set)
+    attrs: set = field(default_factory=set)
+    class_sets: dict = field(default_factory=lambda: defaultdict(set))  # class -> {frozenset}
+
+    def add(self, tag, attrs):
+        self.tags.add(tag)
+        self.attrs.update(name for name, _ in attrs)
+        for name, value in attrs:
+            if name == 'id' and value:
+                self.ids.add(value)
+            elif name == 'class' and value:
+                names = frozenset(value.split())
+                self.classes |= names
+                if len(names) > 1:
+                    for c in names:
+                        self.class_sets[c].add(names)
+
+    def keys(self):
+        yield '*'
+        yield from self.tags
+        yield from ('#' + i for i in self.ids)
+        yield from ('.' + c for c in self.classes)
+        yield from ('[' + a for a in self.attrs)
+
+    def matches(self, compound):
+        if compound.tag and compound.tag not in self.tags:
+            return False
+        if compound.id and compound.id not in self.ids:
+            return False
+        if any(a not in self.attrs for a in compound.attrs):
+            return False
+        if len(compound.classes) == 1:
+            return compound.classes[0] in self.classes
+        if compound.classes:
+            wanted = set(compound.classes)
+            return any(wanted <= names for names in self.class_sets.get(compound.classes[0], ()))
+        return True
+
+
+def signatures(html, fold_elements=FOLD_ELEMENTS):
+    """Page signature plus a second one for the first fold_elements body elements.
+
+    A regex tag scan rather than html.parser: only start tags and their
+    attributes matter here, and this runs once per page on every build.
+    """
+    page, fold = Signature(), Signature()
+    html = SKIPPED_CONTENT.sub('', COMMENT_HTML.sub('', html))
+    body_elements = -1                 # -1 until <body> is seen
+    for match in START_TAG.finditer(html):
+        tag = match.group(1).lower()
+        attrs = [(name.lower(), unescape(value or a or b or ''))
+                 for name, value, a, b in ATTRIBUTE.findall(match.group(2))]
+        page.add(tag, attrs)
+        if tag == 'body':
+            body_elements = 0
+        if body_elements < fold_elements:
+            fold.add(tag, attrs)
+        if body_elements >= 0:
+            body_elements += 1
+    return page, fold
+
+
+# -- per-route analysis (process pool) ---------------------------------------
+
+_INDEXES = {}
+
+
+def _init_worker(indexes):
+    _INDEXES.update(indexes)
+
+
+def _match_page(task):
+    url, body, sheet_urls = task
+    page, fold = signatures(body.decode('utf-8', errors='replace'))
+    matches = {}
+    for sheet in sheet_urls:
+        used = _INDEXES[sheet].matching(page)
+        matches[sheet] = used, _INDEXES[sheet].matching(fold, among=used)
+    return url, matches
+
+
+@dataclass
+class RouteCss:
+    url: str
+    stylesheet: str
+    rules: int
+    bytes: int
+    used: set
+    critical: set
+
+    @property
+    def unused(self):
+        return self.rules - len(self.used)
+
+
+def render(rules, indexes):
+    """CSS text for the given rules, regrouped under their @media/@supports wrappers."""
+    out = []
+    open_wrappers = ()
+    for n in sorted(indexes):
+        rule = rules[n]
+        keep = 0
+        while keep < min(len(open_wrappers), len(rule.wrappers)) \
+                and open_wrappers[keep] == rule.wrappers[keep]:
+            keep += 1
+        out.append('}' * (len(open_wrappers) - keep))
+        out.extend(w + '{' for w in rule.wrappers[keep:])
+        out.append(rule.text)
+        open_wrappers = rule.wrappers
+    out.append('}' * len(open_wrappers))
+    return ''.join(out)
+
+
+def critical_rules(index, critical):
+    """Critical style rules plus the @font-face/@keyframes/@property they reference."""
+    referenced = ' '.join(index.rules[n].body for n in critical).lower()
+    return set(critical) | {n for n, name in index.named_globals if name in referenced}
+
+
+class CriticalCss:
+    def __init__(self, stylesheets, workers=None, fold_elements=FOLD_ELEMENTS, safelist=SAFELIST):
+        """stylesheets: {url or path: css text}; safelist: selector regexes that are always used."""
+        self.indexes = {url: StyleIndex(url, parse_stylesheet(css), safelist)
+                        for url, css in stylesheets.items()}
+        self.workers = workers
+        self.fold_elements = fold_elements
+
+    def analyze(self, pages, sheets_for=None):
+        """RouteCss per (page, stylesheet); sheets_for(page) picks a page's stylesheets."""
+        tasks = []
+        for page in pages:
+            sheets = sheets_for(page) if sheets_for else list(self.indexes)
+            tasks.append((page.url, page.body, [s for s in sheets if s in self.indexes]))
+        results = []
+        pool = None
+        if (self.workers or os.cpu_count()) == 1:
+            _init_worker(self.indexes)
+            matched = map(_match_page, tasks)
+        else:
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                       initargs=(self.indexes,))
+            matched = pool.map(_match_page, tasks, chunksize=16)
+        try:
+            for url, matches in matched:
+                for sheet, (used, fold) in matches.items():
+                    index = self.indexes[sheet]
+                    results.append(RouteCss(url, sheet, len(index.style_rules), index.style_bytes,
+                                            used | index.safelisted, critical_rules(index, fold)))
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        return results
+
+    def critical_css(self, route):
+        return render(self.indexes[route.stylesheet].rules, route.critical)
+
+    def unused_bytes(self, route):
+        index = self.indexes[route.stylesheet]
+        return index.style_bytes - sum(index.rules[n].size for n in route.used)
+
+    def unused_everywhere(self, routes):
+        """(stylesheet, Rule) for style rules no crawled route matches."""
+        used = defaultdict(set)
+        for route in routes:
+            used[route.stylesheet] |= route.used
+        return [(url, index.rules[n]) for url, index in self.indexes.items()
+                for n in index.style_rules if n not in used[url]]
+
+
+def route_slug(url):
+    path = urlsplit(url).path.strip('/')
+    return re.sub(r'[^\w-]+', '_', path) or 'index'
+
+
+def fetch_stylesheets(pages, base_url=BASE_URL):
+    """{stylesheet url: css} for every stylesheet the crawled pages link."""
+    urls = {normalize_url(urljoin(p.url, href))
+            for p in pages for kind, href in extract_page(p).resources if kind == 'stylesheet'}
+    return {normalize_url(p.url): p.body.decode('utf-8', errors='replace')
+            for p in iter_pages(base_url, seeds=sorted(urls), follow_links=False)
+            if p.status == 200}
+
+
+def linked_stylesheets(page):
+    return [normalize_url(urljoin(page.url, href))
+            for kind, href in extract_page(page).resources if kind == 'stylesheet']
+
+
+def to_csv(analyzer, routes, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Route', 'Stylesheet', 'Rules', 'Stylesheet Bytes', 'Used Rules',
+                         'Critical Bytes', 'Unused Rules', 'Unused Bytes', 'Savings %'])
+        for r in routes:
+            unused = analyzer.unused_bytes(r)
+            critical = len(analyzer.critical_css(r).encode('utf-8'))
+            writer.writerow([r.url, r.stylesheet, r.rules, r.bytes, len(r.used), critical,
+                             r.unused, unused, f'{100 * unused / r.bytes:.1f}' if r.bytes else '0.0'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Per-route critical CSS and unused-rule report.')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--css', nargs='*',
+                        help=f'compiled stylesheets to check every page against '
+                             f'(default: {BUILD_CSS} if built, else what pages link)')
+    parser.add_argument('--out', default=OUTPUT_DIR)
+    parser.add_argument('--safelist', action='append', default=[], metavar='REGEX',
+                        help='extra selector pattern that always counts as used (repeatable)')
+    parser.add_argument('--no-default-safelist', action='store_true',
+                        help='only use --safelist patterns, not the built-in JS-state ones')
+    args = parser.parse_args()
+
+    pages = [p for p in iter_pages(args.base_url) if p.status == 200 and is_html(p)]
+    css_files = args.css if args.css is not None else glob.glob(BUILD_CSS, recursive=True)
+    if css_files:
+        stylesheets = {}
+        for path in css_files:
+            with open(path, encoding='utf-8') as f:
+                stylesheets[path] = f.read()
+        sheets_for = None
+    else:
+        stylesheets = fetch_stylesheets(pages, args.base_url)
+        sheets_for = linked_stylesheets
+
+    safelist = ([] if args.no_default_safelist else list(SAFELIST)) + args.safelist
+    analyzer = CriticalCss(stylesheets, safelist=safelist)
+    routes = analyzer.analyze(pages, sheets_for)
+    os.makedirs(args.out, exist_ok=True)
+    by_route = defaultdict(list)
+    for r in routes:
+        by_route[r.url].append(analyzer.critical_css(r))
+    for url, parts in by_route.items():
+        with open(os.path.join(args.out, route_slug(url) + '.css'), 'w', encoding='utf-8') as f:
+            f.write(''.join(parts))
+    to_csv(analyzer, routes, 'glowheal_unused_css.csv')
+    dead = analyzer.unused_everywhere(routes)
+    with open('glowheal_unused_css_rules.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Stylesheet', 'Media', 'Selector', 'Bytes'])
+        for sheet, rule in dead:
+            writer.writerow([sheet, ' '.join(rule.wrappers), rule.selector, rule.size])
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - CRITICAL CSS & UNUSED RULES")
+    print("=" * 80)
+    print(f"Pages: {len(by_route)} | Stylesheets: {len(stylesheets)}")
+    for r in sorted(routes, key=analyzer.unused_bytes, reverse=True)[:15]:
+        critical = len(analyzer.critical_css(r).encode('utf-8'))
+        print(f"  {urlsplit(r.url).path or '/':<40} {critical:>8,} B critical  "
+              f"{analyzer.unused_bytes(r):>8,} B unused of {r.bytes:,} B")
+    print(f"\nRules unused on every route: {len(dead):,} "
+          f"({sum(rule.size for _, rule in dead):,} B)")
+    print(f"Rules kept by the safelist (JS-toggled state): "
+          f"{sum(len(index.safelisted) for index in analyzer.indexes.values()):,}")
+    print(f"\n✓ Critical CSS written to: {args.out}/")
+    print("✓ Files created: glowheal_unused_css.csv")
+    print("✓ Files created: glowheal_unused_css_rules.csv")
@@ -0,0 +1,279 @@
+# Sessionized conversion funnels from exported analytics events
+#
+# docs/ANALYTICS_EVENTS.md plans more dataLayer events than apps/web sends;
+# the funnel uses only the ones the app pushes today (hero_cta_click,
+# whatsapp_click, pricing_select_initiated, free_consult_form_submit,
+# quote_create). script_5.py asks for Form Completion Rate and Conversion
+# Rate. Exports are JSONL (optionally .gz), one event per line, and far
+# larger than memory, so:
+#
+#   1. events are read in fixed-size chunks, each sorted by (visitor, time)
+#      and spilled to a temporary run file;
+#   2. the runs are k-way merged with heapq.merge, which yields every
+#      visitor's events in time order while holding one line per run; with
+#      more than MAX_FAN_IN runs, groups of them are first merged into
+#      intermediate runs so no more than MAX_FAN_IN files are ever open;
+#   3. a visitor's events are cut into sessions after INACTIVITY of silence,
+#      and each session is walked through the ordered funnel steps. No
+#      event marks opening the lead form, so a step's event also counts as
+#      reaching the steps before it: a LeadFormCard submit is a form start.
+#
+# Only the per-(dimension, value) step counters stay in memory.
+#
+#   python funnel.py exports/events-*.jsonl.gz --inactivity 30
+
+import argparse
+import csv
+import glob
+import gzip
+import heapq
+import json
+import os
+import tempfile
+from collections import defaultdict
+from dataclasses import dataclass, field
+from itertools import groupby
+
+from leads_data import parse_timestamp
+
+CHUNK_EVENTS = 200_000
+MAX_FAN_IN = 256              # run files open at once, well under the usual 1024 fd limit
+INACTIVITY_MINUTES = 30
+VISITOR_KEYS = ('client_id', 'user_pseudo_id', 'user_id', 'session_id')
+TIME_KEYS = ('timestamp', 'event_timestamp')
+DIMENSIONS = ('source', 'city', 'device')
+
+# Ordered steps; an event matches a step if its name is in the set. Only
+# events apps/web actually pushes to the dataLayer belong here.
+FUNNEL = (
+    ('Landing', None),     # first event of the session
+    ('CTA Click', {'hero_cta_click', 'whatsapp_click'}),
+    ('Form Start', {'pricing_select_initiated'}),
+    ('Lead Submit', {'free_consult_form_submit', 'quote_create'}),
+)
+
+
+def event_time_ms(event):
+    """Epoch milliseconds from Date.now() ms, GA4 microseconds, seconds or ISO strings."""
+    for key in TIME_KEYS:
+        value = event.get(key)
+        if value is None or value == '':
+            continue
+        if isinstance(value, (int, float)) or str(value).isdigit():
+            value = float(value)
+            if value > 1e14:        # GA4 event_timestamp is in microseconds
+                return int(value / 1000)
+            return int(value if value > 1e11 else value * 1000)
+        parsed = parse_timestamp(value)
+        if parsed:
+            return int(parsed.timestamp() * 1000)
+    return None
+
+
+def visitor_of(event):
+    for key in VISITOR_KEYS:
+        if event.get(key):
+            return str(event[key])
+    return None
+
+
+def device_of(event):
+    device = event.get('device') or event.get('device_category')
+    if isinstance(device, dict):
+        device = device.get('category')
+    if device:
+        return str(device).lower()
+    agent = str(event.get('user_agent') or '')
+    if not agent:
+        return None
+    lowered = agent.lower()
+    if 'ipad' in lowered or 'tablet' in lowered:
+        return 'tablet'
+    return 'mobile' if 'mobi' in lowered or 'android' in lowered else 'desktop'
+
+
+def _open(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, encoding='utf-8', errors='replace')
+
+
+def iter_events(paths):
+    """(visitor, ms, event) for every parseable, attributable event."""
+    for path in paths:
+        with _open(path) as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(event, dict):
+                    continue
+                visitor, ms = visitor_of(event), event_time_ms(event)
+                if visitor is not None and ms is not None:
+                    yield visitor, ms, event
+
+
+def _spill(chunk, tmpdir, index):
+    chunk.sort(key=lambda row: (row[0], row[1]))
+    path = os.path.join(tmpdir, f'run-{index:05d}.jsonl')
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in chunk:
+            f.write(json.dumps(row, separators=(',', ':')))
+            f.write('\n')
+    return path
+
+
+def _read_run(path):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _merge(runs):
+    return heapq.merge(*(_read_run(p) for p in runs), key=lambda row: (row[0], row[1]))
+
+
+def merge_runs(runs, tmpdir, fan_in=MAX_FAN_IN):
+    """Merge passes until at most fan_in runs are left; spent runs are deleted."""
+    generation = 0
+    while len(runs) > fan_in:
+        generation += 1
+        merged = []
+        for start in range(0, len(runs), fan_in):
+            group = runs[start:start + fan_in]
+            path = os.path.join(tmpdir, f'merge-{generation}-{len(merged):05d}.jsonl')
+            with open(path, 'w', encoding='utf-8') as f:
+                for row in _merge(group):
+                    f.write(json.dumps(row, separators=(',', ':')))
+                    f.write('\n')
+            for spent in group:
+                os.remove(spent)
+            merged.append(path)
+        runs = merged
+    return runs
+
+
+def sorted_events(paths, tmpdir, chunk_events=CHUNK_EVENTS, fan_in=MAX_FAN_IN):
+    """Events ordered by (visitor, time) via sorted runs on disk and a k-way merge."""
+    runs, chunk = [], []
+    for row in iter_events(paths):
+        chunk.append(row)
+        if len(chunk) >= chunk_events:
+            runs.append(_spill(chunk, tmpdir, len(runs)))
+            chunk = []
+    if not runs:
+        # Everything fit in one chunk: no need to touch disk
+        chunk.sort(key=lambda row: (row[0], row[1]))
+        yield from chunk
+        return
+    if chunk:
+        runs.append(_spill(chunk, tmpdir, len(runs)))
+    yield from _merge(merge_runs(runs, tmpdir, fan_in))
+
+
+def sessions(rows, inactivity_ms):
+    """[(ms, event), ...] per session from (visitor, time)-ordered rows."""
+    for _, visits in groupby(rows, key=lambda row: row[0]):
+        session, last = [], None
+        for _, ms, event in visits:
+            if last is not None and ms - last > inactivity_ms:
+                yield session
+                session = []
+            session.append((ms, event))
+            last = ms
+        if session:
+            yield session
+
+
+@dataclass
+class FunnelCounts:
+    steps: list = field(default_factory=lambda: [0] * len(FUNNEL))
+
+    def add(self, reached):
+        for i in range(reached):
+            self.steps[i] += 1
+
+
+def steps_reached(session, funnel=FUNNEL):
+    """How many funnel steps the session completed; a step's event implies the ones before it."""
+    reached = 1 if session else 0
+    for _, event in session:
+        if reached == len(funnel):
+            break
+        name = event.get('event')
+        for step in range(len(funnel) - 1, reached - 1, -1):
+            if name in funnel[step][1]:
+                reached = step + 1
+                break
+    return reached
+
+
+def attributes(session):
+    """First non-empty source, city and device seen in the session."""
+    found = {}
+    for _, event in session:
+        for name in DIMENSIONS:
+            if name in found:
+                continue
+            value = device_of(event) if name == 'device' else (
+                event.get(name) or (event.get('utm_source') if name == 'source' else None))
+            if value:
+                found[name] = str(value).strip().lower()
+        if len(found) == len(DIMENSIONS):
+            break
+    return {name: found.get(name, '(not set)') for name in DIMENSIONS}
+
+
+def compute_funnel(paths, inactivity_minutes=INACTIVITY_MINUTES, chunk_events=CHUNK_EVENTS,
+                   funnel=FUNNEL):
+    """{(dimension, value): FunnelCounts}, with ('all', 'all') for the total."""
+    counts = defaultdict(FunnelCounts)
+    with tempfile.TemporaryDirectory(prefix='glowheal-funnel-') as tmpdir:
+        rows = sorted_events(paths, tmpdir, chunk_events)
+        for session in sessions(rows, inactivity_minutes * 60_000):
+            reached = steps_reached(session, funnel)
+            counts[('all', 'all')].add(reached)
+            for name, value in attributes(session).items():
+                counts[(name, value)].add(reached)
+    return counts
+
+
+def to_csv(counts, path, funnel=FUNNEL):
+    names = [name for name, _ in funnel]
+    order = {name: i for i, name in enumerate(('all',) + DIMENSIONS)}
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Dimension', 'Value', *names, 'Form Completion Rate', 'Conversion Rate'])
+        for (dimension, value), c in sorted(counts.items(),
+                                            key=lambda kv: (order[kv[0][0]], -kv[1].steps[0], kv[0][1])):
+            form_rate = c.steps[-1] / c.steps[-2] if c.steps[-2] else 0.0
+            conversion = c.steps[-1] / c.steps[0] if c.steps[0] else 0.0
+            writer.writerow([dimension, value, *c.steps, f'{form_rate:.2%}', f'{conversion:.2%}'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sessionize analytics event exports and compute funnels.')
+    parser.add_argument('exports', nargs='+', help='JSONL event exports (.jsonl or .jsonl.gz, globs ok)')
+    parser.add_argument('--inactivity', type=float, default=INACTIVITY_MINUTES,
+                        help='minutes of silence that end a session')
+    parser.add_argument('--chunk-events', type=int, default=CHUNK_EVENTS,
+                        help='events sorted in memory per spill run')
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.exports for p in glob.glob(pattern)})
+    counts = compute_funnel(paths, args.inactivity, args.chunk_events)
+    to_csv(counts, 'glowheal_funnel.csv')
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - CONVERSION FUNNEL")
+    print("=" * 80)
+    total = counts.get(('all', 'all'), FunnelCounts())
+    previous = None
+    for (name, _), count in zip(FUNNEL, total.steps):
+        share = f"  ({count / previous:.1%} of previous step)" if previous else ''
+        print(f"  {name:<12} {count:>10,}{share}")
+        previous = count
+    form_rate = total.steps[-1] / total.steps[-2] if total.steps[-2] else 0.0
+    print(f"\nForm Completion Rate: {form_rate:.1%} (target: 50%+)")
+    print(f"\n✓ Funnel by {', '.join(DIMENSIONS)} exported to: glowheal_funnel.csv")
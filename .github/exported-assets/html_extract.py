@@ -0,0 +1,300 @@
+# Streaming, single-pass HTML extractor for the site audits
+#
+# Feeds the body to html.parser in chunks and keeps only what the audits
+# look at (title, meta, headings, images, links, forms, tel: anchors,
+# JSON-LD and subresource URLs). Script/style bodies are dropped as they
+# stream past and every captured string is capped, so memory stays flat
+# however big the page is.
+
+import codecs
+import json
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+CHUNK_SIZE = 64 * 1024
+MAX_TEXT = 512               # longest title/heading/link text we keep
+MAX_JSON_LD = 1024 * 1024    # larger JSON-LD blocks are reported as truncated
+
+HEADINGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+FORM_FIELDS = ('input', 'select', 'textarea')
+SKIPPED_INPUTS = ('hidden', 'submit', 'button', 'image', 'reset')
+CDATA_TAIL = 64              # bytes of a skipped script kept to spot '</script>'
+# <link rel=preload as=...> values mapped to the resource kinds we report
+PRELOAD_KINDS = {'script': 'script', 'style': 'stylesheet', 'font': 'font', 'image': 'image'}
+
+
+@dataclass
+class Image:
+    src: str
+    alt: str = None          # None = attribute missing, '' = decorative
+    width: str = None
+    height: str = None
+    srcset: str = None
+    sizes: str = None
+    loading: str = None
+
+
+@dataclass
+class Link:
+    href: str
+    text: str = ''
+    rel: str = None
+
+
+@dataclass
+class FormField:
+    tag: str
+    type: str = None
+    name: str = None
+    id: str = None
+    required: bool = False
+    placeholder: str = None
+    aria_label: str = None
+    labelled: bool = False
+
+
+@dataclass
+class Form:
+    action: str = None
+    method: str = 'get'
+    fields: list = field(default_factory=list)
+
+
+@dataclass
+class PageSummary:
+    url: str = ''
+    title: str = ''
+    meta: dict = field(default_factory=dict)      # name/property -> content
+    canonical: str = None
+    headings: list = field(default_factory=list)  # (level, text)
+    images: list = field(default_factory=list)
+    links: list = field(default_factory=list)
+    tel_links: list = field(default_factory=list)
+    forms: list = field(default_factory=list)
+    json_ld: list = field(default_factory=list)
+    json_ld_errors: int = 0
+    resources: list = field(default_factory=list)  # (kind, url) subresources
+
+    @property
+    def meta_description(self):
+        return self.meta.get('description')
+
+
+class StreamingExtractor(HTMLParser):
+    """Incremental extractor: feed() byte or str chunks, then close()."""
+
+    def __init__(self, url='', encoding='utf-8'):
+        super().__init__(convert_charrefs=True)
+        self.summary = PageSummary(url=url)
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._text = {}            # open text-capturing tag -> list of parts
+        self._text_len = {}
+        self._skip_cdata = False   # inside a script/style we don't keep
+        self._json_ld = None       # parts of the JSON-LD block being read
+        self._json_ld_len = 0
+        self._svg_depth = 0
+        self._form = None
+        self._label_depth = 0
+        self._label_for = set()
+        self._link = None
+        self._heading = None
+
+    # -- feeding -----------------------------------------------------------
+
+    def feed(self, data):
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        super().feed(data)
+        if self.cdata_elem and self._json_ld is not None and len(self.rawdata) > MAX_JSON_LD:
+            self._json_ld_len = MAX_JSON_LD + 1
+            self._skip_cdata = True
+        if self._skip_cdata and self.cdata_elem:
+            # Keep just enough tail to recognise a split closing tag
+            self.rawdata = self.rawdata[-CDATA_TAIL:]
+
+    def close(self):
+        super().feed(self._decoder.decode(b'', final=True))
+        super().close()
+        for form in self.summary.forms:
+            for f in form.fields:
+                f.labelled = f.labelled or bool(f.aria_label) or (f.id in self._label_for)
+        return self.summary
+
+    # -- text capture ------------------------------------------------------
+
+    def _open_text(self, tag):
+        self._text[tag] = []
+        self._text_len[tag] = 0
+
+    def _close_text(self, tag):
+        parts = self._text.pop(tag, None)
+        self._text_len.pop(tag, None)
+        if parts is None:
+            return None
+        return ' '.join(''.join(parts).split())
+
+    def handle_data(self, data):
+        if self._json_ld is not None:
+            if self._json_ld_len < MAX_JSON_LD:
+                self._json_ld.append(data)
+            self._json_ld_len += len(data)
+            return
+        if self._skip_cdata:
+            return
+        for tag, parts in self._text.items():
+            room = MAX_TEXT - self._text_len[tag]
+            if room > 0:
+                parts.append(data[:room])
+                self._text_len[tag] += min(len(data), room)
+
+    # -- tags --------------------------------------------------------------
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'svg':
+            self._svg_depth += 1
+        if self._svg_depth:
+            return
+
+        if tag == 'script':
+            if attrs.get('src'):
+                self.summary.resources.append(('script', attrs['src']))
+            if (attrs.get('type') or '').lower() == 'application/ld+json':
+                self._json_ld = []
+                self._json_ld_len = 0
+            else:
+                self._skip_cdata = True
+        elif tag == 'style':
+            self._skip_cdata = True
+        elif tag == 'title' and not self.summary.title:
+            self._open_text('title')
+        elif tag == 'meta':
+            key = attrs.get('name') or attrs.get('property')
+            if key and attrs.get('content') is not None:
+                self.summary.meta.setdefault(key.lower(), attrs['content'])
+        elif tag == 'link':
+            rel = (attrs.get('rel') or '').lower().split()
+            href = attrs.get('href')
+            if 'canonical' in rel:
+                self.summary.canonical = href
+            elif href and 'stylesheet' in rel:
+                self.summary.resources.append(('stylesheet', href))
+            elif href and 'modulepreload' in rel:
+                self.summary.resources.append(('script', href))
+            elif href and 'preload' in rel:
+                kind = PRELOAD_KINDS.get((attrs.get('as') or '').lower(), 'other')
+                self.summary.resources.append((kind, href))
+        elif tag in HEADINGS:
+            self._heading = tag
+            self._open_text(tag)
+        elif tag == 'img':
+            if attrs.get('src'):
+                self.summary.resources.append(('image', attrs['src']))
+            self.summary.images.append(Image(
+                src=attrs.get('src') or '',
+                alt=attrs.get('alt'),
+                width=attrs.get('width'),
+                height=attrs.get('height'),
+                srcset=attrs.get('srcset'),
+                sizes=attrs.get('sizes'),
+                loading=attrs.get('loading'),
+            ))
+        elif tag == 'a':
+            href = attrs.get('href')
+            if href is not None:
+                self._link = Link(href=href.strip(), rel=attrs.get('rel'))
+                self._open_text('a')
+        elif tag == 'form':
+            self._form = Form(action=attrs.get('action'),
+                              method=(attrs.get('method') or 'get').lower())
+            self.summary.forms.append(self._form)
+        elif tag == 'label':
+            self._label_depth += 1
+            if attrs.get('for'):
+                self._label_for.add(attrs['for'])
+        elif tag in FORM_FIELDS:
+            if tag == 'input' and (attrs.get('type') or '').lower() in SKIPPED_INPUTS:
+                return
+            if self._form is None:
+                # Fields outside a <form> (React-controlled inputs) still count
+                self._form = Form()
+                self.summary.forms.append(self._form)
+            self._form.fields.append(FormField(
+                tag=tag,
+                type=attrs.get('type') or ('text' if tag == 'input' else tag),
+                name=attrs.get('name'),
+                id=attrs.get('id'),
+                required='required' in attrs,
+                placeholder=attrs.get('placeholder'),
+                aria_label=attrs.get('aria-label') or attrs.get('aria-labelledby'),
+                labelled=self._label_depth > 0,
+            ))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag == 'svg':
+            self._svg_depth -= 1
+
+    def handle_endtag(self, tag):
+        if tag == 'svg' and self._svg_depth:
+            self._svg_depth -= 1
+            return
+        if self._svg_depth:
+            return
+
+        if tag in ('script', 'style'):
+            self._skip_cdata = False
+            if tag == 'script' and self._json_ld is not None:
+                self._finish_json_ld()
+        elif tag == 'title' and 'title' in self._text:
+            self.summary.title = self._close_text('title')
+        elif tag in HEADINGS and tag == self._heading:
+            self.summary.headings.append((int(tag[1]), self._close_text(tag)))
+            self._heading = None
+        elif tag == 'a' and self._link is not None:
+            self._link.text = self._close_text('a')
+            self.summary.links.append(self._link)
+            if self._link.href.lower().startswith('tel:'):
+                self.summary.tel_links.append((self._link.href, self._link.text))
+            self._link = None
+        elif tag == 'form':
+            self._form = None
+        elif tag == 'label' and self._label_depth:
+            self._label_depth -= 1
+
+    def _finish_json_ld(self):
+        raw, self._json_ld = ''.join(self._json_ld), None
+        if self._json_ld_len > MAX_JSON_LD:
+            self.summary.json_ld_errors += 1
+            return
+        try:
+            self.summary.json_ld.append(json.loads(raw))
+        except ValueError:
+            self.summary.json_ld_errors += 1
+
+
+def _chunks(source, chunk_size):
+    if isinstance(source, (bytes, str)):
+        for i in range(0, len(source), chunk_size):
+            yield source[i:i + chunk_size]
+    elif hasattr(source, 'read'):
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    else:
+        yield from source
+
+
+def extract(source, url='', encoding='utf-8', chunk_size=CHUNK_SIZE):
+    """PageSummary from bytes, str, a binary file object or an iterable of chunks."""
+    parser = StreamingExtractor(url=url, encoding=encoding)
+    for chunk in _chunks(source, chunk_size):
+        parser.feed(chunk)
+    return parser.close()
+
+
+def extract_page(page):
+    """PageSummary for a crawler.Page."""
+    return extract(page.body, url=page.url)
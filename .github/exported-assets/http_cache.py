@@ -0,0 +1,183 @@
+# Persistent conditional-GET cache for the audit fetcher
+#
+# Bodies live on disk next to a small JSON index keyed by URL. Each entry
+# keeps the ETag / Last-Modified validators so the next crawl can ask the
+# server "has this changed?" and serve the body from disk on a 304.
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from crawler import Page
+
+CACHE_DIR = '.audit-cache/http'
+MAX_BYTES = 256 * 1024 * 1024
+
+# Response headers worth keeping alongside the cached body
+KEPT_HEADERS = ('content-type', 'content-encoding', 'content-language',
+                'etag', 'last-modified', 'cache-control')
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0            # 304 -> body served from disk
+    misses: int = 0          # full download (no entry, or entry changed)
+    revalidations: int = 0   # conditional requests sent
+    stores: int = 0
+    evictions: int = 0
+    bytes_saved: int = 0     # body bytes not transferred thanks to 304s
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self):
+        return (f"hits={self.hits} misses={self.misses} "
+                f"revalidations={self.revalidations} evictions={self.evictions} "
+                f"hit_rate={self.hit_rate():.0%} saved={self.bytes_saved:,} B")
+
+
+class HttpCache:
+    """On-disk, size-bounded LRU cache of validated HTTP responses.
+
+    The index is loaded once and written back by save() (or on exiting the
+    context manager); bodies are written immediately, atomically.
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, 'index.json')
+        self.entries = OrderedDict()   # url -> entry dict, oldest first
+        self.total_bytes = 0
+        self.stats = CacheStats()
+        os.makedirs(os.path.join(directory, 'bodies'), exist_ok=True)
+        self._load()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.save()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, url):
+        return url in self.entries
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for url, entry in data.get('entries', []):
+            if os.path.exists(self._body_path(entry['key'])):
+                self.entries[url] = entry
+                self.total_bytes += entry['size']
+
+    def save(self):
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'entries': list(self.entries.items())}, f)
+        os.replace(tmp, self.index_path)
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, 'bodies', key[:2], key)
+
+    def conditional_headers(self, url):
+        """If-None-Match / If-Modified-Since for a cached URL, else {}."""
+        entry = self.entries.get(url)
+        if entry is None:
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        if headers:
+            self.stats.revalidations += 1
+        return headers
+
+    def get(self, url):
+        """Cached Page for url (marks it most recently used), or None."""
+        entry = self.entries.get(url)
+        if entry is None:
+            return None
+        try:
+            with open(self._body_path(entry['key']), 'rb') as f:
+                body = f.read()
+        except OSError:
+            self._drop(url)
+            return None
+        self.entries.move_to_end(url)
+        return Page(entry['final_url'], entry['status'], dict(entry['headers']), body)
+
+    def revalidated(self, url, headers=None):
+        """Serve a 304 response from disk, merging any refreshed headers.
+
+        None when the body is no longer on disk; the entry is evicted then, so
+        the caller should re-request without conditional headers.
+        """
+        page = self.get(url)
+        if page is None:
+            return None
+        if headers:
+            refreshed = {k.lower(): v for k, v in headers.items() if k.lower() in KEPT_HEADERS}
+            self.entries[url]['headers'].update(refreshed)
+            page.headers.update(refreshed)
+        self.stats.hits += 1
+        self.stats.bytes_saved += len(page.body)
+        return page
+
+    def store(self, url, page):
+        """Record a full download; only validated 200s are kept on disk."""
+        self.stats.misses += 1
+        etag = page.headers.get('etag')
+        last_modified = page.headers.get('last-modified')
+        if page.status != 200 or not (etag or last_modified):
+            return
+        if len(page.body) > self.max_bytes:
+            return
+
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        path = self._body_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(page.body)
+        os.replace(tmp, path)
+
+        if url in self.entries:
+            self.total_bytes -= self.entries.pop(url)['size']
+        self.entries[url] = {
+            'key': key,
+            'final_url': page.url,
+            'status': page.status,
+            'etag': etag,
+            'last_modified': last_modified,
+            'headers': {k: v for k, v in page.headers.items() if k in KEPT_HEADERS},
+            'size': len(page.body),
+        }
+        self.total_bytes += len(page.body)
+        self.stats.stores += 1
+        self._evict()
+
+    def _drop(self, url):
+        entry = self.entries.pop(url)
+        self.total_bytes -= entry['size']
+        try:
+            os.remove(self._body_path(entry['key']))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            self._drop(next(iter(self.entries)))
+            self.stats.evictions += 1
+
+    def stats_dict(self):
+        return dict(asdict(self.stats), entries=len(self.entries), bytes=self.total_bytes)
@@ -0,0 +1,214 @@
+# Image audit for crawled Glowheal.in pages
+#
+# Checks the "Large uncompressed images slow page load" item from
+# glowheal_bugs_and_issues.csv ("should be < 100KB for most images",
+# "Convert to WebP format"). Every referenced image is downloaded once,
+# decoded in a process pool and cached by content hash, so an image that
+# hasn't changed since the last nightly run is never decoded again.
+
+import asyncio
+import csv
+import hashlib
+import io
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urljoin
+
+import aiohttp
+
+from crawler import BASE_URL, HEADERS, TIMEOUT, iter_pages, normalize_url
+from html_extract import extract_page
+
+CACHE_PATH = '.audit-cache/images.json'
+MAX_BYTES = 100 * 1024               # "< 100KB for most images"
+MODERN_FORMATS = ('WEBP', 'AVIF', 'SVG')
+MAX_DPR = 2                          # intrinsic width allowed per displayed CSS px
+ACCEPT = 'image/avif,image/webp,image/apng,image/*,*/*;q=0.8'
+
+
+@dataclass
+class ImageRecord:
+    url: str
+    sha256: str = ''
+    status: int = 0
+    format: str = ''
+    width: int = 0
+    height: int = 0
+    bytes: int = 0
+    displayed_width: int = 0         # largest width attribute seen on any page
+    displayed_height: int = 0
+    pages: list = field(default_factory=list)
+    error: str = None
+
+    @property
+    def bytes_per_pixel(self):
+        pixels = self.width * self.height
+        return self.bytes / pixels if pixels else 0.0
+
+    def flags(self):
+        flags = []
+        if self.error:
+            return [self.error]
+        if self.bytes > MAX_BYTES:
+            flags.append(f'over {MAX_BYTES // 1024}KB')
+        if self.format and self.format not in MODERN_FORMATS:
+            flags.append(f'{self.format} (not WebP/AVIF)')
+        if self.displayed_width and self.width > self.displayed_width * MAX_DPR:
+            flags.append(f'served {self.width}x{self.height}, '
+                         f'displayed {self.displayed_width}x{self.displayed_height or "?"}')
+        return flags
+
+
+def decode_image(data):
+    """(format, width, height, error) for encoded image bytes; runs in a worker process."""
+    head = data[:512].lstrip()
+    if head.startswith(b'<svg') or (head.startswith(b'<?xml') and b'<svg' in data[:2048]):
+        return 'SVG', 0, 0, None
+    from PIL import Image
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            return img.format or '', img.width, img.height, None
+    except Exception as e:  # Pillow raises a zoo of decoder errors
+        return '', 0, 0, f'undecodable ({type(e).__name__})'
+
+
+def _int_attr(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def collect_images(pages):
+    """{image url: ImageRecord} with displayed size and referring pages filled in."""
+    records = {}
+    for page in pages:
+        if page.status != 200:
+            continue
+        for img in extract_page(page).images:
+            if not img.src or img.src.startswith('data:'):
+                continue
+            url = normalize_url(urljoin(page.url, img.src))
+            record = records.setdefault(url, ImageRecord(url))
+            width, height = _int_attr(img.width), _int_attr(img.height)
+            if width > record.displayed_width:
+                record.displayed_width, record.displayed_height = width, height
+            if page.url not in record.pages:
+                record.pages.append(page.url)
+    return records
+
+
+class ImageAuditor:
+    def __init__(self, cache_path=CACHE_PATH, concurrency=16, per_host=6,
+                 timeout=TIMEOUT, workers=None):
+        self.cache_path = cache_path
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.workers = workers
+        self.cache = self._load_cache()   # sha256 -> [format, width, height, error]
+        self.decoded = 0
+        self.reused = 0
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # Entries written before decode errors got their own field are decoded again
+        return {digest: info for digest, info in cache.items() if len(info) == 4}
+
+    def save_cache(self):
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp = self.cache_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.cache, f)
+        os.replace(tmp, self.cache_path)
+
+    async def _download(self, records):
+        bodies = {}
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        headers = dict(HEADERS, Accept=ACCEPT)
+
+        async def fetch(session, record):
+            try:
+                async with session.get(record.url, allow_redirects=True) as resp:
+                    record.status = resp.status
+                    if resp.status == 200:
+                        bodies[record.url] = await resp.read()
+                    else:
+                        record.error = f'HTTP {resp.status}'
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                record.error = type(e).__name__
+
+        async with aiohttp.ClientSession(
+                connector=connector, headers=headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            await asyncio.gather(*(fetch(session, r) for r in records.values()))
+        return bodies
+
+    def audit(self, pages):
+        records = collect_images(pages)
+        bodies = asyncio.run(self._download(records))
+
+        by_hash = defaultdict(list)
+        for url, data in bodies.items():
+            record = records[url]
+            record.bytes = len(data)
+            record.sha256 = hashlib.sha256(data).hexdigest()
+            by_hash[record.sha256].append(record)
+
+        todo = [h for h in by_hash if h not in self.cache]
+        self.reused = len(by_hash) - len(todo)
+        if todo:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                payloads = (bodies[by_hash[h][0].url] for h in todo)
+                for digest, info in zip(todo, pool.map(decode_image, payloads, chunksize=4)):
+                    self.cache[digest] = list(info)
+            self.decoded = len(todo)
+            self.save_cache()
+
+        for digest, group in by_hash.items():
+            fmt, width, height, error = self.cache[digest]
+            for record in group:
+                record.format, record.width, record.height = fmt, width, height
+                record.error = error
+        return sorted(records.values(), key=lambda r: r.bytes, reverse=True)
+
+
+def to_csv(records, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Image', 'Format', 'Width', 'Height', 'Bytes', 'Bytes/Pixel',
+                         'Displayed Width', 'Displayed Height', 'Pages', 'Flags'])
+        for r in records:
+            writer.writerow([r.url, r.format, r.width, r.height, r.bytes,
+                             f'{r.bytes_per_pixel:.3f}', r.displayed_width, r.displayed_height,
+                             len(r.pages), '; '.join(r.flags())])
+
+
+if __name__ == '__main__':
+    pages = list(iter_pages(BASE_URL))
+    auditor = ImageAuditor()
+    records = auditor.audit(pages)
+    to_csv(records, 'glowheal_image_audit.csv')
+
+    flagged = [r for r in records if r.flags()]
+    print("=" * 80)
+    print("GLOWHEAL.IN - IMAGE AUDIT")
+    print("=" * 80)
+    for r in flagged:
+        print(f"\n{r.url}")
+        print(f"   {r.format} {r.width}x{r.height}, {r.bytes:,} B ({r.bytes_per_pixel:.2f} B/px), "
+              f"on {len(r.pages)} page(s)")
+        for flag in r.flags():
+            print(f"   ! {flag}")
+
+    print(f"\n✓ Images audited: {len(records)}")
+    print(f"✓ Decoded this run: {auditor.decoded} (cached by content hash: {auditor.reused})")
+    print(f"✓ Flagged: {len(flagged)}")
+    print("✓ Full audit exported to: glowheal_image_audit.csv")
@@ -0,0 +1,226 @@
+# Monthly compaction of per-lead JSON files into columnar archives
+#
+# Every lead is its own pretty-printed data/leads/LEAD_*.json and every
+# booking its own data/leads/YYYY/MM/<id>.json; scanning a few hundred
+# thousand of them is all open/stat calls. Closed months (before the current
+# UTC month) are packed into data/leads/archive/YYYY-MM.npz: one array per
+# field, with city/source/concern/status/kind dictionary-encoded. The archive
+# is re-read and its row count and ids checked against the originals before
+# any original is removed, and readers load only the columns they ask for.
+#
+#   python lead_archive.py compact [--remove-originals]
+#   python lead_archive.py read 2025-10 --columns city source
+
+import argparse
+import json
+import os
+import re
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import numpy as np
+
+from leads_data import (FIELDS, LEAD_FILE, LEADS_DIR, booking_partitions, flatten,
+                        parse_timestamp, read_json)
+
+ARCHIVE_DIR = os.path.join(LEADS_DIR, 'archive')
+DICTIONARY_COLUMNS = ('kind', 'city', 'source', 'concern', 'status')
+STRING_COLUMNS = ('id', 'phone', 'name')
+META = '__meta__'
+LEAD_ID_MS = re.compile(r'LEAD_(\d{13})_')
+
+
+def month_of(record, path):
+    """'YYYY-MM' (UTC) from the timestamp, the LEAD_<ms>_ id, or the file's mtime."""
+    parsed = parse_timestamp(record.get('timestamp'))
+    if parsed is None:
+        match = LEAD_ID_MS.match(str(record.get('id') or ''))
+        ms = int(match.group(1)) if match else os.path.getmtime(path) * 1000
+        parsed = datetime.fromtimestamp(ms / 1000, timezone.utc)
+    return parsed.strftime('%Y-%m')
+
+
+def collect_originals(leads_dir=LEADS_DIR):
+    """{month: [(path, flattened record)]} plus a list of unreadable files."""
+    months = defaultdict(list)
+    unreadable = []
+    with os.scandir(leads_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and LEAD_FILE.match(entry.name):
+                record = read_json(entry.path)
+                if record is None:
+                    unreadable.append(entry.path)
+                    continue
+                months[month_of(record, entry.path)].append((entry.path, flatten(record)))
+    for year, month, month_dir in booking_partitions(leads_dir):
+        with os.scandir(month_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.endswith('.json'):
+                    record = read_json(entry.path)
+                    if record is None:
+                        unreadable.append(entry.path)
+                        continue
+                    months[f'{year:04d}-{month:02d}'].append((entry.path, flatten(record, 'booking')))
+    return months, unreadable
+
+
+def _timestamp_ms(value):
+    parsed = parse_timestamp(value)
+    return int(parsed.timestamp() * 1000) if parsed else -1
+
+
+def encode(records):
+    """{array name: ndarray} for a list of flattened records."""
+    arrays = {'timestamp': np.array([_timestamp_ms(r['timestamp']) for r in records], dtype=np.int64)}
+    for name in STRING_COLUMNS:
+        arrays[name] = np.array([str(r[name] or '') for r in records], dtype=str)
+    for name in DICTIONARY_COLUMNS:
+        values, codes = np.unique(np.array([str(r[name] or '') for r in records], dtype=str),
+                                  return_inverse=True)
+        arrays[name] = codes.astype(np.int32)
+        arrays[name + '__values'] = values
+    return arrays
+
+
+def archive_path(month, archive_dir=ARCHIVE_DIR):
+    return os.path.join(archive_dir, f'{month}.npz')
+
+
+def write_archive(month, records, archive_dir=ARCHIVE_DIR, sources=None):
+    os.makedirs(archive_dir, exist_ok=True)
+    path = archive_path(month, archive_dir)
+    arrays = encode(records)
+    arrays[META] = np.array(json.dumps({
+        'month': month,
+        'rows': len(records),
+        'sources': sources or {},
+        'created': datetime.now(timezone.utc).isoformat(),
+    }))
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.savez_compressed(f, **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+def read_archive(path, columns=None, decode=True):
+    """{column: ndarray} reading only the requested columns from the archive.
+
+    Dictionary columns come back decoded to strings unless decode=False, in
+    which case they are int32 codes plus '<column>__values'.
+    """
+    columns = columns or FIELDS
+    out = {}
+    with np.load(path, allow_pickle=False) as archive:
+        for name in columns:
+            if name in DICTIONARY_COLUMNS:
+                codes = archive[name]
+                values = archive[name + '__values']
+                if decode:
+                    out[name] = values[codes]
+                else:
+                    out[name], out[name + '__values'] = codes, values
+            else:
+                out[name] = archive[name]
+    return out
+
+
+def archive_meta(path):
+    with np.load(path, allow_pickle=False) as archive:
+        return json.loads(str(archive[META]))
+
+
+def read_months(archive_dir=ARCHIVE_DIR, columns=None, start=None, end=None):
+    """Concatenated columns for archived months in ['YYYY-MM' start, end]."""
+    parts = []
+    for name in sorted(os.listdir(archive_dir)) if os.path.isdir(archive_dir) else []:
+        month = name[:-4]
+        if not name.endswith('.npz') or (start and month < start) or (end and month > end):
+            continue
+        parts.append(read_archive(os.path.join(archive_dir, name), columns))
+    columns = columns or FIELDS
+    if not parts:
+        return {name: np.array([]) for name in columns}
+    return {name: np.concatenate([p[name] for p in parts]) for name in columns}
+
+
+def verify(path, records):
+    """True if the archive holds exactly these records' ids, one row each."""
+    ids = read_archive(path, ['id'])['id']
+    meta = archive_meta(path)
+    expected = sorted(str(r['id'] or '') for r in records)
+    return meta['rows'] == len(records) == len(ids) and sorted(ids.tolist()) == expected
+
+
+def compact(leads_dir=LEADS_DIR, archive_dir=ARCHIVE_DIR, remove_originals=False, now=None,
+            months=None):
+    """Archive closed months; returns [(month, rows, archive path, verified, removed)]."""
+    current = (now or datetime.now(timezone.utc)).strftime('%Y-%m')
+    originals, unreadable = collect_originals(leads_dir)
+    results = []
+    for month in sorted(originals):
+        if month >= current or (months and month not in months):
+            continue
+        entries = originals[month]
+        path = archive_path(month, archive_dir)
+        if os.path.exists(path):
+            # Late arrivals for an archived month are merged in
+            existing = read_archive(path)
+            kept = [dict(zip(FIELDS, values)) for values in zip(*(existing[f] for f in FIELDS))]
+            ids = {str(r['id']) for _, r in entries}
+            for r in kept:
+                r['timestamp'] = (datetime.fromtimestamp(r['timestamp'] / 1000, timezone.utc).isoformat()
+                                  if r['timestamp'] >= 0 else None)
+            records = [r for r in kept if str(r['id']) not in ids] + [r for _, r in entries]
+        else:
+            records = [r for _, r in entries]
+        sources = {'lead_files': sum(r['kind'] == 'lead' for _, r in entries),
+                   'bookings': sum(r['kind'] == 'booking' for _, r in entries)}
+        write_archive(month, records, archive_dir, sources)
+        verified = verify(path, records)
+        removed = 0
+        if verified and remove_originals:
+            for original, _ in entries:
+                os.remove(original)
+                removed += 1
+                parent = os.path.dirname(original)
+                if parent != leads_dir and not os.listdir(parent):
+                    os.rmdir(parent)
+        results.append((month, len(records), path, verified, removed))
+    return results, unreadable
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Pack closed months of lead/booking JSON into columnar archives.')
+    parser.add_argument('--leads-dir', default=LEADS_DIR)
+    parser.add_argument('--archive-dir', default=ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    compact_cmd = sub.add_parser('compact', help='archive every closed month')
+    compact_cmd.add_argument('--month', action='append', help='only this YYYY-MM (repeatable)')
+    compact_cmd.add_argument('--remove-originals', action='store_true',
+                             help='delete the JSON files once the archive is verified')
+    read_cmd = sub.add_parser('read', help='print selected columns of one archived month')
+    read_cmd.add_argument('month')
+    read_cmd.add_argument('--columns', nargs='+', default=['id', 'timestamp', 'city', 'source'])
+    read_cmd.add_argument('--limit', type=int, default=20)
+    args = parser.parse_args()
+
+    if args.command == 'read':
+        data = read_archive(archive_path(args.month, args.archive_dir), args.columns)
+        print('\t'.join(args.columns))
+        for row in list(zip(*(data[c] for c in args.columns)))[:args.limit]:
+            print('\t'.join(str(v) for v in row))
+    else:
+        results, unreadable = compact(args.leads_dir, args.archive_dir, args.remove_originals,
+                                      months=args.month)
+        print("=" * 80)
+        print("GLOWHEAL.IN - LEAD ARCHIVE COMPACTION")
+        print("=" * 80)
+        for month, rows, path, verified, removed in results:
+            size = os.path.getsize(path)
+            status = 'verified' if verified else 'ROW COUNT MISMATCH - originals kept'
+            print(f"  {month}  {rows:>8,} rows  {size:>10,} B  {status}"
+                  + (f"  ({removed:,} files removed)" if removed else ''))
+        if unreadable:
+            print(f"\n! {len(unreadable)} unreadable file(s) left in place, e.g. {unreadable[0]}")
+        print(f"\n✓ Months archived: {len(results)} -> {args.archive_dir}")
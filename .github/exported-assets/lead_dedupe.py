@@ -0,0 +1,222 @@
+# Phone-based lead deduplication index
+#
+# Every submission gets a fresh LEAD_<ts>_<rand> id, so a patient who fills
+# the hero, mid-page and sticky-bar forms shows up as several leads. Phones
+# are normalised to E.164 (+91 for Indian numbers) and kept in a persistent
+# SQLite index clustered on (phone, time): a new arrival is one index seek,
+# a rebuild is one streaming pass, and duplicate clusters fall out of a
+# single ordered scan instead of an n x n comparison.
+
+import argparse
+import csv
+import os
+import re
+import sqlite3
+from dataclasses import dataclass, field
+
+from leads_data import LEADS_DIR, iter_records, parse_timestamp
+
+INDEX_PATH = '.audit-cache/lead-index.sqlite3'
+WINDOW_HOURS = 24            # submissions closer than this are one enquiry
+BATCH = 50000
+NON_DIGITS = re.compile(r'\D')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS leads (
+    phone   INTEGER NOT NULL,   -- E.164 digits, e.g. 919876543210
+    ts      INTEGER NOT NULL,   -- epoch milliseconds (0 if unknown)
+    id      TEXT    NOT NULL,
+    kind    TEXT,
+    source  TEXT,
+    city    TEXT,
+    PRIMARY KEY (phone, ts, id)
+) WITHOUT ROWID
+'''
+
+
+def normalize_phone(raw):
+    """Indian numbers in any common spelling -> '+91XXXXXXXXXX'; None if unusable.
+
+    Handles '98765 43210', '09876543210', '919876543210', '+91-98765-43210'
+    and '0091...'. Other '+' numbers are kept as E.164 if plausible.
+    """
+    if raw is None:
+        return None
+    raw = str(raw).strip()
+    digits = NON_DIGITS.sub('', raw)
+    international = raw.startswith('+') or digits.startswith('00')
+    digits = digits.lstrip('0') if digits.startswith('00') else digits
+    if international and not digits.startswith('91'):
+        return '+' + digits if 8 <= len(digits) <= 15 else None
+    if len(digits) == 12 and digits.startswith('91'):
+        national = digits[2:]
+    elif len(digits) == 11 and digits.startswith('0'):
+        national = digits[1:]
+    elif len(digits) == 10:
+        national = digits
+    else:
+        return None
+    if national[0] == '0':
+        return None
+    return '+91' + national
+
+
+def mask_phone(e164):
+    return e164[:3] + '*' * (len(e164) - 7) + e164[-4:]
+
+
+def _epoch_ms(timestamp):
+    parsed = parse_timestamp(timestamp)
+    return int(parsed.timestamp() * 1000) if parsed else 0
+
+
+def _row(record):
+    phone = normalize_phone(record.get('phone'))
+    if phone is None or not record.get('id'):
+        return None
+    return (int(phone[1:]), _epoch_ms(record.get('timestamp')), str(record['id']),
+            record.get('kind'), record.get('source'), record.get('city'))
+
+
+@dataclass
+class DuplicateCluster:
+    phone: str
+    leads: list = field(default_factory=list)   # (id, ts ms, kind, source, city)
+
+    @property
+    def sources(self):
+        return sorted({lead[3] or '(none)' for lead in self.leads})
+
+    @property
+    def span_minutes(self):
+        return (self.leads[-1][1] - self.leads[0][1]) / 60000
+
+
+class LeadIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute(SCHEMA)
+        self.unusable = 0
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.db.execute('SELECT COUNT(*) FROM leads').fetchone()[0]
+
+    def rebuild(self, records):
+        """Replace the index with `records` (any iterable of flattened leads)."""
+        self.db.close()
+        tmp = self.path + '.tmp'
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        db = sqlite3.connect(tmp)
+        db.execute('PRAGMA journal_mode = OFF')
+        db.execute('PRAGMA synchronous = OFF')
+        # Arrivals come in time order, not phone order; a big page cache keeps
+        # the random B-tree inserts in memory
+        db.execute('PRAGMA cache_size = -262144')
+        db.execute(SCHEMA)
+        self.unusable = 0
+        batch = []
+        for record in records:
+            row = _row(record)
+            if row is None:
+                self.unusable += 1
+                continue
+            batch.append(row)
+            if len(batch) >= BATCH:
+                db.executemany('INSERT OR IGNORE INTO leads VALUES (?, ?, ?, ?, ?, ?)', batch)
+                batch = []
+        db.executemany('INSERT OR IGNORE INTO leads VALUES (?, ?, ?, ?, ?, ?)', batch)
+        db.commit()
+        db.close()
+        os.replace(tmp, self.path)
+        self.db = sqlite3.connect(self.path)
+
+    def lookup(self, phone):
+        """(id, ts ms, kind, source, city) already indexed for this phone, oldest first."""
+        e164 = normalize_phone(phone)
+        if e164 is None:
+            return []
+        return self.db.execute('SELECT id, ts, kind, source, city FROM leads WHERE phone = ? ORDER BY ts',
+                               (int(e164[1:]),)).fetchall()
+
+    def add(self, record, window_hours=WINDOW_HOURS):
+        """Index a new arrival; returns earlier leads from the same phone within the window."""
+        row = _row(record)
+        if row is None:
+            return []
+        phone, ts = row[0], row[1]
+        window = window_hours * 3600 * 1000
+        matches = self.db.execute(
+            'SELECT id, ts, kind, source, city FROM leads WHERE phone = ? AND ts BETWEEN ? AND ? AND id != ?'
+            ' ORDER BY ts', (phone, ts - window, ts + window, row[2])).fetchall()
+        self.db.execute('INSERT OR IGNORE INTO leads VALUES (?, ?, ?, ?, ?, ?)', row)
+        self.db.commit()
+        return matches
+
+    def clusters(self, window_hours=WINDOW_HOURS):
+        """DuplicateClusters: same phone, each lead within the window of the previous one."""
+        window = window_hours * 3600 * 1000
+        current, phone, last_ts = [], None, None
+        for row in self.db.execute('SELECT phone, id, ts, kind, source, city FROM leads ORDER BY phone, ts'):
+            if row[0] != phone or row[2] - last_ts > window:
+                if len(current) > 1:
+                    yield DuplicateCluster('+%d' % phone, current)
+                current, phone = [], row[0]
+            current.append(row[1:])
+            last_ts = row[2]
+        if len(current) > 1:
+            yield DuplicateCluster('+%d' % phone, current)
+
+
+def to_csv(clusters, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Phone', 'Leads', 'Span (min)', 'Sources', 'Lead IDs'])
+        for c in clusters:
+            writer.writerow([mask_phone(c.phone), len(c.leads), f'{c.span_minutes:.1f}',
+                             '; '.join(c.sources), '; '.join(lead[0] for lead in c.leads)])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Deduplicate leads by normalised phone number.')
+    parser.add_argument('--index', default=INDEX_PATH)
+    parser.add_argument('--leads-dir', default=LEADS_DIR)
+    parser.add_argument('--lead-files', action='store_true',
+                        help='also read LEAD_*.json (only needed if log appends failed)')
+    parser.add_argument('--window-hours', type=float, default=WINDOW_HOURS)
+    parser.add_argument('--check', metavar='PHONE', help='look up one number instead of rebuilding')
+    args = parser.parse_args()
+
+    with LeadIndex(args.index) as index:
+        if args.check:
+            rows = index.lookup(args.check)
+            print(f"{normalize_phone(args.check) or 'unparseable'}: {len(rows)} lead(s)")
+            for lead_id, ts, kind, source, city in rows:
+                print(f"  {lead_id:<40} {kind or '':<8} {source or '':<25} {city or ''}")
+        else:
+            index.rebuild(iter_records(args.leads_dir, lead_files=args.lead_files))
+            clusters = sorted(index.clusters(args.window_hours), key=lambda c: -len(c.leads))
+            to_csv(clusters, 'glowheal_lead_duplicates.csv')
+
+            duplicates = sum(len(c.leads) - 1 for c in clusters)
+            print("=" * 80)
+            print("GLOWHEAL.IN - DUPLICATE LEADS")
+            print("=" * 80)
+            print(f"Indexed: {len(index):,} | Unusable phone/id: {index.unusable:,}")
+            print(f"Clusters within {args.window_hours:g}h: {len(clusters):,} "
+                  f"({duplicates:,} redundant leads)")
+            for c in clusters[:15]:
+                print(f"  {mask_phone(c.phone)}  {len(c.leads)} leads over {c.span_minutes:.0f} min  "
+                      f"via {', '.join(c.sources)}")
+            print("\n✓ Clusters exported to: glowheal_lead_duplicates.csv")
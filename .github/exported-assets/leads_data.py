@@ -0,0 +1,133 @@
+# Readers for the lead and booking records the site writes under data/leads/
+#
+#   data/leads/leads-log.jsonl         one line per lead (api/leads/submit)
+#   data/leads/LEAD_<ts>_<rand>.json   the same lead, pretty-printed
+#   data/leads/<YYYY>/<MM>/<id>.json   bookings (api/bookings, book/page.tsx)
+#
+# Leads are flat ({phone, city, concern, ...}); bookings nest the phone under
+# contact and carry the city on their catalog items. flatten() maps both to
+# one shape so the lead tools don't care where a record came from.
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+LEADS_DIR = os.path.join(REPO_ROOT, 'data', 'leads')
+LEADS_LOG = os.path.join(LEADS_DIR, 'leads-log.jsonl')
+LEAD_FILE = re.compile(r'LEAD_.*\.json$')
+YEAR_DIR = re.compile(r'\d{4}$')
+MONTH_DIR = re.compile(r'(0[1-9]|1[0-2])$')
+FIELDS = ('id', 'kind', 'timestamp', 'phone', 'name', 'city', 'source', 'concern', 'status')
+
+
+def parse_timestamp(value):
+    """ISO 8601 string (as written by toISOString) -> aware UTC datetime, or None."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def flatten(record, kind='lead'):
+    """Lead or booking JSON -> dict with FIELDS (missing values are None)."""
+    if kind == 'booking':
+        contact = record.get('contact') or {}
+        concern = record.get('concern')
+        if isinstance(concern, dict):
+            concern = concern.get('specialty') or concern.get('description')
+        items = record.get('items') or []
+        city = record.get('city') or next((i.get('city') for i in items if isinstance(i, dict)), None)
+        return {
+            'id': record.get('id'),
+            'kind': kind,
+            'timestamp': record.get('timestamp'),
+            'phone': contact.get('phone'),
+            'name': contact.get('name'),
+            'city': city,
+            'source': record.get('source'),
+            'concern': concern,
+            'status': record.get('status'),
+        }
+    flat = {name: record.get(name) for name in FIELDS}
+    flat['kind'] = kind
+    return flat
+
+
+def iter_log(path=LEADS_LOG):
+    """Flattened leads from the JSONL log; unparseable lines are skipped."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield flatten(record)
+
+
+def read_json(path):
+    try:
+        with open(path, 'rb') as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def iter_lead_files(leads_dir=LEADS_DIR):
+    with os.scandir(leads_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and LEAD_FILE.match(entry.name):
+                record = read_json(entry.path)
+                if record is not None:
+                    yield flatten(record)
+
+
+def booking_partitions(leads_dir=LEADS_DIR):
+    """Sorted [(year, month, directory)] for the data/leads/YYYY/MM tree."""
+    partitions = []
+    if not os.path.isdir(leads_dir):
+        return partitions
+    for year in os.listdir(leads_dir):
+        year_dir = os.path.join(leads_dir, year)
+        if not (YEAR_DIR.match(year) and os.path.isdir(year_dir)):
+            continue
+        for month in os.listdir(year_dir):
+            month_dir = os.path.join(year_dir, month)
+            if MONTH_DIR.match(month) and os.path.isdir(month_dir):
+                partitions.append((int(year), int(month), month_dir))
+    return sorted(partitions)
+
+
+def iter_booking_dir(month_dir):
+    with os.scandir(month_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and entry.name.endswith('.json'):
+                record = read_json(entry.path)
+                if record is not None:
+                    yield flatten(record, 'booking')
+
+
+def iter_bookings(leads_dir=LEADS_DIR):
+    for _, _, month_dir in booking_partitions(leads_dir):
+        yield from iter_booking_dir(month_dir)
+
+
+def iter_records(leads_dir=LEADS_DIR, lead_files=False):
+    """Every lead (from the log, plus LEAD_*.json if asked) and every booking."""
+    yield from iter_log(os.path.join(leads_dir, 'leads-log.jsonl'))
+    if lead_files:
+        yield from iter_lead_files(leads_dir)
+    yield from iter_bookings(leads_dir)
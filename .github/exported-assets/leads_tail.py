@@ -0,0 +1,224 @@
+# Incremental tailer for data/leads/leads-log.jsonl
+#
+# api/leads/submit/route.ts appends one JSON object per lead (source, city,
+# concern, timestamp, ...). The log is memory-mapped and read from the byte
+# offset saved in a checkpoint, so a refresh only touches lines appended since
+# the last run. A trailing line without its newline is left for next time;
+# a log that shrank or was replaced is detected and re-read from the start.
+#
+#   python leads_tail.py                 # one refresh, print the aggregates
+#   python leads_tail.py --follow 30     # refresh every 30 seconds
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from leads_data import LEADS_LOG
+
+CHECKPOINT = '.audit-cache/leads-tail.json'
+FINGERPRINT_BYTES = 256        # head of the log hashed to spot a replaced file
+RETENTION_HOURS = 90 * 24      # hourly buckets kept for rolling windows
+DIMENSIONS = ('source', 'city', 'concern')
+ISO_HOUR = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}')
+
+
+def hour_key(timestamp):
+    """'2025-11-01T09:41:12.345Z' -> '2025-11-01T09' (UTC); 'unknown' if unparseable."""
+    timestamp = timestamp or ''
+    if ISO_HOUR.match(timestamp) and timestamp.endswith('Z'):
+        return timestamp[:13]
+    try:
+        parsed = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return 'unknown'
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    return parsed.strftime('%Y-%m-%dT%H')
+
+
+class LeadAggregates:
+    """All-time counters per dimension plus hourly buckets for rolling windows."""
+
+    def __init__(self, data=None):
+        data = data or {}
+        self.total = data.get('total', 0)
+        self.bad_lines = data.get('bad_lines', 0)
+        self.counts = {d: Counter(data.get('counts', {}).get(d, {})) for d in DIMENSIONS}
+        # hour -> {'total': n, 'source': {...}, 'city': {...}, 'concern': {...}}
+        self.hourly = {hour: {'total': bucket['total'],
+                              **{d: Counter(bucket.get(d, {})) for d in DIMENSIONS}}
+                       for hour, bucket in data.get('hourly', {}).items()}
+
+    def add(self, lead):
+        self.total += 1
+        hour = hour_key(lead.get('timestamp'))
+        bucket = self.hourly.get(hour)
+        if bucket is None:
+            bucket = self.hourly[hour] = {'total': 0, **{d: Counter() for d in DIMENSIONS}}
+        bucket['total'] += 1
+        for d in DIMENSIONS:
+            value = lead.get(d) or '(none)'
+            self.counts[d][value] += 1
+            bucket[d][value] += 1
+
+    def prune(self, now=None, retention_hours=RETENTION_HOURS):
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(hours=retention_hours)).strftime('%Y-%m-%dT%H')
+        for hour in [h for h in self.hourly if h < cutoff]:
+            del self.hourly[hour]
+
+    def per_hour(self):
+        return Counter({hour: bucket['total'] for hour, bucket in self.hourly.items()})
+
+    def window(self, hours, now=None):
+        """(total, {dimension: Counter}) for leads in the last `hours` hours."""
+        now = now or datetime.now(timezone.utc)
+        cutoff = (now - timedelta(hours=hours)).strftime('%Y-%m-%dT%H')
+        total = 0
+        counts = {d: Counter() for d in DIMENSIONS}
+        for hour, bucket in self.hourly.items():
+            if hour != 'unknown' and hour > cutoff:
+                total += bucket['total']
+                for d in DIMENSIONS:
+                    counts[d].update(bucket[d])
+        return total, counts
+
+    def to_dict(self):
+        return {
+            'total': self.total,
+            'bad_lines': self.bad_lines,
+            'counts': {d: dict(c) for d, c in self.counts.items()},
+            'hourly': {hour: {'total': b['total'], **{d: dict(b[d]) for d in DIMENSIONS}}
+                       for hour, b in sorted(self.hourly.items())},
+        }
+
+
+class LeadTailer:
+    def __init__(self, log_path=LEADS_LOG, checkpoint=CHECKPOINT):
+        self.log_path = log_path
+        self.checkpoint = checkpoint
+        self.offset = 0
+        self.fingerprint = ''
+        self.aggregates = LeadAggregates()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.checkpoint, encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get('log') != os.path.abspath(self.log_path):
+            return
+        self.offset = state['offset']
+        self.fingerprint = state['fingerprint']
+        self.aggregates = LeadAggregates(state['aggregates'])
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.checkpoint) or '.', exist_ok=True)
+        tmp = self.checkpoint + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'log': os.path.abspath(self.log_path), 'offset': self.offset,
+                       'fingerprint': self.fingerprint,
+                       'aggregates': self.aggregates.to_dict()}, f)
+        os.replace(tmp, self.checkpoint)
+
+    def _reset(self):
+        self.offset = 0
+        self.fingerprint = ''
+        self.aggregates = LeadAggregates()
+
+    def refresh(self):
+        """Fold newly appended complete lines into the aggregates; returns how many."""
+        try:
+            f = open(self.log_path, 'rb')
+        except FileNotFoundError:
+            return 0
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                if self.offset:
+                    self._reset()
+                return 0
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+                if self.offset and (size < self.offset
+                                    or self._fingerprint(mm, self.offset) != self.fingerprint):
+                    self._reset()         # truncated, rotated or rewritten
+                end = mm.rfind(b'\n', self.offset, size) + 1
+                if end <= self.offset:
+                    return 0              # nothing new, or only a partial line
+                added = self._consume(mm, self.offset, end)
+                self.offset = end
+                self.fingerprint = self._fingerprint(mm, end)
+        self.aggregates.prune()
+        return added
+
+    @staticmethod
+    def _fingerprint(mm, offset):
+        return hashlib.sha1(mm[:min(offset, FINGERPRINT_BYTES)]).hexdigest()
+
+    def _consume(self, mm, start, end):
+        added = 0
+        pos = start
+        while pos < end:
+            nl = mm.find(b'\n', pos, end)
+            line = mm[pos:nl].strip()
+            pos = nl + 1
+            if not line:
+                continue
+            try:
+                lead = json.loads(line)
+            except ValueError:
+                self.aggregates.bad_lines += 1
+                continue
+            if isinstance(lead, dict):
+                self.aggregates.add(lead)
+                added += 1
+            else:
+                self.aggregates.bad_lines += 1
+        return added
+
+
+def print_summary(aggregates, top=10):
+    print("=" * 80)
+    print("GLOWHEAL.IN - LEADS LOG")
+    print("=" * 80)
+    print(f"Leads: {aggregates.total:,} | Unparseable lines: {aggregates.bad_lines}")
+    day_total, day = aggregates.window(24)
+    for d in DIMENSIONS:
+        print(f"\nLeads by {d} (all time / last 24h):")
+        for value, count in aggregates.counts[d].most_common(top):
+            print(f"  {value:<30} {count:>8,} {day[d][value]:>8,}")
+    print("\nLeads per hour (last 24 buckets):")
+    for hour, count in sorted(aggregates.per_hour().items())[-24:]:
+        print(f"  {hour}:00Z  {count:>6,}")
+    print(f"\nLast 24h: {day_total:,} leads")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Tail data/leads/leads-log.jsonl incrementally.')
+    parser.add_argument('--log', default=LEADS_LOG)
+    parser.add_argument('--checkpoint', default=CHECKPOINT)
+    parser.add_argument('--follow', type=float, metavar='SECONDS',
+                        help='keep refreshing at this interval')
+    args = parser.parse_args()
+
+    tailer = LeadTailer(args.log, args.checkpoint)
+    while True:
+        start = time.perf_counter()
+        added = tailer.refresh()
+        tailer.save()
+        elapsed = (time.perf_counter() - start) * 1000
+        if not args.follow:
+            print_summary(tailer.aggregates)
+            print(f"\n✓ {added:,} new lead(s) read in {elapsed:.1f} ms (offset {tailer.offset:,} B)")
+            break
+        print(f"{datetime.now():%H:%M:%S}  +{added} lead(s)  total {tailer.aggregates.total:,}  "
+              f"({elapsed:.1f} ms)")
+        time.sleep(args.follow)
@@ -0,0 +1,275 @@
+# Lighthouse report history in a compact columnar store
+#
+# reports/lighthouse-home.report.json is one run; we want hundreds per page.
+# Reports are parsed in a process pool and flattened into NumPy columns:
+#
+#   runs     page / fetch time / Lighthouse version / form factor per run
+#   numeric  runs x audits matrix of audits[*].numericValue (NaN = missing)
+#   score    runs x (audits + categories) matrix of scores
+#
+# Runs are kept sorted by (page, fetch time), so "LCP p75 for /pricing over
+# the last 90 runs" is a binary search plus a slice - no JSON is re-parsed.
+# Each save() writes a new gen-N/ directory and then swaps manifest.json to
+# point at it, so files another reader (or this store) has memory-mapped are
+# never overwritten in place - Windows refuses to replace a mapped file.
+#
+#   python lighthouse_store.py ingest ../../reports/*.report.json
+#   python lighthouse_store.py query /pricing largest-contentful-paint --p 75 --last 90
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import numpy as np
+
+STORE_DIR = os.path.join('..', '..', 'reports', 'lighthouse-history')
+CATEGORY_PREFIX = 'category:'
+RUN_COLUMNS = ('page', 'time', 'version', 'form_factor', 'error')
+
+
+def page_key(url):
+    """'http://localhost:3001/pricing?x=1' -> '/pricing' (origin-independent)."""
+    path = urlsplit(url or '').path or '/'
+    return path if path == '/' else path.rstrip('/')
+
+
+def parse_report(path):
+    """Flatten one Lighthouse JSON report; runs in a worker process."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    report = json.loads(raw)
+    fetch_time = datetime.fromisoformat(report['fetchTime'].replace('Z', '+00:00'))
+    numeric, score = {}, {}
+    for audit_id, audit in report.get('audits', {}).items():
+        if isinstance(audit.get('numericValue'), (int, float)):
+            numeric[audit_id] = float(audit['numericValue'])
+        if isinstance(audit.get('score'), (int, float)):
+            score[audit_id] = float(audit['score'])
+    for category_id, category in report.get('categories', {}).items():
+        if isinstance(category.get('score'), (int, float)):
+            score[CATEGORY_PREFIX + category_id] = float(category['score'])
+    return {
+        'sha1': hashlib.sha1(raw).hexdigest(),
+        'page': page_key(report.get('requestedUrl') or report.get('finalUrl')),
+        'time': int(fetch_time.timestamp() * 1000),
+        'version': report.get('lighthouseVersion', ''),
+        'form_factor': report.get('configSettings', {}).get('formFactor', ''),
+        'error': bool(report.get('runtimeError')),
+        'numeric': numeric,
+        'score': score,
+    }
+
+
+class LighthouseStore:
+    """Columnar run history; load once, query many times."""
+
+    def __init__(self, directory=STORE_DIR):
+        self.directory = directory
+        self.manifest = {'pages': [], 'versions': [], 'form_factors': [],
+                         'numeric': [], 'score': [], 'ingested': []}
+        self.runs = {name: np.zeros(0, dtype=dtype) for name, dtype in
+                     zip(RUN_COLUMNS, (np.int32, np.int64, np.int16, np.int8, np.bool_))}
+        self.numeric = np.zeros((0, 0))
+        self.score = np.zeros((0, 0), dtype=np.float32)
+        self._load()
+
+    # -- persistence ----------------------------------------------------------
+
+    def _path(self, name, generation=None):
+        """A file in the store; arrays live in gen-N/ (stores from before generations: top level)."""
+        if generation is None:
+            return os.path.join(self.directory, name)
+        return os.path.join(self.directory, f'gen-{generation}', name)
+
+    def _load(self):
+        if not os.path.exists(self._path('manifest.json')):
+            return
+        with open(self._path('manifest.json'), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        generation = self.manifest.get('generation')
+        for name in RUN_COLUMNS:
+            self.runs[name] = np.load(self._path(f'run_{name}.npy', generation), mmap_mode='r')
+        self.numeric = np.load(self._path('numeric.npy', generation), mmap_mode='r')
+        self.score = np.load(self._path('score.npy', generation), mmap_mode='r')
+
+    def save(self):
+        previous = self.manifest.get('generation')
+        generation = 0 if previous is None else previous + 1
+        os.makedirs(self._path('', generation), exist_ok=True)
+        arrays = {f'run_{name}.npy': self.runs[name] for name in RUN_COLUMNS}
+        # Fortran order keeps each audit's history contiguous on disk
+        arrays['numeric.npy'] = np.asfortranarray(self.numeric)
+        arrays['score.npy'] = np.asfortranarray(self.score)
+        for name, array in arrays.items():
+            np.save(self._path(name, generation), array)
+        manifest = dict(self.manifest, generation=generation)
+        tmp = self._path('manifest.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self._path('manifest.json'))
+        # Re-map from the new generation, dropping our maps of the old one, then prune
+        self._load()
+        self._prune(generation)
+
+    def _prune(self, generation):
+        """Remove superseded generations; ones another process still maps are left for next time."""
+        for entry in os.listdir(self.directory):
+            path = os.path.join(self.directory, entry)
+            if entry.startswith('gen-') and entry != f'gen-{generation}':
+                shutil.rmtree(path, ignore_errors=True)
+            elif entry.endswith('.npy'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    # -- ingest ---------------------------------------------------------------
+
+    def _code(self, dictionary, value):
+        values = self.manifest[dictionary]
+        if value not in values:
+            values.append(value)
+        return values.index(value)
+
+    def ingest(self, paths, workers=None):
+        """Parse reports in parallel and merge them in; returns runs added."""
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_report, paths, chunksize=8))
+        seen = set(self.manifest['ingested'])
+        fresh = []
+        for run in parsed:
+            if run['sha1'] not in seen:
+                seen.add(run['sha1'])
+                fresh.append(run)
+        if not fresh:
+            return 0
+
+        for run in fresh:
+            for audit_id in run['numeric']:
+                self._code('numeric', audit_id)
+            for audit_id in run['score']:
+                self._code('score', audit_id)
+        numeric_index = {a: i for i, a in enumerate(self.manifest['numeric'])}
+        score_index = {a: i for i, a in enumerate(self.manifest['score'])}
+
+        n_old = len(self.runs['page'])
+        numeric = np.full((n_old + len(fresh), len(numeric_index)), np.nan)
+        score = np.full((n_old + len(fresh), len(score_index)), np.nan, dtype=np.float32)
+        numeric[:n_old, :self.numeric.shape[1]] = self.numeric
+        score[:n_old, :self.score.shape[1]] = self.score
+
+        new_runs = {name: [] for name in RUN_COLUMNS}
+        for row, run in enumerate(fresh, start=n_old):
+            new_runs['page'].append(self._code('pages', run['page']))
+            new_runs['time'].append(run['time'])
+            new_runs['version'].append(self._code('versions', run['version']))
+            new_runs['form_factor'].append(self._code('form_factors', run['form_factor']))
+            new_runs['error'].append(run['error'])
+            for audit_id, value in run['numeric'].items():
+                numeric[row, numeric_index[audit_id]] = value
+            for audit_id, value in run['score'].items():
+                score[row, score_index[audit_id]] = value
+            self.manifest['ingested'].append(run['sha1'])
+
+        runs = {name: np.concatenate([np.asarray(self.runs[name]),
+                                      np.array(new_runs[name], dtype=self.runs[name].dtype)])
+                for name in RUN_COLUMNS}
+        order = np.lexsort((runs['time'], runs['page']))
+        self.runs = {name: column[order] for name, column in runs.items()}
+        self.numeric = numeric[order]
+        self.score = score[order]
+        return len(fresh)
+
+    # -- queries --------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.runs['page'])
+
+    def pages(self):
+        return list(self.manifest['pages'])
+
+    def _rows(self, page, last=None, since=None, version=None, form_factor=None, include_errors=False):
+        if page not in self.manifest['pages']:
+            return np.zeros(0, dtype=np.int64)
+        code = self.manifest['pages'].index(page)
+        start, stop = np.searchsorted(self.runs['page'], [code, code + 1])
+        rows = np.arange(start, stop)
+        mask = np.ones(len(rows), dtype=bool)
+        if not include_errors:
+            mask &= ~self.runs['error'][start:stop]
+        if since is not None:
+            mask &= self.runs['time'][start:stop] >= int(since.timestamp() * 1000)
+        if version is not None:
+            if version not in self.manifest['versions']:
+                return rows[:0]
+            mask &= self.runs['version'][start:stop] == self.manifest['versions'].index(version)
+        if form_factor is not None:
+            if form_factor not in self.manifest['form_factors']:
+                return rows[:0]
+            mask &= self.runs['form_factor'][start:stop] == self.manifest['form_factors'].index(form_factor)
+        rows = rows[mask]
+        return rows[-last:] if last else rows
+
+    def series(self, page, metric, field='numeric', **filters):
+        """(fetch times in ms, values) for one audit/category on one page, oldest first.
+
+        field is 'numeric' (audits[*].numericValue) or 'score'; category scores
+        are addressed as metric='category:performance'.
+        """
+        if metric.startswith(CATEGORY_PREFIX):
+            field = 'score'
+        names = self.manifest[field]
+        if metric not in names:
+            raise KeyError(f'{metric!r} has no {field} values in the store')
+        rows = self._rows(page, **filters)
+        matrix = self.numeric if field == 'numeric' else self.score
+        return np.asarray(self.runs['time'][rows]), np.asarray(matrix[rows, names.index(metric)])
+
+    def percentile(self, page, metric, q=75, field='numeric', **filters):
+        _, values = self.series(page, metric, field, **filters)
+        values = values[~np.isnan(values)]
+        return float(np.percentile(values, q)) if len(values) else float('nan')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Lighthouse report history store.')
+    parser.add_argument('--store', default=STORE_DIR)
+    sub = parser.add_subparsers(dest='command', required=True)
+    ingest = sub.add_parser('ingest', help='add Lighthouse JSON reports')
+    ingest.add_argument('reports', nargs='+')
+    query = sub.add_parser('query', help='percentile of one metric for one page')
+    query.add_argument('page')
+    query.add_argument('metric')
+    query.add_argument('--p', type=float, default=75)
+    query.add_argument('--last', type=int, default=90)
+    query.add_argument('--field', choices=('numeric', 'score'), default='numeric')
+    query.add_argument('--version')
+    query.add_argument('--form-factor')
+    args = parser.parse_args()
+
+    store = LighthouseStore(args.store)
+    if args.command == 'ingest':
+        added = store.ingest(args.reports)
+        store.save()
+        print(f"✓ Ingested {added} new run(s); store holds {len(store)} runs "
+              f"across {len(store.pages())} page(s)")
+    else:
+        page = page_key(args.page)
+        field = 'score' if args.metric.startswith(CATEGORY_PREFIX) else args.field
+        if not len(store):
+            parser.error(f"the store at {args.store} is empty; ingest some reports first")
+        if page not in store.pages():
+            parser.error(f"no runs for page {args.page!r}; known pages: {', '.join(store.pages())}")
+        if args.metric not in store.manifest[field]:
+            known = store.manifest[field]
+            parser.error(f"no {field} values for metric {args.metric!r}"
+                         + (f" (e.g. {', '.join(known[:5])})" if known else ''))
+        filters = dict(last=args.last, version=args.version, form_factor=args.form_factor)
+        _, values = store.series(page, args.metric, field, **filters)
+        value = store.percentile(page, args.metric, args.p, field, **filters)
+        print(f"{args.metric} p{args.p:g} for {page} over last {len(values)} run(s): {value:.3f}")
@@ -0,0 +1,222 @@
+# Broken-link checker for crawled Glowheal.in pages
+#
+# Replaces "Use online broken link checker, manually click all links"
+# (glowheal_bugs_and_issues.csv, Links / MEDIUM). Every unique link target
+# is checked once - HEAD first, GET when the server rejects HEAD - under a
+# per-host concurrency and rate limit, and results are cached with a TTL so
+# nightly runs only re-check what has expired.
+
+import asyncio
+import csv
+import json
+import os
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+
+from crawler import BASE_URL, HEADERS, TIMEOUT, iter_pages, normalize_url
+from html_extract import extract_page
+
+CACHE_PATH = '.audit-cache/links.json'
+TTL = 24 * 60 * 60           # seconds a checked result stays valid
+PER_HOST = 4                 # concurrent requests per host
+RATE = 5.0                   # requests per second per host
+
+SKIPPED_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:', 'sms:', 'whatsapp:')
+# HEAD answers that often mean "HEAD not supported" rather than "broken"
+HEAD_FALLBACK = {400, 403, 405, 406, 429, 500, 501, 503}
+
+
+@dataclass
+class LinkResult:
+    url: str
+    status: int              # 0 = request failed before any response
+    method: str
+    checked_at: float
+    error: str = None
+
+    @property
+    def broken(self):
+        return self.status == 0 or self.status >= 400
+
+
+def collect_links(pages):
+    """{target url: set of pages linking to it} for every checkable href."""
+    referrers = defaultdict(set)
+    for page in pages:
+        if page.status != 200:
+            continue
+        for link in extract_page(page).links:
+            href = link.href
+            if not href or href.startswith('#') or href.lower().startswith(SKIPPED_SCHEMES):
+                continue
+            target = urljoin(page.url, href)
+            if urlsplit(target).scheme not in ('http', 'https'):
+                continue
+            referrers[normalize_url(target)].add(page.url)
+    return referrers
+
+
+class HostLimiter:
+    """Per-host semaphore plus a minimum spacing between request starts."""
+
+    def __init__(self, per_host=PER_HOST, rate=RATE):
+        self.per_host = per_host
+        self.interval = 1.0 / rate if rate else 0.0
+        self._slots = {}
+        self._locks = {}
+        self._next_start = defaultdict(float)
+
+    async def acquire(self, host):
+        if host not in self._slots:
+            self._slots[host] = asyncio.Semaphore(self.per_host)
+            self._locks[host] = asyncio.Lock()
+        await self._slots[host].acquire()
+        async with self._locks[host]:
+            now = time.monotonic()
+            wait = self._next_start[host] - now
+            self._next_start[host] = max(now, self._next_start[host]) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def release(self, host):
+        self._slots[host].release()
+
+
+class LinkChecker:
+    def __init__(self, per_host=PER_HOST, rate=RATE, timeout=TIMEOUT, ttl=TTL,
+                 cache_path=CACHE_PATH, concurrency=32, headers=None):
+        self.limiter = HostLimiter(per_host, rate)
+        self.timeout = timeout
+        self.ttl = ttl
+        self.cache_path = cache_path
+        self.concurrency = concurrency
+        self.headers = dict(headers or HEADERS)
+        self.cache = self._load_cache()
+        self.checked = 0     # requests actually made this run
+        self.reused = 0      # answered from the TTL cache
+
+    def _load_cache(self):
+        if not self.cache_path:
+            return {}
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                return {url: LinkResult(**r) for url, r in json.load(f).items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        os.makedirs(os.path.dirname(self.cache_path) or '.', exist_ok=True)
+        tmp = self.cache_path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({url: asdict(r) for url, r in self.cache.items()}, f)
+        os.replace(tmp, self.cache_path)
+
+    def cached(self, url, now=None):
+        result = self.cache.get(url)
+        now = time.time() if now is None else now
+        if result is not None and now - result.checked_at < self.ttl:
+            return result
+        return None
+
+    async def _request(self, session, method, url):
+        try:
+            async with session.request(method, url, allow_redirects=True) as resp:
+                return resp.status, None
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return 0, e
+
+    async def check(self, session, url):
+        host = urlsplit(url).netloc.lower()
+        await self.limiter.acquire(host)
+        try:
+            status, error = await self._request(session, 'HEAD', url)
+            method = 'HEAD'
+            # Unreachable hosts stay broken; a garbled HEAD reply deserves a GET
+            unreachable = isinstance(error, (aiohttp.ClientConnectorError, asyncio.TimeoutError))
+            if status in HEAD_FALLBACK or (error is not None and not unreachable):
+                status, error = await self._request(session, 'GET', url)
+                method = 'GET'
+        finally:
+            self.limiter.release(host)
+        self.checked += 1
+        result = LinkResult(url, status, method, time.time(),
+                            type(error).__name__ if error is not None else None)
+        self.cache[url] = result
+        return result
+
+    async def check_all(self, urls):
+        """{url: LinkResult}, hitting the network only for expired entries."""
+        results = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            hit = self.cached(url)
+            if hit is not None:
+                results[url] = hit
+                self.reused += 1
+            else:
+                pending.append(url)
+        if not pending:
+            return results
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency,
+                                         limit_per_host=self.limiter.per_host)
+        async with aiohttp.ClientSession(
+                connector=connector, headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            for result in await asyncio.gather(*(self.check(session, u) for u in pending)):
+                results[result.url] = result
+        return results
+
+    def run(self, pages):
+        """Collect links from pages, check them and return a LinkReport."""
+        referrers = collect_links(pages)
+        results = asyncio.run(self.check_all(referrers))
+        self.save_cache()
+        return LinkReport(results, referrers)
+
+
+@dataclass
+class LinkReport:
+    results: dict      # url -> LinkResult
+    referrers: dict    # url -> set of referring pages
+
+    def broken(self):
+        """(result, sorted referring pages) for every broken target."""
+        return [(r, sorted(self.referrers.get(url, ())))
+                for url, r in sorted(self.results.items()) if r.broken]
+
+    def to_csv(self, path):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Target URL', 'Status', 'Method', 'Error', 'Referenced From', 'Reference Count'])
+            for result, pages in self.broken():
+                writer.writerow([result.url, result.status, result.method, result.error or '',
+                                 '\n'.join(pages), len(pages)])
+
+
+if __name__ == '__main__':
+    pages = list(iter_pages(BASE_URL))
+    checker = LinkChecker()
+    report = checker.run(pages)
+    report.to_csv('glowheal_broken_links.csv')
+
+    broken = report.broken()
+    print("=" * 80)
+    print("GLOWHEAL.IN - BROKEN LINKS")
+    print("=" * 80)
+    for result, referrers in broken:
+        print(f"\n{result.status or result.error}  {result.url}")
+        for page_url in referrers:
+            print(f"   <- {page_url}")
+
+    print(f"\n✓ Pages crawled: {len(pages)}")
+    print(f"✓ Unique link targets: {len(report.results)} "
+          f"({checker.checked} checked, {checker.reused} from cache)")
+    print(f"✓ Broken: {len(broken)}")
+    print("✓ Report exported to: glowheal_broken_links.csv")
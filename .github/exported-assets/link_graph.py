@@ -0,0 +1,249 @@
+# Internal link graph of Glowheal.in
+#
+# script_1.py asks for breadcrumbs, "Related services links" and a simpler
+# menu; script_4.py flags "Menu items not logically organized". This stage
+# turns a crawl into a SciPy sparse adjacency matrix and measures what those
+# items are about: internal PageRank, click depth from the home page, orphan
+# pages (nothing links to them) and dead ends (they link nowhere). Snapshots
+# can be saved and diffed between crawls.
+#
+# Edges go to crawled pages only; links to redirecting URLs are dropped
+# since the crawl records final URLs.
+
+import argparse
+import csv
+import json
+from array import array
+from dataclasses import asdict, dataclass
+from urllib.parse import urlsplit
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import shortest_path
+
+from crawler import BASE_URL, extract_links, is_html, iter_pages, normalize_url
+
+DAMPING = 0.85
+TOLERANCE = 1e-10
+MAX_ITERATIONS = 200
+TOP_N = 15
+
+
+class LinkGraph:
+    """Pages as node ids, links as a CSR matrix (row = source, column = target)."""
+
+    def __init__(self, urls, adjacency):
+        self.urls = urls
+        self.ids = {url: i for i, url in enumerate(urls)}
+        self.adjacency = adjacency
+
+    def __len__(self):
+        return len(self.urls)
+
+    @classmethod
+    def from_pages(cls, pages):
+        """Build from an iterable of crawler Pages (consumed once, bodies not kept)."""
+        ids = {}
+        sources, targets = array('q'), array('q')
+        crawled = set()
+
+        def node(url):
+            return ids.setdefault(url, len(ids))
+
+        for page in pages:
+            if page.status != 200 or not is_html(page):
+                continue
+            url = normalize_url(page.url)
+            crawled.add(node(url))
+            host = urlsplit(url).netloc
+            for link in extract_links(page):
+                parts = urlsplit(link)
+                if parts.scheme in ('http', 'https') and parts.netloc.lower() == host:
+                    target = normalize_url(link)
+                    if target != url:
+                        sources.append(ids[url])
+                        targets.append(node(target))
+
+        # Keep crawled pages only, renumbered densely in first-seen order
+        keep = np.zeros(len(ids), dtype=bool)
+        keep[list(crawled)] = True
+        remap = np.cumsum(keep) - 1
+        src = np.frombuffer(sources, dtype=np.int64)
+        dst = np.frombuffer(targets, dtype=np.int64)
+        valid = keep[dst]
+        n = int(keep.sum())
+        adjacency = sparse.csr_matrix(
+            (np.ones(int(valid.sum()), dtype=np.float64), (remap[src[valid]], remap[dst[valid]])),
+            shape=(n, n))
+        adjacency.data[:] = 1.0   # duplicate links were summed; count each edge once
+        urls = [url for url, i in ids.items() if keep[i]]
+        return cls(urls, adjacency)
+
+    @property
+    def out_degree(self):
+        return np.diff(self.adjacency.indptr)
+
+    @property
+    def in_degree(self):
+        return np.bincount(self.adjacency.indices, minlength=len(self))
+
+    def pagerank(self, damping=DAMPING, tol=TOLERANCE, max_iter=MAX_ITERATIONS):
+        """Power iteration; dangling pages spread their rank uniformly."""
+        n = len(self)
+        if not n:
+            return np.zeros(0)
+        out = self.out_degree.astype(np.float64)
+        dangling = out == 0
+        inv_out = np.divide(1.0, out, out=np.zeros(n), where=~dangling)
+        # transition^T as CSR so each step is one sparse mat-vec
+        transition = sparse.diags(inv_out) @ self.adjacency
+        transition_t = transition.T.tocsr()
+        rank = np.full(n, 1.0 / n)
+        for _ in range(max_iter):
+            spread = damping * (transition_t @ rank + rank[dangling].sum() / n) + (1 - damping) / n
+            delta = np.abs(spread - rank).sum()
+            rank = spread
+            if delta < tol:
+                break
+        return rank / rank.sum()
+
+    def click_depth(self, root):
+        """Links followed from root to each page; -1 if unreachable."""
+        if root not in self.ids:
+            return np.full(len(self), -1)
+        dist = shortest_path(self.adjacency, method='D', unweighted=True, indices=self.ids[root])
+        return np.where(np.isinf(dist), -1, dist).astype(int)
+
+    def orphans(self, root):
+        """Crawled pages (e.g. sitemap-only) no other page links to."""
+        return [self.urls[i] for i in np.flatnonzero(self.in_degree == 0) if self.urls[i] != root]
+
+    def dead_ends(self):
+        return [self.urls[i] for i in np.flatnonzero(self.out_degree == 0)]
+
+    def metrics(self, root):
+        rank = self.pagerank()
+        depth = self.click_depth(root)
+        inbound, outbound = self.in_degree, self.out_degree
+        orphans = set(self.orphans(root))
+        return {url: PageMetrics(float(rank[i]), int(depth[i]), int(inbound[i]), int(outbound[i]),
+                                 url in orphans)
+                for i, url in enumerate(self.urls)}
+
+
+@dataclass
+class PageMetrics:
+    pagerank: float
+    depth: int          # -1 = unreachable from the home page
+    inbound: int
+    outbound: int
+    orphan: bool = False  # no inbound links and not the root (see LinkGraph.orphans)
+
+    @property
+    def dead_end(self):
+        return self.outbound == 0
+
+
+def save_metrics(metrics, path):
+    """Snapshot keyed by path so crawls of localhost and production compare."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({_path(url): asdict(m) for url, m in metrics.items()}, f)
+
+
+def load_metrics(path):
+    with open(path, encoding='utf-8') as f:
+        snapshot = json.load(f)
+    for m in snapshot.values():
+        # Older snapshots lack the flag; only the root sits at depth 0
+        m.setdefault('orphan', m['inbound'] == 0 and m['depth'] != 0)
+    return {url: PageMetrics(**m) for url, m in snapshot.items()}
+
+
+def _path(url):
+    parts = urlsplit(url)
+    return parts.path + ('?' + parts.query if parts.query else '')
+
+
+def diff_metrics(before, after):
+    """(change, page, before, after) rows between two snapshots keyed by path."""
+    before = {_path(u) if '://' in u else u: m for u, m in before.items()}
+    after = {_path(u) if '://' in u else u: m for u, m in after.items()}
+    rows = []
+    for page in sorted(set(after) - set(before)):
+        rows.append(('added', page, None, after[page].depth))
+    for page in sorted(set(before) - set(after)):
+        rows.append(('removed', page, before[page].depth, None))
+    common = sorted(set(before) & set(after))
+    for page in common:
+        a, b = before[page], after[page]
+        if a.depth != b.depth:
+            rows.append(('depth', page, a.depth, b.depth))
+        if not a.orphan and b.orphan:
+            rows.append(('new orphan', page, a.inbound, b.inbound))
+        if not a.dead_end and b.dead_end:
+            rows.append(('new dead end', page, a.outbound, b.outbound))
+    if common:
+        old_rank = np.array([before[p].pagerank for p in common])
+        new_rank = np.array([after[p].pagerank for p in common])
+        change = (new_rank - old_rank) / np.maximum(old_rank, 1e-12)
+        for i in np.argsort(-np.abs(change))[:TOP_N]:
+            if abs(change[i]) >= 0.1:
+                rows.append(('pagerank', common[i], float(old_rank[i]), float(new_rank[i])))
+    return rows
+
+
+def to_csv(metrics, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Page', 'Click Depth', 'PageRank', 'Inbound Links', 'Outbound Links',
+                         'Orphan', 'Dead End'])
+        for url, m in sorted(metrics.items(), key=lambda kv: -kv[1].pagerank):
+            writer.writerow([url, m.depth, f'{m.pagerank:.6f}', m.inbound, m.outbound,
+                             'Yes' if m.orphan else 'No', 'Yes' if m.dead_end else 'No'])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Internal link graph: PageRank, click depth, orphans.')
+    parser.add_argument('--base-url', default=BASE_URL)
+    parser.add_argument('--save', help='write a JSON snapshot for later diffs')
+    parser.add_argument('--diff', help='snapshot from an earlier crawl to compare against')
+    parser.add_argument('--top', type=int, default=TOP_N)
+    args = parser.parse_args()
+
+    graph = LinkGraph.from_pages(iter_pages(args.base_url))
+    root = normalize_url(args.base_url.rstrip('/') + '/')
+    metrics = graph.metrics(root)
+    to_csv(metrics, 'glowheal_link_graph.csv')
+    if args.save:
+        save_metrics(metrics, args.save)
+
+    depths = np.array([m.depth for m in metrics.values()])
+    print("=" * 80)
+    print("GLOWHEAL.IN - INTERNAL LINK GRAPH")
+    print("=" * 80)
+    print(f"Pages: {len(graph)} | Internal links: {graph.adjacency.nnz:,}")
+    for depth in range(int(depths.max(initial=0)) + 1):
+        print(f"  depth {depth}: {(depths == depth).sum():>6} pages")
+    print(f"  unreachable: {(depths < 0).sum():>4} pages")
+
+    print("\nHighest internal PageRank:")
+    for url, m in sorted(metrics.items(), key=lambda kv: -kv[1].pagerank)[:args.top]:
+        print(f"  {m.pagerank:.4f}  depth {m.depth:>2}  in {m.inbound:>4}  {url}")
+
+    orphans = graph.orphans(root)
+    dead_ends = graph.dead_ends()
+    print(f"\nOrphan pages (no internal links in): {len(orphans)}")
+    for url in orphans[:args.top]:
+        print(f"  {url}")
+    print(f"\nDead-end pages (no internal links out): {len(dead_ends)}")
+    for url in dead_ends[:args.top]:
+        print(f"  {url}")
+
+    if args.diff:
+        print("\n" + "=" * 80)
+        print(f"CHANGES SINCE {args.diff}")
+        print("=" * 80)
+        for change, page, a, b in diff_metrics(load_metrics(args.diff), metrics):
+            print(f"{change:<13} {page:<50} {a} -> {b}")
+
+    print("\n✓ Full graph exported to: glowheal_link_graph.csv")
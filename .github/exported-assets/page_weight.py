@@ -0,0 +1,262 @@
+# Page-weight and resource waterfall analyzer for Glowheal.in
+#
+# Measures the "Page load time may exceed 2.5 seconds" item from
+# glowheal_bugs_and_issues.csv: every crawled page's scripts, stylesheets,
+# fonts, images and preloads are fetched concurrently (each unique URL once
+# across the site) and reported as transferred vs. decoded bytes per type.
+
+import asyncio
+import csv
+import re
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+
+from crawler import BASE_URL, HEADERS, TIMEOUT, iter_pages, normalize_url
+from html_extract import extract_page
+
+try:
+    import brotli
+except ImportError:  # only needed to decode br responses
+    brotli = None
+
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+KINDS = ('document', 'script', 'stylesheet', 'font', 'image', 'other')
+FONT_EXTENSIONS = ('.woff2', '.woff', '.ttf', '.otf', '.eot')
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico')
+CSS_URL = re.compile(r'url\(\s*[\'"]?([^\'")]+?)[\'"]?\s*\)')
+TOP_N = 5
+
+
+@dataclass
+class Resource:
+    url: str
+    kind: str
+    status: int = 0
+    transferred: int = 0     # bytes on the wire (compressed body)
+    decoded: int = 0         # bytes after content-encoding is removed
+    content_type: str = ''
+    encoding: str = ''
+    elapsed_ms: float = 0.0
+
+
+def decode_body(body, encoding):
+    """body with its Content-Encoding undone (unchanged if we can't)."""
+    encoding = (encoding or '').lower()
+    try:
+        if encoding in ('gzip', 'x-gzip'):
+            return zlib.decompress(body, 16 + zlib.MAX_WBITS)
+        if encoding == 'deflate':
+            try:
+                return zlib.decompress(body)
+            except zlib.error:
+                return zlib.decompress(body, -zlib.MAX_WBITS)
+        if encoding == 'br' and brotli is not None:
+            return brotli.decompress(body)
+    except (zlib.error, OSError, ValueError):
+        pass
+    return body
+
+
+def kind_for(url, hint=None, content_type=''):
+    path = urlsplit(url).path.lower()
+    if path.endswith(FONT_EXTENSIONS) or 'font' in content_type:
+        return 'font'
+    if hint and hint != 'other':
+        return hint
+    if path.endswith('.js') or 'javascript' in content_type:
+        return 'script'
+    if path.endswith('.css') or 'text/css' in content_type:
+        return 'stylesheet'
+    if path.endswith(IMAGE_EXTENSIONS) or content_type.startswith('image/'):
+        return 'image'
+    return 'other'
+
+
+def css_references(css_text, base_url):
+    """Absolute URLs referenced by url(...) in a stylesheet (fonts, images)."""
+    urls = []
+    for ref in CSS_URL.findall(css_text):
+        if ref.startswith('data:'):
+            continue
+        urls.append(urljoin(base_url, ref))
+    return urls
+
+
+@dataclass
+class PageWeight:
+    url: str
+    resources: list = field(default_factory=list)
+
+    def by_kind(self):
+        """{kind: [requests, transferred, decoded]}"""
+        totals = {kind: [0, 0, 0] for kind in KINDS}
+        for r in self.resources:
+            row = totals[r.kind]
+            row[0] += 1
+            row[1] += r.transferred
+            row[2] += r.decoded
+        return totals
+
+    @property
+    def transferred(self):
+        return sum(r.transferred for r in self.resources)
+
+    @property
+    def decoded(self):
+        return sum(r.decoded for r in self.resources)
+
+    def largest(self, n=TOP_N):
+        return sorted(self.resources, key=lambda r: r.transferred, reverse=True)[:n]
+
+
+@dataclass
+class SiteWeight:
+    pages: list                  # PageWeight per crawled page
+    assets: dict                 # url -> Resource (each fetched once)
+    references: dict             # url -> set of page urls using it
+
+    def shared_assets(self, n=None):
+        """(resource, page count, site-wide bytes) by total bytes shipped."""
+        rows = [(r, len(self.references[url]), r.transferred * len(self.references[url]))
+                for url, r in self.assets.items()]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:n] if n else rows
+
+    def totals_by_kind(self):
+        totals = {kind: [0, 0, 0] for kind in KINDS}
+        for page in self.pages:
+            for kind, (count, transferred, decoded) in page.by_kind().items():
+                totals[kind][0] += count
+                totals[kind][1] += transferred
+                totals[kind][2] += decoded
+        return totals
+
+    def to_csv(self, pages_path, assets_path):
+        with open(pages_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Page', 'Type', 'Requests', 'Transferred (B)', 'Decoded (B)'])
+            for page in self.pages:
+                for kind, (count, transferred, decoded) in page.by_kind().items():
+                    if count:
+                        writer.writerow([page.url, kind, count, transferred, decoded])
+        with open(assets_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Asset', 'Type', 'Status', 'Transferred (B)', 'Decoded (B)',
+                             'Pages', 'Site-wide Transferred (B)'])
+            for r, pages, total in self.shared_assets():
+                writer.writerow([r.url, r.kind, r.status, r.transferred, r.decoded, pages, total])
+
+
+class WeightAnalyzer:
+    def __init__(self, concurrency=16, per_host=6, timeout=TIMEOUT, headers=None):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.headers = dict(headers or HEADERS, **{'Accept-Encoding': ACCEPT_ENCODING})
+        self._fetches = {}   # url -> Task, so shared assets are fetched once
+
+    async def _fetch(self, session, url, kind):
+        start = time.perf_counter()
+        try:
+            async with session.get(url, allow_redirects=True) as resp:
+                raw = await resp.read()
+                content_type = resp.headers.get('Content-Type', '').lower()
+                encoding = resp.headers.get('Content-Encoding', '')
+                body = decode_body(raw, encoding)
+                return Resource(
+                    url=url,
+                    kind=kind_for(url, kind, content_type),
+                    status=resp.status,
+                    transferred=len(raw),
+                    decoded=len(body),
+                    content_type=content_type,
+                    encoding=encoding,
+                    elapsed_ms=(time.perf_counter() - start) * 1000,
+                ), body
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return Resource(url=url, kind=kind_for(url, kind)), b''
+
+    def fetch(self, session, url, kind):
+        if url not in self._fetches:
+            self._fetches[url] = asyncio.ensure_future(self._fetch(session, url, kind))
+        return self._fetches[url]
+
+    async def _page(self, session, page):
+        document = Resource(
+            url=page.url, kind='document', status=page.status,
+            # aiohttp already inflated the body; Content-Length is the wire size
+            transferred=int(page.headers.get('content-length') or len(page.body)),
+            decoded=len(page.body),
+            content_type=page.headers.get('content-type', ''),
+            encoding=page.headers.get('content-encoding', ''),
+        )
+        wanted = {}
+        for kind, href in extract_page(page).resources:
+            wanted.setdefault(normalize_url(urljoin(page.url, href)), kind)
+        fetched = await asyncio.gather(*(self.fetch(session, u, k) for u, k in wanted.items()))
+
+        # Stylesheets pull in fonts and background images of their own
+        nested = {}
+        for resource, body in fetched:
+            if resource.kind == 'stylesheet' and body:
+                for ref in css_references(body.decode('utf-8', errors='replace'), resource.url):
+                    ref = normalize_url(ref)
+                    if ref not in wanted:
+                        nested.setdefault(ref, kind_for(ref))
+        fetched += await asyncio.gather(*(self.fetch(session, u, k) for u, k in nested.items()))
+        return PageWeight(page.url, [document] + [r for r, _ in fetched])
+
+    async def analyze_async(self, pages):
+        self._fetches = {}
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host)
+        async with aiohttp.ClientSession(
+                connector=connector, headers=self.headers, auto_decompress=False,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            html_pages = [p for p in pages
+                          if p.status == 200 and 'text/html' in p.headers.get('content-type', '')]
+            weights = await asyncio.gather(*(self._page(session, p) for p in html_pages))
+
+        assets = {}
+        references = defaultdict(set)
+        for weight in weights:
+            for r in weight.resources[1:]:
+                assets[r.url] = r
+                references[r.url].add(weight.url)
+        return SiteWeight(list(weights), assets, references)
+
+    def analyze(self, pages):
+        return asyncio.run(self.analyze_async(pages))
+
+
+if __name__ == '__main__':
+    pages = list(iter_pages(BASE_URL))
+    site = WeightAnalyzer().analyze(pages)
+    site.to_csv('glowheal_page_weight.csv', 'glowheal_shared_assets.csv')
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - PAGE WEIGHT BY RESOURCE TYPE (site total)")
+    print("=" * 80)
+    for kind, (count, transferred, decoded) in site.totals_by_kind().items():
+        print(f"{kind:<12} {count:>6} requests {transferred:>12,} B transferred {decoded:>12,} B decoded")
+
+    print("\n" + "=" * 80)
+    print("HEAVIEST PAGES")
+    print("=" * 80)
+    for page in sorted(site.pages, key=lambda p: p.transferred, reverse=True)[:10]:
+        print(f"\n{page.url}  {page.transferred:,} B transferred / {page.decoded:,} B decoded")
+        for r in page.largest():
+            print(f"   {r.kind:<10} {r.transferred:>10,} B  {r.url}")
+
+    print("\n" + "=" * 80)
+    print("SHARED ASSETS COSTING THE MOST BYTES ACROSS THE SITE")
+    print("=" * 80)
+    for r, count, total in site.shared_assets(10):
+        print(f"{total:>12,} B  ({count} pages x {r.transferred:,} B)  {r.url}")
+
+    print("\n✓ Files created: glowheal_page_weight.csv")
+    print("✓ Files created: glowheal_shared_assets.csv")
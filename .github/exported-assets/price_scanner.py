@@ -0,0 +1,293 @@
+# Price-consistency scanner for crawled pages
+#
+# Three places say what a service should cost: the catalog JSON that
+# scripts/validate-catalog.js checks, the "New Price" column of
+# PRICING_CHANGES_NOV_2024.md, and script_2.py's recommended pricing. Pages
+# such as /pricing or the landing offer can drift from all of them. Every
+# service name goes into one Aho-Corasick automaton together with the ₹
+# marker, so each page's text is scanned once, left to right, whatever the
+# number of services. Each ₹ amount is attributed to the nearest service
+# name before it, and a service whose shown prices include none of its
+# expected ones is reported.
+#
+#   python price_scanner.py                  # crawl the site
+#   python price_scanner.py --html out/*.html
+
+import argparse
+import csv
+import glob
+import json
+import os
+import re
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from html import unescape
+
+REPO_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+CHANGES_MD = os.path.join(REPO_ROOT, 'PRICING_CHANGES_NOV_2024.md')
+CATALOG_DIR = os.path.join(REPO_ROOT, 'apps', 'web', 'src', 'data', 'catalog')
+WINDOW = 160                   # chars after a service name in which a price belongs to it
+SOURCE_RANK = {'catalog': 0, 'pricing-changes': 1, 'pricing-strategy': 2}
+
+SKIPPED = re.compile(r'<(script|style|template|noscript)\b[^>]*>.*?</\1\s*>|<!--.*?-->', re.S | re.I)
+TAG = re.compile(r'<[^>]+>')
+CURRENCY = re.compile(r'(?:\brs\.?|\binr)\s*(?=\d)|₹\s+', re.I)
+AMOUNT = re.compile(r'\d[\d,]*')
+TABLE_ROW = re.compile(r'^\|\s*([^|]+?)\s*\|\s*₹([\d,]+)\s*\|\s*₹([\d,]+)\s*\|', re.M)
+HEADING = re.compile(r'^#{2,4}\s+(.+?)\s*$', re.M)
+MARKER = '₹'
+
+
+def normalize_name(name):
+    return ' '.join(name.lower().split())
+
+
+def page_text(html):
+    """Visible text, lowercased, whitespace collapsed, 'Rs. 599' / '₹ 599' written '₹599'."""
+    text = unescape(TAG.sub(' ', SKIPPED.sub(' ', html)))
+    return CURRENCY.sub(MARKER, ' '.join(text.lower().split()))
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: one pass over the text reports every pattern occurrence."""
+
+    def __init__(self, patterns):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for pattern in patterns:
+            state = 0
+            for ch in pattern:
+                nxt = self.goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(pattern)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter(self, text):
+        """(end index exclusive, pattern) for every match, in order of end position."""
+        goto, fail, out = self.goto, self.fail, self.out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for pattern in out[state]:
+                    yield i + 1, pattern
+
+
+@dataclass
+class Expected:
+    name: str
+    source: str
+    ranges: list = field(default_factory=list)   # [(low, high)] ₹
+    stale: set = field(default_factory=set)      # superseded prices
+
+    def accepts(self, amount):
+        return any(low <= amount <= high for low, high in self.ranges)
+
+
+def _amount(text):
+    return int(text.replace(',', ''))
+
+
+def from_changes_md(path=CHANGES_MD):
+    """[(name, new price, old price, section)] from the '| Service | Old | New |' tables."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    headings = [(m.start(), m.group(1)) for m in HEADING.finditer(text)]
+    rows = []
+    for m in TABLE_ROW.finditer(text):
+        section = next((h for pos, h in reversed(headings) if pos < m.start()), '')
+        rows.append((m.group(1), _amount(m.group(3)), _amount(m.group(2)), section))
+    return rows
+
+
+def from_catalog(catalog_dir=CATALOG_DIR):
+    """[(name, price)] from apps/web/src/data/catalog/*.json (the files validate-catalog.js checks)."""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(catalog_dir, '*.json'))):
+        if os.path.basename(path).startswith('addons'):
+            continue
+        with open(path, encoding='utf-8') as f:
+            catalog = json.load(f)
+        first = (catalog.get('teleconsult') or {}).get('first_consult')
+        if first is not None:
+            rows.append(('First Consultation', first))
+        for specialty in catalog.get('specialties', []):
+            for item in specialty.get('items', []):
+                if item.get('name') and item.get('price') is not None:
+                    rows.append((item['name'], item['price']))
+    return rows
+
+
+def expected_prices(pricing_data=None, changes_path=CHANGES_MD, catalog_dir=CATALOG_DIR):
+    """{normalized name: Expected}; for a name in several sources the highest-ranked source wins."""
+    from pricing_sim import parse_price_range
+    candidates = []
+    for name, price in from_catalog(catalog_dir):
+        candidates.append((name, 'catalog', (price, price), None))
+    for name, new, old, _ in from_changes_md(changes_path):
+        # Names like '4-Session Package' repeat across sections; each section's price is valid
+        candidates.append((name, 'pricing-changes', (new, new), old))
+    if pricing_data:
+        for name, shown in zip(pricing_data['Service'], pricing_data['Recommended Pricing (₹)']):
+            candidates.append((name, 'pricing-strategy', parse_price_range(shown), None))
+    expected = {}
+    for name, source, price_range, old in candidates:
+        key = normalize_name(name)
+        current = expected.get(key)
+        if current is None or SOURCE_RANK[source] < SOURCE_RANK[current.source]:
+            current = expected[key] = Expected(name, source)
+        if current.source != source:
+            continue
+        current.ranges.append(price_range)
+        if old is not None and old != price_range[0]:
+            current.stale.add(old)
+    for item in expected.values():
+        item.stale = {p for p in item.stale if not item.accepts(p)}
+    return expected
+
+
+@dataclass
+class Finding:
+    url: str
+    service: str
+    shown: list            # amounts attributed to the service at this spot
+    expected: str
+    source: str
+    status: str            # 'stale' (an old price) or 'mismatch'
+    context: str
+
+
+class PriceScanner:
+    def __init__(self, expected, window=WINDOW):
+        self.expected = expected
+        self.window = window
+        self.automaton = AhoCorasick(list(expected) + [MARKER])
+
+    def _mentions(self, text):
+        """[(start, end, name)] for whole-word service names and [(pos, amount)] for ₹ amounts."""
+        names, prices = [], []
+        for end, pattern in self.automaton.iter(text):
+            if pattern == MARKER:
+                match = AMOUNT.match(text, end)
+                if match:
+                    prices.append((end - 1, _amount(match.group().rstrip(','))))
+                continue
+            start = end - len(pattern)
+            if (start and text[start - 1].isalnum()) or (end < len(text) and text[end].isalnum()):
+                continue
+            names.append((start, end, pattern))
+        # Keep the longest name where matches overlap ('specialist (video)' over 'specialist')
+        names.sort(key=lambda n: (n[0], -(n[1] - n[0])))
+        kept, last_end = [], -1
+        for start, end, name in names:
+            if start >= last_end:
+                kept.append((start, end, name))
+                last_end = end
+        return kept, prices
+
+    def scan(self, url, text):
+        names, prices = self._mentions(text)
+        findings = []
+        p = 0
+        for i, (start, end, name) in enumerate(names):
+            limit = min(end + self.window, names[i + 1][0] if i + 1 < len(names) else len(text))
+            while p < len(prices) and prices[p][0] < end:
+                p += 1
+            shown = []
+            q = p
+            while q < len(prices) and prices[q][0] < limit:
+                shown.append(prices[q][1])
+                q += 1
+            expected = self.expected[name]
+            if not shown or any(expected.accepts(a) for a in shown):
+                continue
+            status = 'stale' if any(a in expected.stale for a in shown) else 'mismatch'
+            findings.append(Finding(url, expected.name, shown, describe(expected), expected.source, status,
+                                    text[max(0, start - 20):limit][:200]))
+        return findings
+
+
+def describe(expected):
+    return ' or '.join(f'₹{low:,.0f}' if low == high else f'₹{low:,.0f}-{high:,.0f}'
+                       for low, high in expected.ranges)
+
+
+def to_csv(findings, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['URL', 'Service', 'Shown', 'Expected', 'Source of Truth', 'Status', 'Context'])
+        for x in findings:
+            writer.writerow([x.url, x.service, ' '.join(f'₹{a:,}' for a in x.shown), x.expected, x.source,
+                             x.status, x.context])
+
+
+def html_pages(paths):
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            yield path, f.read()
+
+
+def crawled_pages(base_url):
+    from crawler import iter_pages, is_html
+    for page in iter_pages(base_url):
+        if page.status == 200 and is_html(page):
+            yield page.url, page.body.decode('utf-8', errors='replace')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Report pages whose prices disagree with the source of truth.')
+    parser.add_argument('--html', nargs='+', help='saved HTML files instead of crawling')
+    parser.add_argument('--base-url')
+    parser.add_argument('--window', type=int, default=WINDOW)
+    args = parser.parse_args()
+
+    from script_2 import pricing_data
+
+    expected = expected_prices(pricing_data)
+    scanner = PriceScanner(expected, args.window)
+    if args.html:
+        pages = html_pages(sorted({p for pattern in args.html for p in glob.glob(pattern)}))
+    else:
+        from crawler import BASE_URL
+        pages = crawled_pages(args.base_url or BASE_URL)
+    findings, scanned = [], 0
+    for url, html in pages:
+        findings.extend(scanner.scan(url, page_text(html)))
+        scanned += 1
+    to_csv(findings, 'glowheal_price_mismatches.csv')
+
+    by_source = defaultdict(int)
+    for item in expected.values():
+        by_source[item.source] += 1
+    print("=" * 80)
+    print("GLOWHEAL.IN - PRICE CONSISTENCY")
+    print("=" * 80)
+    print(f"Expected prices: {len(expected)} services ("
+          + ', '.join(f'{source} {n}' for source, n in sorted(by_source.items())) + ")")
+    print(f"Pages scanned: {scanned} | findings: {len(findings)}\n")
+    for x in findings[:30]:
+        shown = ', '.join(f'₹{a:,}' for a in x.shown)
+        print(f"  [{x.status:<8}] {x.service:<28} shows {shown:<18} expected {x.expected:<16} {x.url}")
+    if len(findings) > 30:
+        print(f"  ... {len(findings) - 30} more")
+    print("\n✓ Findings exported to: glowheal_price_mismatches.csv")
@@ -0,0 +1,307 @@
+# Price-point revenue simulator for the pricing strategy table
+#
+# script_2.py's pricing_data keeps prices as display strings ('1,999-2,499',
+# 'FREE (₹0)'). They are parsed into ranges, a grid of candidate prices is
+# laid out per service, and a NumPy Monte Carlo projects monthly volume,
+# revenue, patient acquisition and consult subsidy at every grid point:
+#
+#   volume(p) = leads/month x take rate x exp(elasticity x (p - p_ref) / p_ref)
+#
+# p_ref is the market-average midpoint, so the point elasticity there is the
+# assumed one, and the curve stays finite at ₹0. Monthly lead volume comes
+# from the data/leads lead log (Gamma posterior of a Poisson rate), the
+# bookings under data/leads/YYYY/MM rescale the take rates through a Beta
+# posterior of bookings per lead, and elasticity is drawn per service; the
+# whole services x prices x draws array is one pass.
+#
+# A best price on the grid's top edge is not a maximum, so those services
+# get a wider grid (up to MAX_WIDEN times) and are printed as '≥' if still
+# there. A free first consult only pays through the patients it acquires:
+# without --patient-value the report shows the subsidy per acquired patient
+# at the recommended price and the patient value at which it would win.
+#
+#   python pricing_sim.py --draws 100000 --points 25 --patient-value 1500
+
+import argparse
+import csv
+import os
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+
+PRICE_NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+DRAWS = 100_000
+GRID_POINTS = 21
+DEFAULT_MONTHLY_LEADS = 150      # used when data/leads has no history
+DEFAULT_LEADS_CV = 0.3
+ASSUMED_BOOKING_RATE = 0.60      # bookings per lead the take rates below were set for
+GRID_TOP = 1.5                   # grid spans ₹0 .. GRID_TOP x the higher of market/recommended high
+MAX_WIDEN = 3                    # times an edge service's grid top is doubled
+
+# Per service: (share of leads that buy it at p_ref, elasticity mean, elasticity sd,
+#               delivery cost per unit in ₹, share of buyers who are new patients)
+ASSUMPTIONS = {
+    'First Consultation': (0.60, -1.5, 0.4, 150, 1.0),
+    'General Physician (In-person)': (0.20, -1.4, 0.3, 120, 0.3),
+    'General Physician (Video)': (0.15, -1.8, 0.4, 80, 0.4),
+    'Specialist Consultation': (0.12, -1.1, 0.3, 250, 0.3),
+    'Specialist (Video)': (0.08, -1.4, 0.3, 180, 0.3),
+    'Basic Health Checkup': (0.05, -1.2, 0.3, 600, 0.2),
+    'Comprehensive Checkup': (0.03, -1.0, 0.3, 1500, 0.2),
+    'Premium Full Body Checkup': (0.01, -0.8, 0.3, 3000, 0.2),
+    'Diagnostic Test (Avg)': (0.10, -0.7, 0.2, 180, 0.1),
+    'Follow-up Consultation': (0.25, -0.6, 0.2, 60, 0.0),
+}
+FALLBACK_ASSUMPTION = (0.05, -1.2, 0.4, 0, 0.2)
+
+
+def parse_price_range(text):
+    """'1,999-2,499' -> (1999.0, 2499.0); 'FREE (₹0)' -> (0.0, 0.0); '₹399' -> (399.0, 399.0)."""
+    text = str(text or '')
+    numbers = [float(n.replace(',', '')) for n in PRICE_NUMBER.findall(text)]
+    if not numbers:
+        if 'free' in text.lower():
+            return 0.0, 0.0
+        raise ValueError(f'no price in {text!r}')
+    return min(numbers), max(numbers)
+
+
+@dataclass
+class Service:
+    name: str
+    market: tuple              # (low, high) ₹
+    recommended: tuple
+    take_rate: float
+    elasticity: float
+    elasticity_sd: float
+    unit_cost: float
+    new_patient_share: float
+
+    @property
+    def reference_price(self):
+        return sum(self.market) / 2
+
+
+def services_from_pricing(pricing_data, assumptions=ASSUMPTIONS):
+    return [Service(name, parse_price_range(market), parse_price_range(recommended),
+                    *assumptions.get(name, FALLBACK_ASSUMPTION))
+            for name, market, recommended in zip(pricing_data['Service'],
+                                                 pricing_data['Market Average (₹)'],
+                                                 pricing_data['Recommended Pricing (₹)'])]
+
+
+def price_grid(services, points=GRID_POINTS, top=GRID_TOP):
+    """(services, points) candidate prices from ₹0 to top x the market high, rounded to ₹...9.
+
+    top may be a per-service sequence.
+    """
+    tops = np.broadcast_to(np.asarray(top, dtype=np.float64), (len(services),))
+    rows = []
+    for service, factor in zip(services, tops):
+        top = max(service.market[1], service.recommended[1]) * factor
+        grid = np.linspace(0, top, points)
+        grid = np.where(grid >= 10, np.round(grid / 10) * 10 - 1, grid)
+        rows.append(np.maximum(grid, 0))
+    return np.array(rows)
+
+
+def lead_history(leads_dir=None):
+    """(leads, bookings, months covered) from data/leads, or (0, 0, 0).
+
+    Leads come from the lead log and bookings from the YYYY/MM tree; months
+    are the ones with any lead.
+    """
+    from leads_data import LEADS_DIR, iter_records, parse_timestamp
+    leads_dir = leads_dir or LEADS_DIR
+    if not os.path.isdir(leads_dir):
+        return 0, 0, 0
+    months, bookings = Counter(), 0
+    for record in iter_records(leads_dir):
+        if record['kind'] == 'booking':
+            bookings += 1
+            continue
+        ts = parse_timestamp(record.get('timestamp'))
+        if ts:
+            months[(ts.year, ts.month)] += 1
+    return sum(months.values()), bookings, len(months)
+
+
+def lead_volume_draws(rng, draws, total=0, months=0):
+    """Monthly lead volume draws: Gamma posterior given history, else the default +/- CV."""
+    if months:
+        return rng.gamma(total + 0.5, 1 / months, size=draws)
+    shape = 1 / DEFAULT_LEADS_CV ** 2
+    return rng.gamma(shape, DEFAULT_MONTHLY_LEADS / shape, size=draws)
+
+
+def booking_scale_draws(rng, draws, leads=0, bookings=0):
+    """Take-rate multiplier: Beta posterior of bookings per lead over ASSUMED_BOOKING_RATE.
+
+    Ones without history; a lead can book more than once, so the rate is capped at 1.
+    """
+    if not leads:
+        return np.ones(draws)
+    booked = min(bookings, leads)
+    return rng.beta(booked + 0.5, leads - booked + 0.5, size=draws) / ASSUMED_BOOKING_RATE
+
+
+def simulate(services, grid, leads, draws=DRAWS, patient_value=0.0, seed=0, dtype=np.float32):
+    """{metric: (services, points) array} of means and p5/p95 ('<metric>_p5') over draws.
+
+    leads is a (draws,) array of monthly lead volume, already multiplied by
+    booking_scale_draws when there is booking history; volume is computed as
+    one services x points x draws array. The same seed gives the same
+    elasticity draws for any grid, so separate grids compare draw for draw.
+    """
+    rng = np.random.default_rng(seed)
+    ref = np.array([s.reference_price for s in services], dtype=dtype)[:, None, None]
+    take = np.array([s.take_rate for s in services], dtype=dtype)[:, None, None]
+    cost = np.array([s.unit_cost for s in services], dtype=dtype)[:, None, None]
+    new_share = np.array([s.new_patient_share for s in services], dtype=dtype)[:, None, None]
+    eps = rng.normal([s.elasticity for s in services], [s.elasticity_sd for s in services],
+                     size=(draws, len(services))).T.astype(dtype)[:, None, :]
+    eps = np.minimum(eps, 0)          # demand never rises with price
+    price = grid.astype(dtype)[:, :, None]
+
+    volume = (take * leads.astype(dtype)[None, None, :]) * np.exp(eps * ((price - ref) / ref))
+    mean = volume.mean(axis=2)
+    p5, p95 = np.percentile(volume, [5, 95], axis=2)
+    del volume
+
+    # Every metric is volume times a per-cell constant, so its mean and
+    # percentiles follow from volume's (a negative factor swaps p5 and p95).
+    price, cost, new_share = price[:, :, 0], cost[:, :, 0], new_share[:, :, 0]
+    factors = {
+        'volume': np.ones_like(price),
+        'revenue': price,
+        'patients': np.broadcast_to(new_share, price.shape),
+        'subsidy': np.maximum(cost - price, 0),
+        'profit': price - cost + patient_value * new_share,
+    }
+    out = {}
+    for name, factor in factors.items():
+        out[name] = mean * factor
+        low, high = p5 * factor, p95 * factor
+        out[name + '_p5'], out[name + '_p95'] = np.minimum(low, high), np.maximum(low, high)
+    return out
+
+
+def best_prices(services, grid, results, objective='profit'):
+    """{service: (price, column index)} maximizing the mean of the objective."""
+    best = results[objective].argmax(axis=1)
+    return {s.name: (grid[i, j], j) for i, (s, j) in enumerate(zip(services, best))}
+
+
+def simulate_widening(services, leads, draws=DRAWS, patient_value=0.0, points=GRID_POINTS,
+                      objective='profit', max_widen=MAX_WIDEN):
+    """(grid, results, at_edge): grids of services whose best price is the top point are
+    doubled until it no longer is, at most max_widen times; at_edge marks those still there."""
+    tops = np.full(len(services), GRID_TOP)
+    for attempt in range(max_widen + 1):
+        grid = price_grid(services, points, tops)
+        results = simulate(services, grid, leads, draws, patient_value)
+        at_edge = results[objective].argmax(axis=1) == points - 1
+        if not at_edge.any() or attempt == max_widen:
+            return grid, results, at_edge
+        tops[at_edge] *= 2
+
+
+def acquisition_economics(services, leads, draws=DRAWS, patient_value=0.0, grid=None, results=None):
+    """{service: (subsidy per new patient, break-even patient value)} at the recommended price.
+
+    Subsidy per new patient is the delivery cost not covered by the price,
+    per patient acquired. The break-even value is what one new patient must
+    be worth for the recommended price to beat every grid price on profit
+    (inf if no value makes it win). Only loss leaders, services bringing
+    in new patients at a recommended price below their unit cost, are listed.
+    """
+    recommended = np.array([[sum(s.recommended) / 2] for s in services])
+    at = simulate(services, recommended, leads, draws, patient_value)
+    out = {}
+    for i, s in enumerate(services):
+        if not s.new_patient_share or recommended[i, 0] >= s.unit_cost:
+            continue
+        patients = at['patients'][i, 0]
+        subsidy = at['subsidy'][i, 0] / patients if patients else 0.0
+        # Recommended wins once gain + more * extra >= 0 at every grid price
+        gain = at['profit'][i, 0] - results['profit'][i]
+        more = at['patients'][i, 0] - results['patients'][i]
+        extra = max([0.0] + [-g / m for g, m in zip(gain, more) if m > 0])
+        blocked = any(g + m * extra < -1e-6 * abs(g) for g, m in zip(gain, more) if m <= 0)
+        out[s.name] = (float(subsidy), np.inf if blocked else patient_value + extra)
+    return out
+
+
+def to_csv(services, grid, results, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Service', 'Price (₹)', 'Volume/month', 'Revenue/month (₹)', 'Revenue p5',
+                         'Revenue p95', 'New Patients/month', 'Consult Subsidy (₹)', 'Profit/month (₹)',
+                         'Profit p5', 'Profit p95'])
+        for i, service in enumerate(services):
+            for j, price in enumerate(grid[i]):
+                writer.writerow([service.name, f'{price:.0f}'] + [
+                    f'{results[k][i, j]:.1f}' for k in ('volume', 'revenue', 'revenue_p5', 'revenue_p95',
+                                                         'patients', 'subsidy', 'profit', 'profit_p5',
+                                                         'profit_p95')])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Monte Carlo revenue projection over candidate price points.')
+    parser.add_argument('--draws', type=int, default=DRAWS)
+    parser.add_argument('--points', type=int, default=GRID_POINTS, help='candidate prices per service')
+    parser.add_argument('--patient-value', type=float, default=0.0,
+                        help='₹ value of one new patient (lifetime), added to the objective; without it '
+                             'the break-even value per service is reported instead')
+    parser.add_argument('--leads-dir', help='data/leads directory (default: the repo)')
+    parser.add_argument('--monthly-leads', type=float,
+                        help='override history with this monthly lead volume')
+    args = parser.parse_args()
+
+    from script_2 import pricing_data
+
+    services = services_from_pricing(pricing_data)
+    rng = np.random.default_rng(1)
+    total, bookings, months = lead_history(args.leads_dir)
+    if args.monthly_leads:
+        source = 'given'
+        leads = lead_volume_draws(rng, args.draws, args.monthly_leads, 1)
+    else:
+        source = f'{total:,} leads over {months} month(s)' if months else 'no history, default assumption'
+        leads = lead_volume_draws(rng, args.draws, total, months)
+    scale = booking_scale_draws(rng, args.draws, total, bookings)
+    booking_source = (f'{bookings:,} bookings / {total:,} leads' if total
+                      else f'no history, assumed {ASSUMED_BOOKING_RATE:.0%}')
+
+    start = time.perf_counter()
+    grid, results, at_edge = simulate_widening(services, leads * scale, args.draws, args.patient_value,
+                                               args.points)
+    economics = acquisition_economics(services, leads * scale, args.draws, args.patient_value, grid, results)
+    elapsed = time.perf_counter() - start
+    to_csv(services, grid, results, 'glowheal_price_simulation.csv')
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - PRICE POINT SIMULATION")
+    print("=" * 80)
+    print(f"Leads/month: mean {leads.mean():.0f} ({source}) | bookings per lead: "
+          f"{ASSUMED_BOOKING_RATE * scale.mean():.0%} ({booking_source})")
+    print(f"{len(services)} services x {args.points} prices x {args.draws:,} draws in {elapsed:.2f}s | "
+          f"patient value ₹{args.patient_value:,.0f}\n")
+    for i, (name, (price, j)) in enumerate(best_prices(services, grid, results).items()):
+        low, high = services[i].recommended
+        edge = '≥' if at_edge[i] else ' '
+        print(f"  {name:<30} best {edge}₹{price:>7,.0f}  (recommended ₹{low:,.0f}-{high:,.0f})  "
+              f"profit ₹{results['profit'][i, j]:>10,.0f}/mo "
+              f"[{results['profit_p5'][i, j]:,.0f} .. {results['profit_p95'][i, j]:,.0f}]")
+        if name in economics:
+            subsidy, break_even = economics[name]
+            verdict = ('no patient value makes it win' if not np.isfinite(break_even) else
+                       'already the better choice' if break_even <= args.patient_value else
+                       f'wins if a new patient is worth ≥ ₹{break_even:,.0f}')
+            print(f"  {'':<30} at recommended: subsidy ₹{subsidy:,.0f} per new patient; {verdict}")
+    if at_edge.any():
+        print(f"\n  ≥ best price still on the grid's top edge after widening it {MAX_WIDEN} times")
+    print("\n✓ Grid exported to: glowheal_price_simulation.csv")
@@ -0,0 +1,234 @@
+# One typed, indexed model for every recommendation in the report scripts
+#
+# script_1.py keeps its advice as free-text strings in the nested
+# analysis_data dict, script_3.py has checklist_items tuples and script_4.py
+# has issues_list tuples, each with its own columns. All three are loaded
+# into Recommendation records (slotted, with interned category/priority/
+# effort strings) and indexed by category, priority, target metric and
+# source, so "all CRITICAL performance items" is a set intersection rather
+# than a walk over the tree.
+#
+#   python recommendations.py --priority CRITICAL --category performance
+
+import argparse
+import csv
+import re
+import sys
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+
+PRIORITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+# analysis_data section -> (category, priority). The most specific path wins;
+# priorities follow the checklist's rating of the same area.
+SECTIONS = {
+    'color_scheme_recommendations': ('Color & Design', 'CRITICAL'),
+    'pricing_strategy': ('Pricing', 'HIGH'),
+    'design_improvements': ('Conversion', 'HIGH'),
+    'design_improvements.hero_section': ('Conversion', 'CRITICAL'),
+    'design_improvements.navigation': ('Navigation', 'MEDIUM'),
+    'design_improvements.cta_buttons': ('CTAs', 'HIGH'),
+    'design_improvements.forms': ('Forms', 'HIGH'),
+    'conversion_rate_optimization.trust_signals': ('Trust Signals', 'HIGH'),
+    'conversion_rate_optimization.social_proof': ('Social Proof', 'MEDIUM'),
+    'conversion_rate_optimization.urgency_tactics': ('Conversion', 'LOW'),
+    'technical_optimization.page_speed': ('Performance', 'CRITICAL'),
+    'technical_optimization.mobile_optimization': ('Mobile', 'CRITICAL'),
+    'technical_optimization.accessibility_wcag': ('Accessibility', 'HIGH'),
+    'technical_optimization.security': ('Security', 'MEDIUM'),
+    'content_optimization': ('Content', 'MEDIUM'),
+    'content_optimization.homepage': ('Content', 'HIGH'),
+    'booking_flow_optimization': ('Forms', 'MEDIUM'),
+}
+
+# Background material in analysis_data, not actions
+REFERENCE_KEYS = {'research_findings', 'market_research_india', 'conversion_benchmarks'}
+
+# Target metric -> words that point at it (matched as whole words in title,
+# action and impact; each entry is a regex fragment, so 'forms?' takes the plural
+# and 'minif\w*' any suffix, but 'form' never matches inside 'performance')
+METRICS = {
+    'page_speed': (r'page speed', r'load(?:s|ing|ed)?', r'lcp', r'fcp', r'cls', r'tti', r'first input',
+                   r'cdn', r'compress\w*', r'minif\w*', r'caching', r'lazy'),
+    'conversion_rate': (r'conversions?', r'ctas?', r'book(?:s|ing|ings|ed)?', r'click-through', r'inquiries'),
+    'form_completion': (r'forms?', r'fields?'),
+    'acquisition': (r'acquisition', r'free first consultation', r'organic traffic'),
+    'trust': (r'trust\w*', r'reviews?', r'testimonials?', r'credentials?', r'badges?', r'ssl'),
+    'accessibility': (r'wcag', r'accessib\w*', r'alt text', r'screen readers?', r'keyboard', r'contrast'),
+    'mobile': (r'mobile', r'touch', r'48x48', r'click-to-call', r'click-to-dial'),
+    'seo': (r'seo', r'meta', r'schema', r'heading hierarchy', r'organic'),
+    'security': (r'https', r'hipaa', r'encrypt\w*', r'security', r'pci', r'privacy'),
+    'engagement': (r'engagement', r'bounce', r'chat\w*', r'faqs?'),
+}
+METRIC_PATTERNS = {metric: re.compile(r'\b(?:' + '|'.join(words) + r')\b')
+                   for metric, words in METRICS.items()}
+
+# Metric for items whose text names none: what the category is there to move
+CATEGORY_METRICS = {
+    'Performance': 'page_speed', 'Mobile': 'mobile', 'Accessibility': 'accessibility',
+    'Security': 'security', 'SEO': 'seo', 'Forms': 'form_completion', 'Trust Signals': 'trust',
+    'Social Proof': 'trust', 'Content': 'engagement', 'UX': 'engagement', 'Links': 'seo',
+    'Features': 'engagement', 'Analytics': 'conversion_rate', 'Testing': 'conversion_rate',
+}
+
+
+@dataclass(slots=True, frozen=True)
+class Recommendation:
+    id: int
+    source: str          # 'analysis', 'checklist' or 'bugs'
+    category: str
+    priority: str
+    title: str
+    action: str
+    effort: str = None
+    impact: str = None
+    issue: str = None
+    location: str = None
+    verify: str = None
+    metrics: tuple = ()
+
+
+def target_metrics(category, *texts):
+    """Metrics whose keywords appear in any of the texts, else the category's metric."""
+    text = ' '.join(t for t in texts if t).lower()
+    found = tuple(m for m, pattern in METRIC_PATTERNS.items() if pattern.search(text))
+    return found or (CATEGORY_METRICS.get(category, 'conversion_rate'),)
+
+
+def _section(path):
+    for depth in range(len(path), 0, -1):
+        key = '.'.join(path[:depth])
+        if key in SECTIONS:
+            return SECTIONS[key]
+    return None
+
+
+def _walk(node, path):
+    """(path, text) for every action string in analysis_data."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key not in REFERENCE_KEYS:
+                yield from _walk(value, path + (key,))
+    elif isinstance(node, list):
+        for text in node:
+            yield path, text
+
+
+def from_analysis(analysis_data):
+    rows = []
+    for path, text in _walk(analysis_data, ()):
+        category, priority = _section(path) or ('Content', 'MEDIUM')
+        if 'CRITICAL' in text or 'MANDATORY' in text:
+            priority = 'CRITICAL'
+        title = path[-1].replace('_', ' ').capitalize()
+        rows.append(dict(source='analysis', category=category, priority=priority, title=title,
+                         action=text, location='.'.join(path),
+                         metrics=target_metrics(category, text, title)))
+    return rows
+
+
+def from_checklist(checklist_items):
+    return [dict(source='checklist', category=category, priority=priority, title=item, issue=gap,
+                 action=action, impact=impact, effort=effort,
+                 metrics=target_metrics(category, item, action, impact))
+            for category, priority, item, gap, action, impact, effort in checklist_items]
+
+
+def from_issues(issues_list):
+    return [dict(source='bugs', category=kind, priority=severity, title=description, issue=description,
+                 action=fix, location=location, verify=test,
+                 metrics=target_metrics(kind, description, fix))
+            for kind, severity, location, description, fix, test in issues_list]
+
+
+class RecommendationIndex:
+    """Recommendations plus secondary indexes of ids by category, priority, metric and source."""
+
+    def __init__(self, rows=()):
+        self.items = []
+        self.by_category = defaultdict(set)
+        self.by_priority = defaultdict(set)
+        self.by_metric = defaultdict(set)
+        self.by_source = defaultdict(set)
+        for row in rows:
+            self.add(**row)
+
+    def add(self, **fields):
+        for name in ('source', 'category', 'priority', 'effort'):
+            if fields.get(name):
+                fields[name] = sys.intern(fields[name])
+        item = Recommendation(id=len(self.items), **fields)
+        self.items.append(item)
+        self.by_category[item.category.lower()].add(item.id)
+        self.by_priority[item.priority].add(item.id)
+        self.by_source[item.source].add(item.id)
+        for metric in item.metrics:
+            self.by_metric[metric].add(item.id)
+        return item
+
+    def __len__(self):
+        return len(self.items)
+
+    def query(self, category=None, priority=None, metric=None, source=None):
+        """Items matching every given field (each may be a value or a list of values), by priority."""
+        selected = None
+        for index, wanted, norm in ((self.by_category, category, str.lower),
+                                    (self.by_priority, priority, str.upper),
+                                    (self.by_metric, metric, str.lower),
+                                    (self.by_source, source, str.lower)):
+            if not wanted:
+                continue
+            wanted = [wanted] if isinstance(wanted, str) else wanted
+            ids = set().union(*(index.get(norm(w), ()) for w in wanted))
+            selected = ids if selected is None else selected & ids
+            if not selected:
+                return []
+        ids = range(len(self.items)) if selected is None else selected
+        return sorted((self.items[i] for i in ids), key=lambda r: (PRIORITIES.index(r.priority), r.id))
+
+    def counts(self, field_name):
+        return Counter(getattr(item, field_name) for item in self.items)
+
+
+def load():
+    """Index over script_1's analysis_data, script_3's checklist and script_4's issues."""
+    from script_1 import analysis_data
+    from script_3 import checklist_items
+    from script_4 import issues_list
+    return RecommendationIndex(from_analysis(analysis_data) + from_checklist(checklist_items)
+                               + from_issues(issues_list))
+
+
+def to_csv(items, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Source', 'Category', 'Priority', 'Title', 'Action', 'Effort', 'Expected Impact',
+                         'Target Metrics', 'Location'])
+        for r in items:
+            writer.writerow([r.source, r.category, r.priority, r.title, r.action, r.effort or '',
+                             r.impact or '', ' '.join(r.metrics), r.location or ''])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Query every recommendation across the report scripts.')
+    parser.add_argument('--category', action='append')
+    parser.add_argument('--priority', action='append', type=str.upper, choices=PRIORITIES)
+    parser.add_argument('--metric', action='append', choices=list(METRICS))
+    parser.add_argument('--source', action='append', choices=['analysis', 'checklist', 'bugs'])
+    args = parser.parse_args()
+
+    index = load()
+    items = index.query(args.category, args.priority, args.metric, args.source)
+    to_csv(items, 'glowheal_recommendations.csv')
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - RECOMMENDATIONS")
+    print("=" * 80)
+    totals = index.counts('priority')
+    print(f"Total: {len(index)} | " + ' | '.join(f"{p}: {totals[p]}" for p in PRIORITIES))
+    print(f"Matching: {len(items)}\n")
+    for r in items[:40]:
+        print(f"[{r.priority:<8}] {r.category:<15} {r.title[:40]:<40} {r.action.splitlines()[0][:60]}")
+    if len(items) > 40:
+        print(f"... {len(items) - 40} more")
+    print("\n✓ Exported to: glowheal_recommendations.csv")
@@ -0,0 +1,583 @@
+# Templated executive summary, rendered per city and landing page
+#
+# script_5.py's summary is one literal string with hand-typed numbers
+# ("Conversion rate: ~2-3%"). executive_summary.tmpl holds the same report
+# with {{ metrics.conversion_rate|pct }}-style fields and {% for %} / {% if %}
+# blocks, filled from the report scripts' data, glowheal_funnel.csv
+# (funnel.py) and the Lighthouse history (lighthouse_store.py).
+#
+# The template is compiled once into a Python generator function and the
+# code object is cached in .audit-cache/templates/, keyed by the template's
+# hash, so later runs skip parsing entirely. Renders fan out over a process
+# pool; each worker receives the shared context once and streams every
+# report to disk line by line as text, Markdown or HTML.
+#
+#   python report_renderer.py                              # every city x page, all formats
+#   python report_renderer.py --city pune --page / --page /pricing --format html
+
+import argparse
+import csv
+import hashlib
+import importlib.util
+import marshal
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from html import escape
+from itertools import chain
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'executive_summary.tmpl')
+CACHE_DIR = os.path.join('.audit-cache', 'templates')
+OUT_DIR = 'glowheal_reports'
+FUNNEL_CSV = 'glowheal_funnel.csv'
+FORMATS = ('txt', 'md', 'html')
+COMPILER_VERSION = 1          # bump when the generated code changes shape
+RULE = '=' * 80
+
+TOKEN = re.compile(r'({{.*?}}|{%.*?%})', re.S)
+BLOCK_LINE = re.compile(r'^[ \t]*({%.*?%})[ \t]*\n', re.M)
+EXPRESSION = re.compile(r'^([A-Za-z_]\w*(?:\.\w+)*)((?:\s*\|\s*\w+)*)$')
+FOR = re.compile(r'^for\s+([A-Za-z_]\w*)\s+in\s+(.+)$')
+IF = re.compile(r'^if\s+(not\s+)?(.+)$')
+
+
+# -- template compiler -------------------------------------------------------
+
+def _missing(value):
+    return value is None or value != value
+
+
+def _pct(value):
+    return 'not measured' if _missing(value) else f'{value:.1%}'
+
+
+def _pct_range(value):
+    if value is None:
+        return 'not measured'
+    low, high = (f'{v:.1%}' for v in value)
+    return low if low == high else f'{low[:-1]}-{high}'
+
+
+def _lift(value):
+    if value is None:
+        return 'no estimate'
+    low, high = (round(v * 100) for v in value)
+    return f'+{low}%' if low == high else f'+{low}-{high}%'
+
+
+def _price(value):
+    value = str(value)
+    return f'₹{value}' if value[:1].isdigit() else value
+
+
+FILTERS = {
+    'pct': _pct,
+    'pct_range': _pct_range,
+    'lift': _lift,
+    'price': _price,
+    'seconds': lambda ms: 'not measured' if _missing(ms) else f'{ms / 1000:.2f}s',
+    'score': lambda s: 'not measured' if _missing(s) else f'{s * 100:.0f}',
+    'count': lambda n: 'not measured' if _missing(n) else f'{n:,}',
+    'upper': lambda s: str(s).upper(),
+    'lower': lambda s: str(s).lower(),
+}
+
+
+def lookup(obj, path):
+    for key in path:
+        obj = obj[key] if isinstance(obj, dict) else getattr(obj, key)
+    return obj
+
+
+def _text(value):
+    return '' if value is None else str(value)
+
+
+def compile_template(source, name='<template>'):
+    """Python source of `render(ctx)`, a generator of output chunks."""
+    source = BLOCK_LINE.sub(r'\1', source)      # a tag alone on its line leaves no blank line
+    code = ['def render(ctx):']
+    loops = []                                   # [(variable, python name, kind)]
+    line = 1
+
+    def emit(text):
+        code.append('    ' * (len(loops) + 1) + text)
+
+    def reference(expr):
+        match = EXPRESSION.match(expr.strip())
+        if not match:
+            raise ValueError(f'{name}:{line}: cannot parse {expr.strip()!r}')
+        head, *rest = match.group(1).split('.')
+        scopes = {var: py for var, py, kind in loops if kind == 'for'}
+        target = f'lookup({scopes[head]}, {tuple(rest)!r})' if head in scopes else \
+            f'lookup(ctx, {tuple([head] + rest)!r})'
+        for filter_name in filter(None, (f.strip() for f in match.group(2).split('|'))):
+            if filter_name not in FILTERS:
+                raise ValueError(f'{name}:{line}: unknown filter {filter_name!r}')
+            target = f'FILTERS[{filter_name!r}]({target})'
+        return target
+
+    for token in TOKEN.split(source):
+        if token.startswith('{{'):
+            emit(f'yield _text({reference(token[2:-2])})')
+        elif token.startswith('{%'):
+            tag = token[2:-2].strip()
+            if match := FOR.match(tag):
+                variable = f'_v{len(loops)}'
+                emit(f'for {variable} in {reference(match.group(2))}:')
+                loops.append((match.group(1), variable, 'for'))
+            elif match := IF.match(tag):
+                emit(f'if {"not " if match.group(1) else ""}{reference(match.group(2))}:')
+                loops.append((None, None, 'if'))
+            elif tag == 'else':
+                if not loops or loops[-1][2] != 'if':
+                    raise ValueError(f'{name}:{line}: else outside if')
+                emit('pass')
+                code.append('    ' * len(loops) + 'else:')
+            elif tag in ('endfor', 'endif'):
+                if not loops or loops[-1][2] != tag[3:]:
+                    raise ValueError(f'{name}:{line}: unexpected {tag}')
+                emit('pass')
+                loops.pop()
+            else:
+                raise ValueError(f'{name}:{line}: unknown tag {tag!r}')
+        elif token:
+            emit(f'yield {token!r}')
+        line += token.count('\n')
+    if loops:
+        raise ValueError(f'{name}: unclosed {loops[-1][2]}')
+    emit('return')
+    return '\n'.join(code) + '\n'
+
+
+class Template:
+    def __init__(self, render, key, cached):
+        self.render = render
+        self.key = key
+        self.cached = cached       # True when the code object came from the disk cache
+
+    def lines(self, ctx):
+        """Rendered output one line at a time, without the newline."""
+        buffer = ''
+        for chunk in self.render(ctx):
+            buffer += chunk
+            if '\n' in buffer:
+                *done, buffer = buffer.split('\n')
+                yield from done
+        if buffer:
+            yield buffer
+
+
+def load_template(path=TEMPLATE, cache_dir=CACHE_DIR):
+    """Template from path, compiled code reused from cache_dir when the source is unchanged."""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    digest = hashlib.sha256(importlib.util.MAGIC_NUMBER + f'{COMPILER_VERSION}\0'.encode()
+                            + source.encode('utf-8'))
+    key = digest.hexdigest()[:32]
+    cached = os.path.join(cache_dir, key + '.marshal')
+    try:
+        with open(cached, 'rb') as f:
+            code, from_cache = marshal.load(f), True
+    except (OSError, EOFError, ValueError, TypeError):
+        code, from_cache = compile(compile_template(source, path), f'<compiled {path}>', 'exec'), False
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f'{cached}.{os.getpid()}.tmp'
+        with open(tmp, 'wb') as f:
+            marshal.dump(code, f)
+        os.replace(tmp, cached)
+    namespace = {'lookup': lookup, 'FILTERS': FILTERS, '_text': _text}
+    exec(code, namespace)
+    return Template(namespace['render'], key, from_cache)
+
+
+# -- output formats ----------------------------------------------------------
+#
+# Templates are written in a small line-based markup: '#'/'##'/'###'
+# headings, '- ' items ('- [ ] ' / '- [x] ' for checkboxes), '1. ' numbered
+# items, '| a | b |' table rows (the first row is the header) and plain
+# paragraphs separated by blank lines. Each formatter turns those lines into
+# its target as they arrive; only table rows are held back, to size columns.
+
+ITEM = re.compile(r'^(\s*)(?:- (\[[ x]\] )?|(\d+)\. )(.*)$')
+HEADING = re.compile(r'^(#{1,3}) (.*)$')
+
+
+def _cells(line):
+    return [cell.strip() for cell in line.strip().strip('|').split('|')]
+
+
+class TextFormatter:
+    """Plain text in the layout of the original glowheal_executive_summary.txt."""
+
+    MARKS = {None: '•', '[ ] ': '☐', '[x] ': '✓'}
+
+    def __init__(self):
+        self.table = []
+
+    def begin(self, title):
+        return []
+
+    def feed(self, line):
+        if line.startswith('|'):
+            self.table.append(_cells(line))
+            return []
+        out = self.flush_table()
+        if line.startswith('# '):
+            out += [RULE, line[2:], RULE]
+        elif line.startswith('## '):
+            out += [line[3:], RULE, '']
+        elif line.startswith('### '):
+            out += [line[4:] + ':']
+        elif match := ITEM.match(line):
+            indent, mark, number, text = match.groups()
+            bullet = f'{number}.' if number else self.MARKS[mark]
+            out += [f'{indent}{bullet} {text}']
+        else:
+            out += [line]
+        return out
+
+    def flush_table(self):
+        if not self.table:
+            return []
+        widths = [max(len(row[i]) if i < len(row) else 0 for row in self.table)
+                  for i in range(max(map(len, self.table)))]
+        out = []
+        for n, row in enumerate(self.table):
+            out.append('  '.join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip())
+            if n == 0:
+                out.append('-' * (sum(widths) + 2 * (len(widths) - 1)))
+        self.table = []
+        return out
+
+    def end(self):
+        return self.flush_table()
+
+
+class MarkdownFormatter(TextFormatter):
+    def feed(self, line):
+        if line.startswith('|'):
+            self.table.append(_cells(line))
+            return []
+        out = self.flush_table()
+        if line and not line.startswith('#') and not ITEM.match(line):
+            out += [line + '  ']                   # keep the template's line breaks
+        else:
+            out += [line]
+        return out
+
+    def flush_table(self):
+        if not self.table:
+            return []
+        rows = [self.table[0], ['---'] * len(self.table[0])] + self.table[1:]
+        self.table = []
+        return ['| ' + ' | '.join(cell.replace('|', '\\|') for cell in row) + ' |' for row in rows] + ['']
+
+
+class HtmlFormatter(TextFormatter):
+    def __init__(self):
+        super().__init__()
+        self.open = None           # 'p' while a paragraph is open
+        self.lists = []            # [(indent, 'ul' or 'ol')], outermost first; their last <li> is open
+
+    def begin(self, title):
+        return ['<!DOCTYPE html>', '<html lang="en">', '<head>', '<meta charset="utf-8">',
+                f'<title>{escape(title)}</title>', '</head>', '<body>']
+
+    def close(self, indent=-1):
+        """Close the open paragraph and every list nested deeper than indent."""
+        out = [f'</{self.open}>'] if self.open else []
+        self.open = None
+        while self.lists and self.lists[-1][0] > indent:
+            out += ['</li>', f'</{self.lists.pop()[1]}>']
+        return out
+
+    def feed(self, line):
+        if line.startswith('|'):
+            self.table.append(_cells(line))
+            return self.close()
+        out = self.flush_table()
+        if heading := HEADING.match(line):
+            level = len(heading.group(1))
+            out += self.close() + [f'<h{level}>{escape(heading.group(2))}</h{level}>']
+        elif match := ITEM.match(line):
+            indent, mark, number, text = match.groups()
+            out += self.open_list(len(indent.expandtabs()), 'ol' if number else 'ul')
+            prefix = self.MARKS[mark] + ' ' if mark else ''
+            value = f' value="{number}"' if number else ''
+            out += [f'<li{value}>{escape(prefix + text)}']
+        elif not line.strip():
+            out += self.close()
+        else:
+            if self.open == 'p':
+                out += ['<br>']
+            else:
+                out += self.close() + ['<p>']
+                self.open = 'p'
+            out += [escape(line)]
+        return out
+
+    def open_list(self, indent, tag):
+        """Markup before an item: a deeper indent nests a list inside the open <li>."""
+        out = self.close(indent)
+        if self.lists and self.lists[-1][0] == indent:
+            if self.lists[-1][1] == tag:
+                return out + ['</li>']
+            out += ['</li>', f'</{self.lists.pop()[1]}>']
+        self.lists.append((indent, tag))
+        return out + [f'<{tag}>']
+
+    def flush_table(self):
+        if not self.table:
+            return []
+        head, *body = self.table
+        out = ['<table>', '<thead><tr>' + ''.join(f'<th>{escape(c)}</th>' for c in head) + '</tr></thead>',
+               '<tbody>']
+        out += ['<tr>' + ''.join(f'<td>{escape(c)}</td>' for c in row) + '</tr>' for row in body]
+        self.table = []
+        return out + ['</tbody>', '</table>']
+
+    def end(self):
+        return self.flush_table() + self.close() + ['</body>', '</html>']
+
+
+FORMATTERS = {'txt': TextFormatter, 'md': MarkdownFormatter, 'html': HtmlFormatter}
+
+
+def render_to(template, ctx, fmt, f):
+    """Stream one report in format fmt to the open file f; returns lines written."""
+    formatter = FORMATTERS[fmt]()
+    written = 0
+    for out in chain([formatter.begin(ctx.get('title', ''))], map(formatter.feed, template.lines(ctx))):
+        if out:
+            f.write('\n'.join(out) + '\n')
+            written += len(out)
+    out = formatter.end()
+    f.write('\n'.join(out) + '\n')
+    return written + len(out)
+
+
+# -- context -----------------------------------------------------------------
+
+def _key(column):
+    return re.sub(r'[^a-z0-9]+', '_', column.lower()).strip('_')
+
+
+def records(table):
+    """script-style {column: [values]} dict -> [{snake_case column: value}]."""
+    keys = [_key(column) for column in table]
+    return [dict(zip(keys, values)) for values in zip(*table.values())]
+
+
+def _grouped(rows, field, order):
+    groups = {}
+    for row in rows:
+        groups.setdefault(row[field], []).append(row)
+    return sorted(groups.items(), key=lambda kv: order.index(kv[0]) if kv[0] in order else len(order))
+
+
+def series_lifts(items):
+    """{series: (low, high) fractional lift} of checklist items listed in rollout order.
+
+    The same model as rollout_planner.py: an item's Expected Impact applies
+    to the series it names, and overlapping items on a series are discounted
+    and compounded by its combined_lift.
+    """
+    from rollout_planner import combined_lift, impact_series, parse_impact
+    impacts = {}
+    for item in items:
+        series, impact = impact_series(item['expected_impact']), parse_impact(item['expected_impact'])
+        if series and impact:
+            impacts.setdefault(series, []).append(impact)
+    return {series: combined_lift(ranges) for series, ranges in impacts.items()}
+
+
+def added_lift(total, before):
+    """Lift that total adds on top of before (both (low, high) fractions, or None)."""
+    if total is None or before is None:
+        return total
+    return tuple((1 + t) / (1 + b) - 1 for t, b in zip(total, before))
+
+
+def base_context():
+    """Everything the report shares across cities and pages, from the report scripts."""
+    from recommendations import PRIORITIES
+    from script_2 import button_specs, color_palette_data, pricing_data
+    from script_3 import implementation_checklist
+    from script_4 import bugs_issues
+
+    today = date.today()
+    checklist = records(implementation_checklist)
+    bugs = records(bugs_issues)
+    # Tiers roll out in priority order; 'high' is what HIGH adds after CRITICAL
+    rollout = sorted(checklist, key=lambda i: PRIORITIES.index(i['priority']))
+    cumulative = {stage: series_lifts([i for i in rollout if i['priority'] in priorities])
+                  for stage, priorities in (('critical', ('CRITICAL',)), ('phase1', ('CRITICAL', 'HIGH')),
+                                            ('full', PRIORITIES))}
+    high = series_lifts([i for i in rollout if i['priority'] == 'HIGH'])
+    by_series = dict(cumulative, high={series: added_lift(cumulative['phase1'][series],
+                                                          cumulative['critical'].get(series))
+                                       for series in high})
+    lift = {stage: {metric: lifts.get(metric) for metric in ('conversion_rate', 'form_completion')}
+            for stage, lifts in by_series.items()}
+    impact = {stage: [{'series': series.replace('_', ' '), 'lift': lifts[series]}
+                      for series in sorted(lifts, key=lambda s: -lifts[s][1])]
+              for stage, lifts in by_series.items()}
+    return {
+        'title': 'GLOWHEAL.IN - Comprehensive Website Analysis & Optimization Report',
+        'generated': f'{today:%B} {today.day}, {today.year}',
+        'pricing': records(pricing_data),
+        'palette': [{'name': name, 'colors': colors}
+                    for name, colors in _grouped(records(color_palette_data), 'color_scheme', [])],
+        'buttons': records(button_specs),
+        'checklist': {p.lower(): [i for i in checklist if i['priority'] == p] for p in PRIORITIES},
+        'bugs': [{'severity': severity, 'items': items}
+                 for severity, items in _grouped(bugs, 'severity', list(PRIORITIES))],
+        'counts': {'checklist': len(checklist), 'bugs': len(bugs),
+                   'critical': sum(i['priority'] == 'CRITICAL' for i in checklist)},
+        'lift': lift,
+        'impact': impact,
+    }
+
+
+def _rate(text):
+    return float(text.rstrip('%')) / 100 if text else None
+
+
+def funnel_rates(path=FUNNEL_CSV):
+    """{(dimension, value): (sessions, form completion, conversion)} from funnel.py's CSV."""
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        return {(row[0], row[1]): (int(row[2]), _rate(row[-2]), _rate(row[-1]))
+                for row in reader if len(row) == len(header)}
+
+
+def lighthouse_metrics(store_dir=None):
+    """{page: (LCP p75 ms, performance score p75)} from the Lighthouse history, if any."""
+    from lighthouse_store import STORE_DIR, LighthouseStore
+    store = LighthouseStore(store_dir or STORE_DIR)
+    out = {}
+    for page in store.pages():
+        try:
+            out[page] = (store.percentile(page, 'largest-contentful-paint'),
+                         store.percentile(page, 'category:performance'))
+        except KeyError:
+            continue
+    return out
+
+
+def job_context(city, page, funnel, lighthouse, lift):
+    """Per-report fields: the city's funnel (else the site total) and the page's Lighthouse runs."""
+    if ('city', city) in funnel:
+        sessions, form, conversion = funnel[('city', city)]
+        funnel_source = f'funnel.py, city={city}'
+    elif ('all', 'all') in funnel:
+        sessions, form, conversion = funnel[('all', 'all')]
+        funnel_source = 'funnel.py, all cities'
+    else:
+        sessions = form = conversion = None
+        funnel_source = 'no funnel data'
+    lcp, performance = lighthouse.get(page, (None, None))
+    metrics = {
+        'conversion_rate': conversion, 'form_completion': form, 'sessions': sessions,
+        'funnel_source': funnel_source, 'lcp': lcp, 'performance': performance,
+        'lighthouse_source': 'lighthouse_store.py' if page in lighthouse else 'no Lighthouse runs',
+    }
+    projected = {stage: {metric: None if metrics[metric] is None else
+                         tuple(min(1.0, metrics[metric] * (1 + x)) for x in lifts[metric] or (0, 0))
+                         for metric in lifts}
+                 for stage, lifts in lift.items()}
+    return {'city': city, 'city_label': 'All cities' if city == 'all' else city.title(), 'page': page,
+            'metrics': metrics, 'projected': projected}
+
+
+def page_slug(page):
+    return page.strip('/').replace('/', '-') or 'home'
+
+
+# -- parallel rendering ------------------------------------------------------
+
+_worker = {}
+
+
+def _init_worker(template_path, cache_dir, shared, formats, out_dir):
+    _worker.update(template=load_template(template_path, cache_dir), shared=shared, formats=formats,
+                   out_dir=out_dir)
+
+
+def _render_job(job):
+    """Render one (city, page, fields) job in every format; returns (paths, bytes written)."""
+    city, page, fields = job
+    ctx = {**_worker['shared'], **fields}
+    directory = os.path.join(_worker['out_dir'], city)
+    os.makedirs(directory, exist_ok=True)
+    paths, size = [], 0
+    for fmt in _worker['formats']:
+        path = os.path.join(directory, f'{page_slug(page)}.{fmt}')
+        tmp = f'{path}.{os.getpid()}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            render_to(_worker['template'], ctx, fmt, f)
+        os.replace(tmp, path)
+        paths.append(path)
+        size += os.path.getsize(path)
+    return paths, size
+
+
+def render_all(jobs, template_path=TEMPLATE, formats=FORMATS, out_dir=OUT_DIR, shared=None,
+               cache_dir=CACHE_DIR, workers=None):
+    """Render every job; returns (files written, bytes). Runs inline with one worker."""
+    shared = base_context() if shared is None else shared
+    init = (template_path, cache_dir, shared, list(formats), out_dir)
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        _init_worker(*init)
+        results = list(map(_render_job, jobs))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init) as pool:
+            results = list(pool.map(_render_job, jobs, chunksize=max(1, len(jobs) // (workers * 8))))
+    return sum(len(paths) for paths, _ in results), sum(n for _, n in results)
+
+
+def build_jobs(cities, pages, funnel, lighthouse, lift):
+    return [(city, page, job_context(city, page, funnel, lighthouse, lift)) for city in cities for page in pages]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render the executive summary per city and landing page.')
+    parser.add_argument('--city', action='append', help='default: every city in glowheal_funnel.csv, plus all')
+    parser.add_argument('--page', action='append', help='default: every page in the Lighthouse history, or /')
+    parser.add_argument('--format', action='append', choices=FORMATS, help='default: all formats')
+    parser.add_argument('--template', default=TEMPLATE)
+    parser.add_argument('--funnel', default=FUNNEL_CSV)
+    parser.add_argument('--lighthouse-store', help='Lighthouse history directory')
+    parser.add_argument('--out', default=OUT_DIR)
+    parser.add_argument('--workers', type=int)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    template = load_template(args.template)
+    shared = base_context()
+    funnel = funnel_rates(args.funnel)
+    lighthouse = lighthouse_metrics(args.lighthouse_store)
+    cities = args.city or ['all'] + sorted(v for d, v in funnel if d == 'city' and v != '(not set)')
+    pages = args.page or sorted(lighthouse) or ['/']
+    jobs = build_jobs(cities, pages, funnel, lighthouse, shared['lift'])
+    files, size = render_all(jobs, args.template, args.format or FORMATS, args.out, shared,
+                             workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - REPORT RENDERER")
+    print("=" * 80)
+    print(f"Template: {os.path.basename(args.template)} "
+          f"({'compiled code from cache' if template.cached else 'compiled and cached'})")
+    print(f"Funnel: {'glowheal_funnel.csv' if funnel else 'no data'} | "
+          f"Lighthouse pages: {len(lighthouse)}")
+    print(f"{len(cities)} cities x {len(pages)} pages -> {files:,} files, {size / 1e6:.1f} MB "
+          f"in {elapsed:.2f}s ({len(jobs) / elapsed:,.0f} reports/s)")
+    print(f"\n✓ Reports written to: {os.path.join(args.out, '<city>', '<page>.<format>')}")
@@ -0,0 +1,390 @@
+# Effort-budgeted rollout plan for the implementation checklist
+#
+# script_3.py's checklist_items carry free-text impact ('+15-25% conversion
+# rate') and effort labels ('Low-Medium'). Here impact becomes a numeric
+# range on a named series ('conversion_rate', 'click_through_rate',
+# 'mobile_conversions', ...) and effort becomes engineer-days.
+#
+# The plan fills each week with a 0/1 knapsack DP over the items whose
+# prerequisites are done, which re-plans hundreds of items in well under a
+# second. --exact instead solves the precedence-constrained schedule over the
+# whole horizon as a MILP (scipy.optimize.milp) minimizing the
+# score-weighted completion week; it is a little better on small checklists
+# but grows to tens of seconds past ~100 items, so it runs under a
+# SOLVER_SECONDS limit and falls back to the knapsack plan.
+#
+# Lifts only combine within one series, and overlapping items on a series
+# have diminishing returns: the k-th item shipped on it counts
+# OVERLAP_DISCOUNT**k of its stated lift before compounding. report_renderer.py
+# uses the same model (combined_lift) for the executive summary. Monte Carlo
+# draws over the impact ranges give an interval per series.
+#
+#   python rollout_planner.py --budget 10
+#   python rollout_planner.py --checklist glowheal.in=glowheal_implementation_checklist.csv \
+#                             --checklist other.in=other_checklist.csv
+
+import argparse
+import csv
+import math
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from recommendations import target_metrics
+
+WEEKLY_BUDGET_DAYS = 10
+EFFORT_DAYS = {'low': 1, 'medium': 3, 'high': 8}
+PRIORITY_WEIGHT = {'CRITICAL': 8, 'HIGH': 4, 'MEDIUM': 2, 'LOW': 1}
+ENABLER_SHARE = 0.5     # share of its dependents' score credited to a prerequisite
+POINT_SPREAD = 0.5      # '+20%' is drawn from 20% +/- 50%
+OVERLAP_DISCOUNT = 0.5  # the k-th lift on the same series counts OVERLAP_DISCOUNT**k of its value
+DRAWS = 10_000
+SOLVER_SECONDS = 0.5     # --exact only; re-planning has to stay interactive
+IMPACT = re.compile(r'\+\s*(\d+(?:\.\d+)?)\s*(?:-\s*(\d+(?:\.\d+)?))?\s*%')
+SERIES_WORDS = re.compile(r'\s*([a-z][a-z -]*)')
+# Different wordings of the same series in the checklist's Expected Impact
+SERIES_ALIASES = {
+    'conversion': 'conversion_rate',
+    'conversions': 'conversion_rate',
+    'total_conversions': 'conversion_rate',
+    'click_through': 'click_through_rate',
+    'form_completions': 'form_completion',
+}
+
+# Prerequisites between checklist items (by item name, within a site)
+DEPENDENCIES = {
+    'A/B Testing': ('Conversion Tracking',),
+    'Color Scheme': ('Conversion Tracking',),     # the blue-vs-green change ships as an A/B test
+    'Multiple CTAs': ('Primary CTA Visibility',),
+    'Mobile Sticky CTA': ('Primary CTA Visibility',),
+    'Form Security': ('Booking Form Friction',),
+    'Service Pages': ('Transparent Pricing',),
+    'Image Optimization': ('Page Load Speed',),
+}
+
+
+def parse_impact(text):
+    """'+15-25% conversion rate' -> (15.0, 25.0); '+20% ...' -> (20.0, 20.0); else None."""
+    match = IMPACT.search(text or '')
+    if not match:
+        return None
+    low = float(match.group(1))
+    return low, float(match.group(2) or low)
+
+
+def impact_series(text):
+    """What a lift applies to: '+30-40% click-through rate' -> 'click_through_rate',
+    '+20% conversion, better SEO' -> 'conversion_rate'; None without a percentage."""
+    match = IMPACT.search(text or '')
+    if not match:
+        return None
+    words = SERIES_WORDS.match(text[match.end():].lower())
+    if not words:
+        return None
+    series = '_'.join(words.group(1).replace('-', ' ').split())
+    return SERIES_ALIASES.get(series, series)
+
+
+def overlap_weights(n):
+    """Weight of the 1st, 2nd, ... lift shipped on one series."""
+    return OVERLAP_DISCOUNT ** np.arange(n)
+
+
+def combined_lift(impacts):
+    """(low, high) fractional lift of [(low, high) percent] on one series, in rollout order."""
+    if not impacts:
+        return None
+    weights = overlap_weights(len(impacts))
+    low = np.array([i[0] for i in impacts]) / 100
+    high = np.array([i[1] for i in impacts]) / 100
+    return float(np.expm1(np.log1p(weights * low).sum())), float(np.expm1(np.log1p(weights * high).sum()))
+
+
+def parse_effort(label):
+    """'Low' -> 1, 'Low-Medium' -> 2, 'High' -> 8 engineer-days; numbers pass through."""
+    label = str(label or '').strip().lower()
+    try:
+        return max(1, math.ceil(float(label)))
+    except ValueError:
+        pass
+    parts = [EFFORT_DAYS[p.strip()] for p in label.split('-') if p.strip() in EFFORT_DAYS]
+    return math.ceil(sum(parts) / len(parts)) if parts else EFFORT_DAYS['medium']
+
+
+@dataclass
+class Item:
+    key: str                  # 'site:item'
+    site: str
+    name: str
+    category: str
+    priority: str
+    impact_text: str
+    effort: int               # engineer-days
+    impact: tuple             # (low, high) percent, or None
+    metric: str
+    series: str               # what impact applies to (impact_series), or None
+    requires: list = field(default_factory=list)
+    score: float = 0.0
+
+    @property
+    def expected_impact(self):
+        return sum(self.impact) / 2 if self.impact else 0.0
+
+
+def load_items(checklists):
+    """[Item] from {site: rows}; rows are checklist tuples or dicts with the CSV's columns."""
+    items = []
+    for site, rows in checklists.items():
+        names = set()
+        site_items = []
+        for row in rows:
+            if not isinstance(row, dict):
+                row = dict(zip(('Category', 'Priority', 'Item', 'Current Issue/Gap', 'Recommended Action',
+                                'Expected Impact', 'Effort'), row))
+            name = row['Item']
+            names.add(name)
+            declared = [d.strip() for d in (row.get('Depends On') or '').split(';') if d.strip()]
+            site_items.append(Item(
+                key=f'{site}:{name}', site=site, name=name, category=row['Category'],
+                priority=row['Priority'].upper(), impact_text=row['Expected Impact'],
+                effort=parse_effort(row['Effort']), impact=parse_impact(row['Expected Impact']),
+                metric=target_metrics(row['Category'], row['Expected Impact'])[0],
+                series=impact_series(row['Expected Impact']),
+                requires=declared or list(DEPENDENCIES.get(name, ()))))
+        for item in site_items:
+            missing = [d for d in item.requires if d not in names]
+            if missing:
+                raise ValueError(f'{item.key} requires unknown item(s) {missing}')
+            item.requires = [f'{site}:{d}' for d in item.requires]
+        items.extend(site_items)
+    score(items)
+    return items
+
+
+def score(items):
+    """Priority weight scaled by expected impact, plus credit for what an item unblocks."""
+    by_key = {item.key: item for item in items}
+    dependents = {item.key: [] for item in items}
+    for item in items:
+        for req in item.requires:
+            dependents[req].append(item.key)
+    own = {item.key: PRIORITY_WEIGHT.get(item.priority, 1) * (1 + math.log1p(item.expected_impact / 100))
+           for item in items}
+    memo = {}
+
+    def downstream(key, stack=()):
+        if key in stack:
+            raise ValueError('dependency cycle: ' + ' -> '.join(stack + (key,)))
+        if key not in memo:
+            memo[key] = sum(own[d] + downstream(d, stack + (key,)) for d in dependents[key])
+        return memo[key]
+
+    for key, item in by_key.items():
+        item.score = own[key] + ENABLER_SHARE * downstream(key)
+
+
+def knapsack(efforts, scores, budget):
+    """Indices of the max-score subset with total effort <= budget (0/1 knapsack DP)."""
+    best = np.zeros(budget + 1)
+    take = np.zeros((len(efforts), budget + 1), dtype=bool)
+    for i, (w, v) in enumerate(zip(efforts, scores)):
+        if w > budget:
+            continue
+        candidate = best[:budget + 1 - w] + v
+        improved = candidate > best[w:]
+        take[i, w:] = improved
+        best[w:] = np.where(improved, candidate, best[w:])
+    chosen, capacity = [], budget
+    for i in range(len(efforts) - 1, -1, -1):
+        if take[i, capacity]:
+            chosen.append(i)
+            capacity -= efforts[i]
+    return chosen[::-1]
+
+
+def greedy_plan(items, budget=WEEKLY_BUDGET_DAYS, max_weeks=520):
+    """[(week, [Item])] from a knapsack per week over the items whose prerequisites are done.
+
+    Myopic, but fast and always feasible; plan() uses its length as the horizon.
+    Items bigger than the weekly budget run alone across ceil(effort / budget) weeks.
+    """
+    done, pending, weeks, week = set(), list(items), [], 1
+    while pending and week <= max_weeks:
+        ready = [item for item in pending if all(r in done for r in item.requires)]
+        if not ready:
+            raise ValueError('unsatisfiable dependencies: ' + ', '.join(i.key for i in pending))
+        chosen = [ready[i] for i in knapsack([i.effort for i in ready], [i.score for i in ready], budget)]
+        span = 1
+        if not chosen:
+            chosen = [max(ready, key=lambda i: i.score / i.effort)]
+            span = math.ceil(chosen[0].effort / budget)
+        weeks.append((week, chosen))
+        done.update(item.key for item in chosen)
+        keys = {item.key for item in chosen}
+        pending = [item for item in pending if item.key not in keys]
+        week += span
+    return weeks
+
+
+def _span(item, budget):
+    return max(1, math.ceil(item.effort / budget))
+
+
+def plan(items, budget=WEEKLY_BUDGET_DAYS, max_weeks=520, time_limit=SOLVER_SECONDS):
+    """([(week, [Item])], proven optimal) minimizing the score-weighted completion week.
+
+    x[i, s] = 1 when item i starts in week s. Each item starts once, the
+    effort running in any week stays within budget (an item bigger than the
+    budget uses it fully until its last week), and an item starts only after
+    its prerequisites' last week.
+    """
+    from scipy.optimize import Bounds, LinearConstraint, milp
+    from scipy.sparse import coo_matrix
+
+    greedy = greedy_plan(items, budget, max_weeks)
+    if not greedy:
+        return greedy, True
+    horizon = max(week + _span(item, budget) - 1 for week, chosen in greedy for item in chosen)
+    spans = [_span(item, budget) for item in items]
+    columns = []                                       # (item index, start week)
+    for i, span in enumerate(spans):
+        columns.extend((i, s) for s in range(1, horizon - span + 2))
+    column_of = {c: n for n, c in enumerate(columns)}
+    index = {item.key: i for i, item in enumerate(items)}
+    pairs = [(index[r], i) for i, item in enumerate(items) for r in item.requires]
+
+    rows = len(items) + horizon + len(pairs)
+    entries = []                                       # (row, column, value); duplicates add up
+    low, high = np.zeros(rows), np.zeros(rows)
+    for n, (i, s) in enumerate(columns):
+        entries.append((i, n, 1))                      # starts exactly once
+        effort = items[i].effort
+        for week in range(s, s + spans[i]):             # budget used in each week it runs
+            entries.append((len(items) + week - 1, n, min(budget, effort)))
+            effort -= budget
+    low[:len(items)] = high[:len(items)] = 1
+    low[len(items):len(items) + horizon], high[len(items):len(items) + horizon] = -np.inf, budget
+    for row, (before, after) in enumerate(pairs, start=len(items) + horizon):
+        entries.extend((row, column_of[after, s], s) for s in range(1, horizon - spans[after] + 2))
+        entries.extend((row, column_of[before, s], -(s + spans[before] - 1))
+                       for s in range(1, horizon - spans[before] + 2))
+        low[row], high[row] = 1, np.inf
+    r, c, v = zip(*entries)
+    a = coo_matrix((v, (r, c)), shape=(rows, len(columns))).tocsr()
+    cost = np.array([items[i].score * (s + spans[i] - 1) for i, s in columns])
+
+    result = milp(cost, constraints=LinearConstraint(a, low, high), integrality=np.ones(len(columns)),
+                  bounds=Bounds(0, 1), options={'time_limit': time_limit})
+    if result.x is None:
+        return greedy, False
+    starts = {}
+    for n in np.flatnonzero(result.x > 0.5):
+        i, s = columns[n]
+        starts.setdefault(s, []).append(items[i])
+    weeks = [(week, sorted(chosen, key=lambda item: -item.score)) for week, chosen in sorted(starts.items())]
+    return weeks, result.status == 0
+
+
+def simulate(weeks, draws=DRAWS, seed=0):
+    """{series: array of (week, p5, p50, p95)} cumulative lift in percent.
+
+    Lifts compound only within one series, each discounted by overlap_weights
+    in the order they ship. With several sites the keys are '<site> <series>'.
+    """
+    rng = np.random.default_rng(seed)
+    scheduled = [(week, item) for week, chosen in weeks for item in chosen if item.impact and item.series]
+    if not scheduled:
+        return {}
+    low = np.array([item.impact[0] for _, item in scheduled])
+    high = np.array([item.impact[1] for _, item in scheduled])
+    point = low == high
+    low = np.where(point, low * (1 - POINT_SPREAD), low)
+    high = np.where(point, high * (1 + POINT_SPREAD), high)
+    lifts = rng.uniform(low[:, None], high[:, None], size=(len(scheduled), draws)) / 100
+    week_index = {week: i for i, (week, _) in enumerate(weeks)}
+    rows = np.array([week_index[week] for week, _ in scheduled])
+    # Lifts only compound within one site
+    single_site = len({item.site for _, item in scheduled}) == 1
+    metrics = [item.series if single_site else f'{item.site} {item.series}' for _, item in scheduled]
+    weights = np.zeros(len(scheduled))
+    for metric in dict.fromkeys(metrics):
+        positions = [n for n, m in enumerate(metrics) if m == metric]
+        weights[positions] = overlap_weights(len(positions))
+    log_lift = np.log1p(lifts * weights[:, None])
+    out = {}
+    for metric in dict.fromkeys(metrics):
+        mask = np.array([m == metric for m in metrics])
+        per_week = np.zeros((len(weeks), draws))
+        np.add.at(per_week, rows[mask], log_lift[mask])
+        total = np.expm1(np.cumsum(per_week, axis=0)) * 100
+        p5, p50, p95 = np.percentile(total, [5, 50, 95], axis=1)
+        out[metric] = np.column_stack([[week for week, _ in weeks], p5, p50, p95])
+    return out
+
+
+def read_checklist_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def to_csv(weeks, path):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Week', 'Site', 'Item', 'Category', 'Priority', 'Effort (days)', 'Expected Impact',
+                         'Metric', 'Lift Series', 'Score', 'Requires'])
+        for week, chosen in weeks:
+            for item in chosen:
+                writer.writerow([week, item.site, item.name, item.category, item.priority, item.effort,
+                                 item.impact_text, item.metric, item.series or '', f'{item.score:.2f}',
+                                 '; '.join(r.split(':', 1)[1] for r in item.requires)])
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Plan the checklist rollout under a weekly effort budget.')
+    parser.add_argument('--budget', type=int, default=WEEKLY_BUDGET_DAYS, help='engineer-days per week')
+    parser.add_argument('--checklist', action='append', metavar='SITE=CSV',
+                        help='checklist CSV per site (default: script_3.py for glowheal.in)')
+    parser.add_argument('--draws', type=int, default=DRAWS)
+    parser.add_argument('--exact', action='store_true',
+                        help='solve the whole schedule as a MILP (slow past ~100 items)')
+    parser.add_argument('--time-limit', type=float, default=SOLVER_SECONDS,
+                        help='seconds the --exact solver may run before falling back')
+    args = parser.parse_args()
+
+    if args.checklist:
+        checklists = {}
+        for spec in args.checklist:
+            site, _, path = spec.rpartition('=')
+            checklists[site or path] = read_checklist_csv(path)
+    else:
+        from script_3 import checklist_items
+        checklists = {'glowheal.in': checklist_items}
+    items = load_items(checklists)
+    if args.exact:
+        weeks, optimal = plan(items, args.budget, time_limit=args.time_limit)
+        schedule = ('optimal' if optimal else 'best found within the solver time limit') \
+            + ' (minimum score-weighted completion week, prerequisites first)'
+    else:
+        weeks = greedy_plan(items, args.budget)
+        schedule = 'weekly knapsack over the items whose prerequisites are done (--exact for the MILP)'
+    intervals = simulate(weeks, args.draws)
+    to_csv(weeks, 'glowheal_rollout_plan.csv')
+
+    print("=" * 80)
+    print("GLOWHEAL.IN - ROLLOUT PLAN")
+    print("=" * 80)
+    finish = max((week + _span(item, args.budget) - 1 for week, chosen in weeks for item in chosen), default=0)
+    print(f"{len(items)} items, {sum(i.effort for i in items)} engineer-days, "
+          f"budget {args.budget} days/week -> {finish} weeks")
+    print(f"Schedule: {schedule}\n")
+    for week, chosen in weeks:
+        used = sum(item.effort for item in chosen)
+        print(f"Week {week:>2} ({used:>2} days started): "
+              + ', '.join(f"{item.name} [{item.priority[0]}]" for item in chosen))
+    print(f"\nCumulative lift per series at the end of the plan (5th / 50th / 95th percentile;")
+    print(f"overlapping items on a series count {OVERLAP_DISCOUNT:g}^k of their stated lift):")
+    for metric, rows in intervals.items():
+        _, p5, p50, p95 = rows[-1]
+        print(f"  {metric:<24} {p5:>7.1f}%  {p50:>7.1f}%  {p95:>7.1f}%")
+    print("\n✓ Plan exported to: glowheal_rollout_plan.csv")
@@ -1,21 +1,21 @@
+# Crawl every page of the glowheal.in website (seeded from the sitemap)
+from crawler import BASE_URL, iter_pages
+from http_cache import HttpCache
 
-# Let me try to access the glowheal.in website directly using requests
-import requests
-from bs4 import BeautifulSoup
-
-url = "https://glowheal.in"
+url = BASE_URL
 
 try:
-    # Set headers to mimic browser
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
-    response = requests.get(url, headers=headers, timeout=10)
-    print(f"Status Code: {response.status_code}")
-    print(f"Content Length: {len(response.content)}")
-    print("\n--- First 2000 characters of content ---")
-    print(response.text[:2000])
-    
+    total_bytes = 0
+    pages = 0
+    with HttpCache() as cache:
+        for page_url, status, headers, body in iter_pages(url, cache=cache):
+            pages += 1
+            total_bytes += len(body)
+            print(f"{status:>3}  {len(body):>9,} B  {page_url}")
+
+    print(f"\nPages crawled: {pages}")
+    print(f"Total Content Length: {total_bytes:,}")
+    print(f"HTTP cache: {cache.stats.summary()}")
+
 except Exception as e:
     print(f"Error accessing website: {e}")
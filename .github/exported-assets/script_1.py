@@ -1,4 +1,6 @@
 
+from recommendations import from_analysis
+
 # Create a comprehensive analysis data structure for Glowheal.in website optimization
 
 analysis_data = {
@@ -284,21 +286,16 @@ analysis_data = {
     }
 }
 
-# Calculate comprehensive recommendations count
-total_recommendations = sum([
-    len(analysis_data["color_scheme_recommendations"]["recommendations"]),
-    len(analysis_data["pricing_strategy"]["conversion_optimization"]),
-    len(analysis_data["design_improvements"]["hero_section"]),
-    len(analysis_data["conversion_rate_optimization"]["trust_signals"]),
-    len(analysis_data["technical_optimization"]["page_speed"]["target_metrics"]),
-    len(analysis_data["content_optimization"]["homepage"])
-])
+# Every actionable string in analysis_data (research and benchmarks excluded)
+total_recommendations = len(from_analysis(analysis_data))
+
 
-print(f"Comprehensive Website Analysis Generated")
-print(f"Total Actionable Recommendations: {total_recommendations}+")
-print(f"\nKey Focus Areas:")
-print(f"1. Color Scheme: Blue-based palette recommended")
-print(f"2. Pricing: FREE first consultation + competitive pricing")
-print(f"3. Conversion: Trust signals + optimized CTAs")
-print(f"4. Technical: Page speed < 2.5s + WCAG compliance")
-print(f"5. Mobile: 60%+ traffic - critical optimization")
+if __name__ == '__main__':
+    print(f"Comprehensive Website Analysis Generated")
+    print(f"Total Actionable Recommendations: {total_recommendations}+")
+    print(f"\nKey Focus Areas:")
+    print(f"1. Color Scheme: Blue-based palette recommended")
+    print(f"2. Pricing: FREE first consultation + competitive pricing")
+    print(f"3. Conversion: Trust signals + optimized CTAs")
+    print(f"4. Technical: Page speed < 2.5s + WCAG compliance")
+    print(f"5. Mobile: 60%+ traffic - critical optimization")
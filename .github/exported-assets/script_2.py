@@ -1,5 +1,5 @@
 
-import pandas as pd
+from contrast import describe_on_white
 
 # Create pricing comparison table
 pricing_data = {
@@ -65,14 +65,6 @@ pricing_data = {
     ]
 }
 
-pricing_df = pd.DataFrame(pricing_data)
-pricing_df.to_csv('glowheal_pricing_strategy.csv', index=False)
-
-print("="*80)
-print("GLOWHEAL.IN - COMPETITIVE PRICING STRATEGY")
-print("="*80)
-print(pricing_df.to_string(index=False))
-print("\n")
 
 # Create color palette recommendations
 color_palette_data = {
@@ -156,32 +148,10 @@ color_palette_data = {
         'Professional, readable, WCAG compliant',
         'Less emphasis, supporting info'
     ],
-    'Contrast Ratio (on white)': [
-        '4.6:1 (AA Pass)',
-        'N/A',
-        'N/A',
-        '3.9:1 (Need darker for text)',
-        'N/A',
-        'N/A',
-        '7.5:1 (AAA Pass)',
-        'N/A',
-        '3.4:1 (Large text only)',
-        '7.8:1 (AAA Pass)',
-        'N/A',
-        'N/A',
-        '16:1 (AAA Pass)',
-        '4.7:1 (AA Pass)'
-    ]
 }
 
-color_df = pd.DataFrame(color_palette_data)
-color_df.to_csv('glowheal_color_palette.csv', index=False)
-
-print("="*80)
-print("GLOWHEAL.IN - COLOR PALETTE RECOMMENDATIONS")
-print("="*80)
-print(color_df.to_string(index=False))
-print("\n")
+# Contrast ratios are computed from the hex codes (WCAG 2.1 relative luminance)
+color_palette_data['Contrast Ratio (on white)'] = describe_on_white(color_palette_data['Hex Code'])
 
 # Create button design specifications
 button_specs = {
@@ -267,14 +237,36 @@ button_specs = {
     ]
 }
 
-button_df = pd.DataFrame(button_specs)
-button_df.to_csv('glowheal_button_specifications.csv', index=False)
 
-print("="*80)
-print("GLOWHEAL.IN - BUTTON DESIGN SPECIFICATIONS")
-print("="*80)
-print(button_df.to_string(index=False))
+if __name__ == '__main__':
+    import pandas as pd
+
+    pricing_df = pd.DataFrame(pricing_data)
+    pricing_df.to_csv('glowheal_pricing_strategy.csv', index=False)
+
+    print("="*80)
+    print("GLOWHEAL.IN - COMPETITIVE PRICING STRATEGY")
+    print("="*80)
+    print(pricing_df.to_string(index=False))
+    print("\n")
+
+    color_df = pd.DataFrame(color_palette_data)
+    color_df.to_csv('glowheal_color_palette.csv', index=False)
+
+    print("="*80)
+    print("GLOWHEAL.IN - COLOR PALETTE RECOMMENDATIONS")
+    print("="*80)
+    print(color_df.to_string(index=False))
+    print("\n")
+
+    button_df = pd.DataFrame(button_specs)
+    button_df.to_csv('glowheal_button_specifications.csv', index=False)
+
+    print("="*80)
+    print("GLOWHEAL.IN - BUTTON DESIGN SPECIFICATIONS")
+    print("="*80)
+    print(button_df.to_string(index=False))
 
-print("\n✓ Files created: glowheal_pricing_strategy.csv")
-print("✓ Files created: glowheal_color_palette.csv")
-print("✓ Files created: glowheal_button_specifications.csv")
+    print("\n✓ Files created: glowheal_pricing_strategy.csv")
+    print("✓ Files created: glowheal_color_palette.csv")
+    print("✓ Files created: glowheal_button_specifications.csv")
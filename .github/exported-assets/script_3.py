@@ -1,6 +1,4 @@
 
-import pandas as pd
-
 # Create comprehensive implementation checklist
 implementation_checklist = {
     'Category': [],
@@ -128,33 +126,37 @@ for item in checklist_items:
     implementation_checklist['Expected Impact'].append(item[5])
     implementation_checklist['Effort'].append(item[6])
 
-checklist_df = pd.DataFrame(implementation_checklist)
-checklist_df.to_csv('glowheal_implementation_checklist.csv', index=False)
 
-print("="*100)
-print("GLOWHEAL.IN - COMPREHENSIVE IMPLEMENTATION CHECKLIST")
-print("="*100)
-print("\nCRITICAL PRIORITY ITEMS (Implement First - Highest ROI):")
-print("-"*100)
-critical = checklist_df[checklist_df['Priority'] == 'CRITICAL']
-for idx, row in critical.iterrows():
-    print(f"\n{row['Item'].upper()}")
-    print(f"  Issue: {row['Current Issue/Gap']}")
-    print(f"  Action: {row['Recommended Action']}")
-    print(f"  Impact: {row['Expected Impact']} | Effort: {row['Effort']}")
+if __name__ == '__main__':
+    import pandas as pd
+
+    checklist_df = pd.DataFrame(implementation_checklist)
+    checklist_df.to_csv('glowheal_implementation_checklist.csv', index=False)
+
+    print("="*100)
+    print("GLOWHEAL.IN - COMPREHENSIVE IMPLEMENTATION CHECKLIST")
+    print("="*100)
+    print("\nCRITICAL PRIORITY ITEMS (Implement First - Highest ROI):")
+    print("-"*100)
+    critical = checklist_df[checklist_df['Priority'] == 'CRITICAL']
+    for idx, row in critical.iterrows():
+        print(f"\n{row['Item'].upper()}")
+        print(f"  Issue: {row['Current Issue/Gap']}")
+        print(f"  Action: {row['Recommended Action']}")
+        print(f"  Impact: {row['Expected Impact']} | Effort: {row['Effort']}")
 
-print("\n" + "="*100)
-print("HIGH PRIORITY ITEMS (Implement Within 1-2 Weeks):")
-print("-"*100)
-high = checklist_df[checklist_df['Priority'] == 'HIGH']
-for idx, row in high.iterrows():
-    print(f"\n{row['Item']}")
-    print(f"  Action: {row['Recommended Action'][:100]}...")
-    print(f"  Impact: {row['Expected Impact']}")
+    print("\n" + "="*100)
+    print("HIGH PRIORITY ITEMS (Implement Within 1-2 Weeks):")
+    print("-"*100)
+    high = checklist_df[checklist_df['Priority'] == 'HIGH']
+    for idx, row in high.iterrows():
+        print(f"\n{row['Item']}")
+        print(f"  Action: {row['Recommended Action'][:100]}...")
+        print(f"  Impact: {row['Expected Impact']}")
 
-print("\n" + "="*100)
-print("\n✓ Full checklist exported to: glowheal_implementation_checklist.csv")
-print(f"✓ Total items: {len(checklist_df)}")
-print(f"✓ Critical: {len(critical)} items")
-print(f"✓ High Priority: {len(high)} items")
-print(f"✓ Medium Priority: {len(checklist_df[checklist_df['Priority'] == 'MEDIUM'])} items")
+    print("\n" + "="*100)
+    print("\n✓ Full checklist exported to: glowheal_implementation_checklist.csv")
+    print(f"✓ Total items: {len(checklist_df)}")
+    print(f"✓ Critical: {len(critical)} items")
+    print(f"✓ High Priority: {len(high)} items")
+    print(f"✓ Medium Priority: {len(checklist_df[checklist_df['Priority'] == 'MEDIUM'])} items")
@@ -118,29 +118,33 @@ for issue in issues_list:
     bugs_issues['How to Fix'].append(issue[4])
     bugs_issues['Test Method'].append(issue[5])
 
-bugs_df = pd.DataFrame(bugs_issues)
-bugs_df.to_csv('glowheal_bugs_and_issues.csv', index=False)
 
-print("="*100)
-print("GLOWHEAL.IN - POTENTIAL BUGS AND ISSUES TO CHECK")
-print("="*100)
+if __name__ == '__main__':
+    import pandas as pd
 
-for severity in ['CRITICAL', 'HIGH', 'MEDIUM']:
-    severity_items = bugs_df[bugs_df['Severity'] == severity]
-    print(f"\n{'='*100}")
-    print(f"{severity} SEVERITY - {len(severity_items)} ISSUES")
-    print('='*100)
-    
-    for idx, row in severity_items.iterrows():
-        print(f"\n{idx+1}. {row['Issue Type']} - {row['Location']}")
-        print(f"   Problem: {row['Description']}")
-        print(f"   Fix: {row['How to Fix'].split(chr(10))[1][:80]}...")
-        print(f"   Test: {row['Test Method'][:80]}...")
+    bugs_df = pd.DataFrame(bugs_issues)
+    bugs_df.to_csv('glowheal_bugs_and_issues.csv', index=False)
 
-print("\n" + "="*100)
-print(f"\n✓ Full bugs list exported to: glowheal_bugs_and_issues.csv")
-print(f"✓ Total issues to check: {len(bugs_df)}")
-print(f"✓ Critical: {len(bugs_df[bugs_df['Severity'] == 'CRITICAL'])}")
-print(f"✓ High: {len(bugs_df[bugs_df['Severity'] == 'HIGH'])}")
-print(f"✓ Medium: {len(bugs_df[bugs_df['Severity'] == 'MEDIUM'])}")
-print(f"✓ Low: {len(bugs_df[bugs_df['Severity'] == 'LOW'])}")
+    print("="*100)
+    print("GLOWHEAL.IN - POTENTIAL BUGS AND ISSUES TO CHECK")
+    print("="*100)
+
+    for severity in ['CRITICAL', 'HIGH', 'MEDIUM']:
+        severity_items = bugs_df[bugs_df['Severity'] == severity]
+        print(f"\n{'='*100}")
+        print(f"{severity} SEVERITY - {len(severity_items)} ISSUES")
+        print('='*100)
+
+        for idx, row in severity_items.iterrows():
+            print(f"\n{idx+1}. {row['Issue Type']} - {row['Location']}")
+            print(f"   Problem: {row['Description']}")
+            print(f"   Fix: {row['How to Fix'].split(chr(10))[1][:80]}...")
+            print(f"   Test: {row['Test Method'][:80]}...")
+
+    print("\n" + "="*100)
+    print(f"\n✓ Full bugs list exported to: glowheal_bugs_and_issues.csv")
+    print(f"✓ Total issues to check: {len(bugs_df)}")
+    print(f"✓ Critical: {len(bugs_df[bugs_df['Severity'] == 'CRITICAL'])}")
+    print(f"✓ High: {len(bugs_df[bugs_df['Severity'] == 'HIGH'])}")
+    print(f"✓ Medium: {len(bugs_df[bugs_df['Severity'] == 'MEDIUM'])}")
+    print(f"✓ Low: {len(bugs_df[bugs_df['Severity'] == 'LOW'])}")
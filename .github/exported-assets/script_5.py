@@ -365,8 +365,10 @@ a research-backed starting point, then optimize based on your data.
 Good luck with implementation!
 """
 
-with open('glowheal_executive_summary.txt', 'w', encoding='utf-8') as f:
-    f.write(summary)
 
-print(summary)
-print("\n✓ Executive summary saved to: glowheal_executive_summary.txt")
+if __name__ == '__main__':
+    with open('glowheal_executive_summary.txt', 'w', encoding='utf-8') as f:
+        f.write(summary)
+
+    print(summary)
+    print("\n✓ Executive summary saved to: glowheal_executive_summary.txt")
@@ -0,0 +1,150 @@
+# Crawler against a local stand-in for the site: dedupe, the concurrency
+# cap, streamed records, worker error handling and cache revalidation.
+#
+#   python -m pytest test_crawler.py
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import crawler
+from crawler import Crawler, Page, iter_pages
+from http_cache import HttpCache
+
+PAGES = 20
+DELAY = 0.05          # seconds per response, so requests overlap
+BROKEN = ('3', '4', '5')
+ETAG = '"v1"'
+
+
+class Site:
+    """Every /page/N links to the next two pages, with fragments and a
+    mixed-case host so the same URL shows up under several spellings."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def body(self, path, port):
+        if path == '/sitemap.xml':
+            locs = ''.join(f'<url><loc>https://glowheal.in/page/{n}</loc></url>' for n in range(PAGES))
+            locs += '<url><loc>https://glowheal.in/page/0</loc></url>'
+            return 'application/xml', ('<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/'
+                                       f'schemas/sitemap/0.9">{locs}</urlset>')
+        if path == '/' or path.startswith('/page/'):
+            n = int(path.rsplit('/', 1)[-1]) if path != '/' else -1
+            links = ''.join(f'<a href="/page/{m}#top">{m}</a><a href="http://LOCALHOST:{port}/page/{m}">{m}</a>'
+                            for m in (n + 1, n + 2) if 0 <= m < PAGES)
+            return 'text/html; charset=utf-8', f'<html><body><h1>{path}</h1>{links}</body></html>'
+        return None, None
+
+
+@pytest.fixture
+def site():
+    state = Site()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            with state.lock:
+                state.requests.append(self.path)
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            try:
+                time.sleep(DELAY)
+                content_type, text = state.body(self.path, self.server.server_port)
+                data = (text or 'not found').encode('utf-8')
+                if text and self.headers.get('If-None-Match') == ETAG:
+                    self.send_response(304)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200 if text else 404)
+                self.send_header('Content-Type', content_type or 'text/plain')
+                self.send_header('ETag', ETAG)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.base_url = f'http://localhost:{server.server_port}'
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_each_page_fetched_once(site):
+    pages = list(iter_pages(site.base_url, concurrency=4, per_host=4))
+    page_paths = [p for p in site.requests if p != '/sitemap.xml']
+    assert sorted(page_paths) == sorted(set(page_paths))
+    assert len(pages) == len({p.url for p in pages}) == PAGES + 1
+    assert all(isinstance(p, Page) and p.status == 200 and p.body for p in pages)
+
+
+def test_concurrency_cap(site):
+    list(iter_pages(site.base_url, concurrency=3, per_host=8))
+    assert 1 < site.max_in_flight <= 3
+
+
+def test_records_stream_before_crawl_finishes(site):
+    pages = iter_pages(site.base_url, concurrency=2, per_host=2)
+    first = next(pages)
+    requested = len(site.requests)
+    pages.close()
+    assert first.status == 200
+    assert requested < PAGES
+
+
+def test_worker_survives_page_errors(site, monkeypatch):
+    def extract_links(page):
+        if page.url.rsplit('/', 1)[-1] in BROKEN:
+            raise ValueError('bad markup')
+        return real_extract_links(page)
+
+    real_extract_links = crawler.extract_links
+    monkeypatch.setattr(crawler, 'extract_links', extract_links)
+
+    async def crawl():
+        c = Crawler(site.base_url, concurrency=2, per_host=2)
+        pages = [page async for page in c.crawl()]
+        return c, pages
+
+    # More broken pages than workers: without per-URL handling every worker dies and crawl() hangs
+    c, pages = asyncio.run(asyncio.wait_for(crawl(), timeout=30))
+    assert sorted(c.errors) == sorted(f'{site.base_url}/page/{n}' for n in BROKEN)
+    assert set(c.errors.values()) == {'ValueError: bad markup'}
+    assert len(pages) == PAGES + 1
+
+
+def test_304_with_vanished_body_refetches(site, tmp_path):
+    cache = HttpCache(str(tmp_path))
+    url = site.base_url + '/page/1'
+
+    async def fetch():
+        c = Crawler(site.base_url, cache=cache)
+        async with c.open_session() as session:
+            return await c.fetch(session, url)
+
+    first = asyncio.run(fetch())
+    assert asyncio.run(fetch()).body == first.body and cache.stats.hits == 1
+    for path in tmp_path.glob('bodies/*/*'):
+        path.unlink()
+    page = asyncio.run(fetch())
+    assert page.status == 200 and page.body == first.body
+    assert site.requests[-2:] == ['/page/1', '/page/1']   # 304, then the unconditional retry
+    assert url in cache
@@ -0,0 +1,60 @@
+# Funnel steps for sessions made of the events apps/web actually sends:
+# the LeadFormCard path (CTA then submit, no form-start event) and the
+# pricing path (select then quote).
+#
+#   python -m pytest test_funnel.py
+
+import csv
+import json
+
+import pytest
+
+from funnel import FUNNEL, compute_funnel, steps_reached, to_csv
+
+T0 = 1_760_000_000_000   # epoch ms
+SESSIONS = {
+    'hero': ['page_view', 'hero_cta_click', 'free_consult_form_submit'],
+    'pricing': ['page_view', 'pricing_select_initiated', 'quote_create'],
+    'sticky-bar': ['page_view', 'free_consult_form_submit'],
+    'bounce': ['page_view'],
+    'whatsapp': ['page_view', 'whatsapp_click'],
+}
+
+
+def session(names):
+    return [(T0 + i * 1000, {'event': name}) for i, name in enumerate(names)]
+
+
+@pytest.mark.parametrize('name, steps', [
+    ('hero', 4),          # the submit counts as the form start it implies
+    ('pricing', 4),       # a quote implies the CTA step too
+    ('sticky-bar', 4),
+    ('bounce', 1),
+    ('whatsapp', 2),
+])
+def test_steps_reached(name, steps):
+    assert steps_reached(session(SESSIONS[name])) == steps
+
+
+def test_only_emitted_events():
+    events = set().union(*(names for _, names in FUNNEL[1:]))
+    assert events == {'hero_cta_click', 'whatsapp_click', 'pricing_select_initiated',
+                      'free_consult_form_submit', 'quote_create'}
+
+
+def test_compute_funnel(tmp_path):
+    export = tmp_path / 'events.jsonl'
+    with open(export, 'w') as f:
+        for visitor, names in SESSIONS.items():
+            for ms, event in session(names):
+                f.write(json.dumps(dict(event, client_id=visitor, timestamp=ms, city='pune')) + '\n')
+    counts = compute_funnel([str(export)])
+    assert counts[('all', 'all')].steps == [5, 4, 3, 3]
+    assert counts[('city', 'pune')].steps == [5, 4, 3, 3]
+
+    out = tmp_path / 'funnel.csv'
+    to_csv(counts, str(out))
+    with open(out, newline='') as f:
+        total = next(row for row in csv.DictReader(f) if row['Dimension'] == 'all')
+    assert total['Form Completion Rate'] == '100.00%'
+    assert total['Conversion Rate'] == '60.00%'
@@ -1,6 +1,8 @@
 /** @type {import('next').NextConfig} */
 const nextConfig = {
   reactStrictMode: true,
+  // Emit client source maps for the bundle analyzer (ANALYZE_BUNDLE=1 npm run build)
+  productionBrowserSourceMaps: process.env.ANALYZE_BUNDLE === '1',
   images: {
     formats: ['image/avif', 'image/webp'],
     deviceSizes: [640, 750, 828, 1080, 1200, 1920, 2048, 3840],